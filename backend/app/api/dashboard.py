@@ -1,127 +1,167 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as DbSession
-from sqlalchemy import func, select, desc
+from sqlalchemy import BigInteger, cast, func, select, desc
 
-from app.core.db import get_db
-from app.core.security import get_current_user
+from app.core.cache import dashboard_cache
+from app.core.db import get_async_db
+from app.core.money import cents_to_euro
+from app.core.periods import PERIOD_PATTERN, period_key_or_none, period_str
+from app.core.security import get_current_user_async
 from app.models.employee_cost import EmployeeCost
 from app.models.import_job import ImportJob
 from app.models.employee import Employee
+from app.models.period_summary import PeriodSummary
 
 router = APIRouter()
 
 
-def _latest_period(db: DbSession) -> str | None:
-    return db.execute(select(func.max(EmployeeCost.period))).scalar_one_or_none()
+# Summen/Perioden kommen aus period_summary (pro Mandant, Periode und CSV-Typ vorberechnet).
+# Alle Endpunkte nehmen optional tenant_id; ohne Filter wird über alle Mandanten summiert.
+# employee_count wird über die CSV-Typen summiert; bei nur einem Typ pro Periode ist das exakt.
+# Die Endpunkte sind async; die Abfragen bleiben synchrone Funktionen und laufen über
+# AsyncSession.run_sync (so nutzen Benchmarks/Tools sie weiter mit einer normalen Session).
+# Perioden sind in der DB Integer-Schlüssel (YYYYMM); die Endpunkte nehmen und liefern "YYYY-MM".
+# Beträge sind ganze Cent und werden als Integer summiert; Euro erst in der Antwort.
+
+
+def _sum_cents(col):
+    # PostgreSQL liefert SUM(bigint) als numeric -> zurück auf BIGINT, damit ints statt Decimals ankommen
+    return cast(func.coalesce(func.sum(col), 0), BigInteger)
+
+
+def _for_tenant(stmt, column, tenant_id: int | None):
+    return stmt if tenant_id is None else stmt.where(column == tenant_id)
+
+
+def _latest_period(db: DbSession, tenant_id: int | None = None) -> int | None:
+    stmt = _for_tenant(select(func.max(PeriodSummary.period)), PeriodSummary.tenant_id, tenant_id)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def _periods(db: DbSession, tenant_id: int | None = None) -> list[str]:
+    stmt = select(PeriodSummary.period).distinct().order_by(PeriodSummary.period.desc())
+    rows = db.execute(_for_tenant(stmt, PeriodSummary.tenant_id, tenant_id)).all()
+    return [period_str(r[0]) for r in rows]
 
 
 @router.get("/periods")
-def dashboard_periods(
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+async def dashboard_periods(
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
-    rows = db.execute(
-        select(EmployeeCost.period).distinct().order_by(EmployeeCost.period.desc())
-    ).all()
-    return [r[0] for r in rows]
+    return await dashboard_cache.get_or_compute_async(
+        ("periods", tenant_id), lambda: db.run_sync(_periods, tenant_id)
+    )
 
 
-@router.get("/kpis")
-def dashboard_kpis(
-    period: str | None = None,
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
-):
+def _kpis(db: DbSession, period: int | None, tenant_id: int | None = None) -> dict:
     if not period:
-        period = _latest_period(db)
+        period = _latest_period(db, tenant_id)
 
     q = select(
-        func.count(func.distinct(EmployeeCost.employee_id)).label("employee_count"),
-        func.coalesce(func.sum(EmployeeCost.total_cost), 0).label("total_cost"),
-        func.coalesce(func.sum(EmployeeCost.gross_amount), 0).label("total_gross"),
-        func.coalesce(func.sum(EmployeeCost.sv_ag_amount), 0).label("total_sv_ag"),
-        func.coalesce(func.sum(EmployeeCost.reimb_kk_amount), 0).label("total_reimb_kk"),
-        func.coalesce(func.sum(EmployeeCost.reimb_ba_amount), 0).label("total_reimb_ba"),
-        func.coalesce(func.sum(EmployeeCost.reimb_ifsg_amount), 0).label("total_reimb_ifsg"),
+        func.coalesce(func.sum(PeriodSummary.employee_count), 0).label("employee_count"),
+        _sum_cents(PeriodSummary.total_cost).label("total_cost"),
+        _sum_cents(PeriodSummary.gross_amount).label("total_gross"),
+        _sum_cents(PeriodSummary.sv_ag_amount).label("total_sv_ag"),
+        _sum_cents(PeriodSummary.reimb_kk_amount).label("total_reimb_kk"),
+        _sum_cents(PeriodSummary.reimb_ba_amount).label("total_reimb_ba"),
+        _sum_cents(PeriodSummary.reimb_ifsg_amount).label("total_reimb_ifsg"),
     )
 
     if period:
-        q = q.where(EmployeeCost.period == period)
+        q = q.where(PeriodSummary.period == period)
+    q = _for_tenant(q, PeriodSummary.tenant_id, tenant_id)
 
     result = db.execute(q).one()
 
-    last_job = (
-        db.execute(select(ImportJob).order_by(ImportJob.id.desc()).limit(1))
-        .scalars()
-        .first()
-    )
-
     return {
-        "period": period,
+        "period": period_str(period),
         "employee_count": int(result.employee_count),
-        "total_cost": float(result.total_cost),
-        "total_gross": float(result.total_gross),
-        "total_sv_ag": float(result.total_sv_ag),
-        "total_reimb_kk": float(result.total_reimb_kk),
-        "total_reimb_ba": float(result.total_reimb_ba),
-        "total_reimb_ifsg": float(result.total_reimb_ifsg),
-        "last_import_status": last_job.status if last_job else None,
+        "total_cost": cents_to_euro(result.total_cost),
+        "total_gross": cents_to_euro(result.total_gross),
+        "total_sv_ag": cents_to_euro(result.total_sv_ag),
+        "total_reimb_kk": cents_to_euro(result.total_reimb_kk),
+        "total_reimb_ba": cents_to_euro(result.total_reimb_ba),
+        "total_reimb_ifsg": cents_to_euro(result.total_reimb_ifsg),
     }
 
 
-@router.get("/monthly-costs")
-def dashboard_monthly_costs(
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+@router.get("/kpis")
+async def dashboard_kpis(
+    period: str | None = Query(None, pattern=PERIOD_PATTERN),
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
+    key = period_key_or_none(period)
+    kpis = await dashboard_cache.get_or_compute_async(
+        ("kpis", key, tenant_id), lambda: db.run_sync(_kpis, key, tenant_id)
+    )
+
+    # Job-Status ändert sich auch ohne neue Daten (pending/processing) -> nicht cachen
+    status_stmt = select(ImportJob.status).order_by(ImportJob.id.desc()).limit(1)
+    last_status = (
+        await db.execute(_for_tenant(status_stmt, ImportJob.tenant_id, tenant_id))
+    ).scalar_one_or_none()
+
+    return {**kpis, "last_import_status": last_status}
+
+
+def _monthly_costs(db: DbSession, tenant_id: int | None = None) -> list[dict]:
     stmt = (
         select(
-            EmployeeCost.period,
-            func.count(func.distinct(EmployeeCost.employee_id)).label("employee_count"),
-            func.coalesce(func.sum(EmployeeCost.total_cost), 0).label("total_cost"),
-            func.coalesce(func.sum(EmployeeCost.gross_amount), 0).label("gross"),
-            func.coalesce(func.sum(EmployeeCost.sv_ag_amount), 0).label("sv_ag"),
-            func.coalesce(func.sum(EmployeeCost.umlage_amount), 0).label("umlage"),
-            func.coalesce(func.sum(EmployeeCost.ag_bav_amount), 0).label("ag_bav"),
-            func.coalesce(func.sum(EmployeeCost.flat_tax_amount), 0).label("flat_tax"),
-            func.coalesce(func.sum(EmployeeCost.reimb_kk_amount), 0).label("reimb_kk"),
-            func.coalesce(func.sum(EmployeeCost.reimb_ba_amount), 0).label("reimb_ba"),
-            func.coalesce(func.sum(EmployeeCost.reimb_ifsg_amount), 0).label("reimb_ifsg"),
+            PeriodSummary.period,
+            func.sum(PeriodSummary.employee_count).label("employee_count"),
+            _sum_cents(PeriodSummary.total_cost).label("total_cost"),
+            _sum_cents(PeriodSummary.gross_amount).label("gross"),
+            _sum_cents(PeriodSummary.sv_ag_amount).label("sv_ag"),
+            _sum_cents(PeriodSummary.umlage_amount).label("umlage"),
+            _sum_cents(PeriodSummary.ag_bav_amount).label("ag_bav"),
+            _sum_cents(PeriodSummary.flat_tax_amount).label("flat_tax"),
+            _sum_cents(PeriodSummary.reimb_kk_amount).label("reimb_kk"),
+            _sum_cents(PeriodSummary.reimb_ba_amount).label("reimb_ba"),
+            _sum_cents(PeriodSummary.reimb_ifsg_amount).label("reimb_ifsg"),
         )
-        .group_by(EmployeeCost.period)
-        .order_by(EmployeeCost.period)
+        .group_by(PeriodSummary.period)
+        .order_by(PeriodSummary.period)
     )
 
-    rows = db.execute(stmt).all()
+    rows = db.execute(_for_tenant(stmt, PeriodSummary.tenant_id, tenant_id)).all()
 
     return [
         {
-            "period": r.period,
+            "period": period_str(r.period),
             "employee_count": int(r.employee_count),
-            "total_cost": float(r.total_cost),
-            "gross": float(r.gross),
-            "sv_ag": float(r.sv_ag),
-            "umlage": float(r.umlage),
-            "ag_bav": float(r.ag_bav),
-            "flat_tax": float(r.flat_tax),
-            "reimb_kk": float(r.reimb_kk),
-            "reimb_ba": float(r.reimb_ba),
-            "reimb_ifsg": float(r.reimb_ifsg),
+            "total_cost": cents_to_euro(r.total_cost),
+            "gross": cents_to_euro(r.gross),
+            "sv_ag": cents_to_euro(r.sv_ag),
+            "umlage": cents_to_euro(r.umlage),
+            "ag_bav": cents_to_euro(r.ag_bav),
+            "flat_tax": cents_to_euro(r.flat_tax),
+            "reimb_kk": cents_to_euro(r.reimb_kk),
+            "reimb_ba": cents_to_euro(r.reimb_ba),
+            "reimb_ifsg": cents_to_euro(r.reimb_ifsg),
         }
         for r in rows
     ]
 
 
-
-@router.get("/top-employees")
-def dashboard_top_employees(
-    period: str | None = None,
-    limit: int = 10,
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+@router.get("/monthly-costs")
+async def dashboard_monthly_costs(
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
+    return await dashboard_cache.get_or_compute_async(
+        ("monthly-costs", tenant_id), lambda: db.run_sync(_monthly_costs, tenant_id)
+    )
+
+
+def _top_employees(db: DbSession, period: int | None, limit: int, tenant_id: int | None = None) -> dict:
     if not period:
-        period = _latest_period(db)
+        period = _latest_period(db, tenant_id)
 
     if not period:
         return {"period": None, "items": []}
@@ -132,7 +172,7 @@ def dashboard_top_employees(
             Employee.external_id,
             Employee.first_name,
             Employee.last_name,
-            func.coalesce(func.sum(EmployeeCost.total_cost), 0).label("total_cost"),
+            _sum_cents(EmployeeCost.total_cost).label("total_cost"),
         )
         .join(Employee, Employee.id == EmployeeCost.employee_id)
         .where(EmployeeCost.period == period)
@@ -141,70 +181,121 @@ def dashboard_top_employees(
         .limit(limit)
     )
 
-    rows = db.execute(stmt).all()
+    rows = db.execute(_for_tenant(stmt, EmployeeCost.tenant_id, tenant_id)).all()
 
     return {
-        "period": period,
+        "period": period_str(period),
         "items": [
             {
                 "employee_id": r.employee_id,
                 "external_id": r.external_id,
                 "first_name": r.first_name,
                 "last_name": r.last_name,
-                "total_cost": float(r.total_cost),
+                "total_cost": cents_to_euro(r.total_cost),
             }
             for r in rows
         ],
     }
 
+
+@router.get("/top-employees")
+async def dashboard_top_employees(
+    period: str | None = Query(None, pattern=PERIOD_PATTERN),
+    limit: int = 10,
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
+):
+    key = period_key_or_none(period)
+    return await dashboard_cache.get_or_compute_async(
+        ("top-employees", key, limit, tenant_id),
+        lambda: db.run_sync(_top_employees, key, limit, tenant_id),
+    )
+
+
+def _hotspots(
+    db: DbSession,
+    limit: int,
+    period_from: int | None,
+    period_to: int | None,
+    tenant_id: int | None = None,
+) -> list[dict]:
+    # Ein Statement für alle Perioden: Summe je Mitarbeiter/Periode, dann ROW_NUMBER je Periode
+    per_employee = (
+        select(
+            EmployeeCost.period.label("period"),
+            Employee.external_id,
+            Employee.first_name,
+            Employee.last_name,
+            _sum_cents(EmployeeCost.total_cost).label("total_cost"),
+        )
+        .join(Employee, Employee.id == EmployeeCost.employee_id)
+        # Employee.id: gleiche Pers.-Nr. kann bei mehreren Mandanten vorkommen
+        .group_by(
+            EmployeeCost.period, Employee.id, Employee.external_id, Employee.first_name, Employee.last_name
+        )
+    )
+    per_employee = _for_tenant(per_employee, EmployeeCost.tenant_id, tenant_id)
+    if period_from:
+        per_employee = per_employee.where(EmployeeCost.period >= period_from)
+    if period_to:
+        per_employee = per_employee.where(EmployeeCost.period <= period_to)
+
+    per_employee = per_employee.subquery()
+
+    ranked = select(
+        per_employee,
+        func.row_number()
+        .over(partition_by=per_employee.c.period, order_by=per_employee.c.total_cost.desc())
+        .label("rn"),
+    ).subquery()
+
+    rows = db.execute(
+        select(ranked)
+        .where(ranked.c.rn <= limit)
+        .order_by(ranked.c.period.desc(), ranked.c.rn)
+    ).all()
+
+    out = []
+    for r in rows:
+        period = period_str(r.period)
+        if not out or out[-1]["period"] != period:
+            out.append({"period": period, "items": []})
+        out[-1]["items"].append({
+            "external_id": r.external_id,
+            "first_name": r.first_name,
+            "last_name": r.last_name,
+            "total_cost": cents_to_euro(r.total_cost),
+        })
+
+    return out
+
+
 @router.get("/hotspots")
-def dashboard_hotspots(
+async def dashboard_hotspots(
     limit: int = 5,
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+    period_from: str | None = Query(None, pattern=PERIOD_PATTERN),
+    period_to: str | None = Query(None, pattern=PERIOD_PATTERN),
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
     """
     Liefert pro Periode die Top-N Mitarbeiter nach Gesamtkosten.
+    Optional auf period_from..period_to (jeweils inklusive, YYYY-MM) und/oder einen Mandanten eingeschränkt.
     Format:
     [
       { "period": "2026-01", "items": [ ...top employees... ] },
       ...
     ]
     """
-    # Alle Perioden (desc: neueste zuerst)
-    periods = db.execute(
-        select(EmployeeCost.period).distinct().order_by(EmployeeCost.period.desc())
-    ).scalars().all()
-
-    out = []
-    for p in periods:
-        stmt = (
-            select(
-                Employee.external_id,
-                Employee.first_name,
-                Employee.last_name,
-                func.coalesce(func.sum(EmployeeCost.total_cost), 0).label("total_cost"),
-            )
-            .join(Employee, Employee.id == EmployeeCost.employee_id)
-            .where(EmployeeCost.period == p)
-            .group_by(Employee.external_id, Employee.first_name, Employee.last_name)
-            .order_by(desc("total_cost"))
-            .limit(limit)
-        )
-        rows = db.execute(stmt).all()
-
-        out.append({
-            "period": p,
-            "items": [
-                {
-                    "external_id": r.external_id,
-                    "first_name": r.first_name,
-                    "last_name": r.last_name,
-                    "total_cost": float(r.total_cost),
-                }
-                for r in rows
-            ],
-        })
+    key_from, key_to = period_key_or_none(period_from), period_key_or_none(period_to)
+    return await dashboard_cache.get_or_compute_async(
+        ("hotspots", limit, key_from, key_to, tenant_id),
+        lambda: db.run_sync(_hotspots, limit, key_from, key_to, tenant_id),
+    )
 
-    return out
 
+@router.get("/cache-stats")
+async def dashboard_cache_stats(user=Depends(get_current_user_async)):
+    return dashboard_cache.stats()
@@ -1,55 +1,125 @@
+import base64
+import json
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as DbSession
-from sqlalchemy import select
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, and_
 
-from app.core.db import get_db
-from app.core.security import get_current_user
+from app.core.cache import employee_count_cache
+from app.core.db import get_async_db
+from app.core.money import cents_to_euro
+from app.core.periods import period_str
+from app.core.security import get_current_user_async
 from app.models.employee import Employee
 from app.models.employee_cost import EmployeeCost
+from app.services.employee_search import search_condition
 
 router = APIRouter()
 
-
+# Reihenfolge der Betragsfelder in der Verlaufsantwort
+_HISTORY_AMOUNTS = (
+    "gross_amount",
+    "sv_ag_amount",
+    "ag_bav_amount",
+    "subsidy_amount",
+    "net_amount",
+    "umlage_amount",
+    "reimb_kk_amount",
+    "flat_tax_amount",
+    "reimb_ba_amount",
+    "reimb_ifsg_amount",
+    "total_cost_wo_reimb",
+    "total_cost",
+)
+
+
+def _encode_cursor(e: Employee) -> str:
+    raw = json.dumps([e.last_name, e.first_name, e.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str, int]:
+    try:
+        last, first, emp_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(last), str(first), int(emp_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(last: str, first: str, emp_id: int):
+    # (last_name, first_name, id) > (...) ausgeschrieben, damit der Index auf allen Backends greift
+    return or_(
+        Employee.last_name > last,
+        and_(Employee.last_name == last, Employee.first_name > first),
+        and_(Employee.last_name == last, Employee.first_name == first, Employee.id > emp_id),
+    )
 
 
 @router.get("")
-def list_employees(
+async def list_employees(
     q: str | None = None,
     page: int = 1,
     page_size: int = 25,
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+    cursor: str | None = None,
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
+    """
+    Mitarbeiterliste, sortiert nach Nachname/Vorname, optional nur eines Mandanten.
+    Mit `cursor` (aus `next_cursor`) wird per Keyset weitergeblättert; `page` bleibt für
+    bestehende Clients erhalten, wird aber über OFFSET bedient.
+    """
+    return await db.run_sync(_list_employees, q, page, page_size, cursor, tenant_id)
+
+
+def _list_employees(
+    db: DbSession,
+    q: str | None,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    tenant_id: int | None = None,
+) -> dict:
     page = max(page, 1)
     page_size = min(max(page_size, 5), 100)
 
     stmt = select(Employee)
     count_stmt = select(func.count()).select_from(Employee)
+    if tenant_id is not None:
+        # (tenant_id, last_name, first_name, id) deckt Filter und Sortierung ab
+        stmt = stmt.where(Employee.tenant_id == tenant_id)
+        count_stmt = count_stmt.where(Employee.tenant_id == tenant_id)
 
+    q = (q or "").strip()
     if q:
-        s = f"%{q.strip()}%"
-        cond = or_(
-            Employee.first_name.ilike(s),
-            Employee.last_name.ilike(s),
-            Employee.external_id.ilike(s),
-        )
+        cond = search_condition(q, db.get_bind().dialect.name)
         stmt = stmt.where(cond)
         count_stmt = count_stmt.where(cond)
 
-    total = db.execute(count_stmt).scalar_one()
-    stmt = (
-        stmt.order_by(Employee.last_name, Employee.first_name)
-        .offset((page - 1) * page_size)
-        .limit(page_size)
+    # Gesamtzahl ist nur Anzeige: bis zum nächsten Import gecacht
+    total = employee_count_cache.get_or_compute(
+        ("employees", q, tenant_id),
+        lambda: int(db.execute(count_stmt).scalar_one()),
     )
 
-    rows = db.execute(stmt).scalars().all()
+    stmt = stmt.order_by(Employee.last_name, Employee.first_name, Employee.id)
+    if cursor:
+        stmt = stmt.where(_after(*_decode_cursor(cursor)))
+    elif page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
+
+    # eine Zeile mehr laden, um zu wissen, ob es weitergeht
+    rows = db.execute(stmt.limit(page_size + 1)).scalars().all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
 
     return {
         "items": [
             {
                 "id": e.id,
+                "tenant_id": e.tenant_id,
                 "external_id": e.external_id,
                 "first_name": e.first_name,
                 "last_name": e.last_name,
@@ -58,60 +128,56 @@ def list_employees(
         ],
         "page": page,
         "page_size": page_size,
-        "total": int(total),
+        "total": total,
+        "next_cursor": _encode_cursor(rows[-1]) if has_more else None,
     }
 
 
-
 @router.get("/{employee_id}/payroll")
-def employee_payroll_history(
+async def employee_payroll_history(
     employee_id: int,
-    db: DbSession = Depends(get_db),
-    user=Depends(get_current_user),
+    tenant_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
-    emp = db.execute(select(Employee).where(Employee.id == employee_id)).scalar_one_or_none()
+    return await db.run_sync(_payroll_history, employee_id, tenant_id)
+
+
+def _payroll_history(db: DbSession, employee_id: int, tenant_id: int | None = None) -> dict:
+    stmt = select(
+        Employee.id, Employee.tenant_id, Employee.external_id, Employee.first_name, Employee.last_name
+    ).where(Employee.id == employee_id)
+    # Mitarbeiter eines anderen Mandanten -> wie nicht vorhanden
+    if tenant_id is not None:
+        stmt = stmt.where(Employee.tenant_id == tenant_id)
+    emp = db.execute(stmt).one_or_none()
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    costs = (
-        db.execute(
-            select(EmployeeCost)
-            .where(EmployeeCost.employee_id == employee_id)
-            .order_by(EmployeeCost.period.desc())
+    # nur die benötigten Spalten statt ganzer ORM-Objekte; Massenabzug über /api/exports/payroll
+    costs = db.execute(
+        select(
+            EmployeeCost.period,
+            EmployeeCost.currency,
+            *(getattr(EmployeeCost, k) for k in _HISTORY_AMOUNTS),
         )
-        .scalars()
-        .all()
-    )
-
-    def f(v) -> float:
-        return float(v or 0)
+        .where(EmployeeCost.employee_id == employee_id)
+        .order_by(EmployeeCost.period.desc())
+    ).all()
 
     return {
         "employee": {
             "id": emp.id,
+            "tenant_id": emp.tenant_id,
             "external_id": emp.external_id,
             "first_name": emp.first_name,
             "last_name": emp.last_name,
         },
         "payroll": [
             {
-                "period": c.period,
+                "period": period_str(c.period),
                 "currency": c.currency,
-
-                "gross_amount": f(c.gross_amount),
-                "sv_ag_amount": f(c.sv_ag_amount),
-                "ag_bav_amount": f(c.ag_bav_amount),
-                "subsidy_amount": f(c.subsidy_amount),
-                "net_amount": f(c.net_amount),
-                "umlage_amount": f(c.umlage_amount),
-
-                "reimb_kk_amount": f(c.reimb_kk_amount),
-                "flat_tax_amount": f(c.flat_tax_amount),
-                "reimb_ba_amount": f(c.reimb_ba_amount),
-                "reimb_ifsg_amount": f(c.reimb_ifsg_amount),
-
-                "total_cost_wo_reimb": f(c.total_cost_wo_reimb),
-                "total_cost": f(c.total_cost),
+                **{k: cents_to_euro(c[i]) for i, k in enumerate(_HISTORY_AMOUNTS, start=2)},
             }
             for c in costs
         ],
@@ -0,0 +1,58 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.periods import PERIOD_PATTERN, period_key_or_none
+from app.core.security import get_current_user
+from app.services.payroll_export import (
+    CSV_ENCODING,
+    export_statement,
+    iter_csv,
+    iter_parquet,
+    parquet_available,
+)
+
+router = APIRouter()
+
+
+@router.get("/payroll")
+def export_payroll(
+    format: Literal["csv", "parquet"] = "csv",
+    period_from: str | None = Query(None, pattern=PERIOD_PATTERN),
+    period_to: str | None = Query(None, pattern=PERIOD_PATTERN),
+    employee_id: list[int] | None = Query(None),
+    external_id: list[str] | None = Query(None),
+    tenant_id: int | None = None,
+    user=Depends(get_current_user),
+):
+    """
+    Lohndaten als Datei-Download, optional auf period_from..period_to (inklusive, YYYY-MM),
+    Mitarbeiter (employee_id bzw. external_id, mehrfach angebbar) und/oder einen Mandanten eingeschränkt.
+    Die Antwort wird gestreamt, während der Cursor gelesen wird.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    stmt = export_statement(
+        period_key_or_none(period_from),
+        period_key_or_none(period_to),
+        employee_id,
+        external_id,
+        tenant_id=tenant_id,
+    )
+    filename = f"payroll_{period_from or 'start'}_{period_to or 'end'}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if format == "parquet":
+        return StreamingResponse(
+            iter_parquet(stmt, settings.EXPORT_YIELD_PER),
+            media_type="application/vnd.apache.parquet",
+            headers=headers,
+        )
+    return StreamingResponse(
+        iter_csv(stmt, settings.EXPORT_YIELD_PER),
+        media_type=f"text/csv; charset={CSV_ENCODING}",
+        headers=headers,
+    )
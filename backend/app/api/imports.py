@@ -1,11 +1,19 @@
+import os
+import zipfile
+from typing import Literal
+
 from fastapi import APIRouter, Depends, UploadFile, HTTPException
 from sqlalchemy.orm import Session as DbSession
 from sqlalchemy import select, desc
 
 from app.core.db import get_db
+from app.core.config import settings
+from app.core.periods import period_str
 from app.core.security import get_current_user
 from app.models.import_job import ImportJob
 from app.services.import_service import ImportService
+from app.services.upload_storage import spool_upload, UploadTooLargeError
+from app.services.batch_import import BatchSource, import_batch, zip_sources
 
 router = APIRouter()
 
@@ -13,6 +21,7 @@ router = APIRouter()
 @router.post("")
 def upload_import(
     file: UploadFile,
+    mode: Literal["replace", "diff"] = "replace",
     db: DbSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -21,36 +30,148 @@ def upload_import(
 
     svc = ImportService()
 
-    contents = file.file.read()
-    tmp_path = f"/tmp/{file.filename}"
+    # blockweise auf Platte, eindeutiger Dateiname -> gleichzeitige Uploads überschreiben sich nicht
+    try:
+        spooled = spool_upload(
+            file.file,
+            spool_dir=settings.IMPORT_SPOOL_DIR,
+            max_bytes=settings.IMPORT_MAX_UPLOAD_BYTES,
+            block_size=settings.IMPORT_UPLOAD_BLOCK_SIZE,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # gleicher normalisierter Inhalt => gleicher Typ und gleiche Periode -> nichts zu tun
+    existing = svc.find_identical_import(db, spooled.content_hash)
+    if existing is not None:
+        os.remove(spooled.path)
+        return {**_job_status(existing), "duplicate": True}
+
+    # Verarbeitung übernimmt der Worker (app/worker/worker.py)
+    job = svc.create_pending_job(
+        db=db,
+        stored_path=spooled.path,
+        filename=file.filename,
+        content_hash=spooled.content_hash,
+        mode=mode,
+    )
+
+    return {**_job_status(job), "duplicate": False}
+
+
+@router.post("/batch")
+def upload_import_batch(
+    files: list[UploadFile],
+    mode: Literal["replace", "diff"] = "replace",
+    db: DbSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Mehrere CSVs und/oder ZIP-Archive mit CSVs in einem Request.
+    Anders als der Einzel-Upload wird hier direkt verarbeitet: parallel geparst,
+    je Datei ein eigener ImportJob, Ergebnis pro Datei.
+    """
+    for f in files:
+        if not f.filename.lower().endswith((".csv", ".zip")):
+            raise HTTPException(status_code=400, detail=f"Only CSV or ZIP files are allowed: {f.filename}")
+
+    spooled_paths: list[str] = []
+    sources: list[BatchSource] = []
+    results: list[dict] = []
+    try:
+        for f in files:
+            is_zip = f.filename.lower().endswith(".zip")
+            try:
+                spooled = spool_upload(
+                    f.file,
+                    spool_dir=settings.IMPORT_SPOOL_DIR,
+                    max_bytes=settings.IMPORT_MAX_UPLOAD_BYTES,
+                    block_size=settings.IMPORT_UPLOAD_BLOCK_SIZE,
+                    suffix=".zip" if is_zip else ".csv",
+                )
+            except UploadTooLargeError as e:
+                raise HTTPException(status_code=413, detail=f"{f.filename}: {e}")
+            spooled_paths.append(spooled.path)
 
-    with open(tmp_path, "wb") as f:
-        f.write(contents)
+            if not is_zip:
+                sources.append(BatchSource(filename=f.filename, path=spooled.path))
+                continue
 
-    job = svc.import_csv_file(db=db, file_path=tmp_path, original_filename=file.filename)
+            try:
+                members, rejected = zip_sources(spooled.path, settings.IMPORT_MAX_UPLOAD_BYTES)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {f.filename}")
+            sources.extend(members)
+            results.extend(rejected)
 
+        if len(sources) > settings.IMPORT_BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=400, detail=f"Too many files (max {settings.IMPORT_BATCH_MAX_FILES})"
+            )
+
+        results.extend(
+            import_batch(db, sources, mode=mode, workers=settings.IMPORT_BATCH_PARSE_WORKERS)
+        )
+    finally:
+        for path in spooled_paths:
+            os.remove(path)
+
+    return {"files": results}
+
+
+def _job_status(job: ImportJob) -> dict:
     return {
         "id": job.id,
         "status": job.status,
-        "period": job.period,
+        "tenant_id": job.tenant_id,
+        "period": period_str(job.period),
         "filename": job.original_filename,
+        "source_type": job.source_type,
+        "content_hash": job.content_hash,
+        "linked_job_id": job.linked_job_id,
+        "mode": job.mode,
+        "metrics": job.metrics,
+        "row_count": job.row_count,
+        "error_message": job.error_message,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
     }
 
 
 @router.get("")
 def list_imports(
+    tenant_id: int | None = None,
     db: DbSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
     stmt = select(ImportJob).order_by(desc(ImportJob.id)).limit(50)
+    if tenant_id is not None:
+        stmt = stmt.where(ImportJob.tenant_id == tenant_id)
     jobs = db.execute(stmt).scalars().all()
 
     return [
         {
             "id": j.id,
             "filename": j.original_filename,
-            "period": j.period,
+            "tenant_id": j.tenant_id,
+            "period": period_str(j.period),
             "status": j.status,
+            "row_count": j.row_count,
+            "metrics": j.metrics,
         }
         for j in jobs
     ]
+
+
+@router.get("/{job_id}")
+def import_status(
+    job_id: int,
+    db: DbSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    job = db.get(ImportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+
+    return _job_status(job)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.services.import_metrics import PROMETHEUS_CONTENT_TYPE, import_stats, metrics_authorized
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics(authorization: str | None = Header(default=None)):
+    # Imports dieses API-Prozesses (Sammel-Uploads); Worker liefern ihre Werte über WORKER_METRICS_PORT
+    if not metrics_authorized(authorization, settings.METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return PlainTextResponse(import_stats.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api import auth, imports, dashboard, employees
+from app.api import auth, imports, dashboard, employees, exports, tenants
 
 api_router = APIRouter(prefix="/api")
 
@@ -7,3 +7,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(employees.router, prefix="/employees", tags=["employees"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(tenants.router, prefix="/tenants", tags=["tenants"])
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.db import get_async_db
+from app.core.security import get_current_user_async
+from app.models.tenant import Tenant
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_tenants(
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
+):
+    """Alle Mandanten (aus den Imports bekannt); die IDs dienen als tenant_id-Filter der anderen Endpunkte."""
+    rows = (
+        await db.execute(select(Tenant).order_by(Tenant.advisor_number, Tenant.client_number))
+    ).scalars().all()
+    return [
+        {
+            "id": t.id,
+            "advisor_number": t.advisor_number,
+            "client_number": t.client_number,
+            "name": t.name,
+        }
+        for t in rows
+    ]
@@ -0,0 +1,137 @@
+"""
+Backfill: importiert ein Verzeichnis mit DATEV-Exporten (z. B. Jahre an Monatsdateien) am Stück.
+
+Start (aus backend/):
+    python -m app.cli.backfill /pfad/zu/exporten --workers 8
+
+Das Parsen (pandas, CPU-lastig) läuft parallel in einem Prozess-Pool, geschrieben wird
+ausschließlich im Hauptprozess über eine einzige DB-Session -> keine Lock-Konkurrenz auf der DB.
+Die Dateien werden in sortierter Reihenfolge geschrieben; kommt eine Periode mehrfach vor,
+gewinnt wie beim Upload die zuletzt importierte Datei.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.db import SessionLocal
+from app.core.periods import period_str
+from app.services.csv_import.base import ParsedCsv
+from app.services.import_metrics import ImportMetrics
+from app.services.import_service import ImportService
+from app.services.upload_storage import file_content_hash
+
+log = logging.getLogger("app.cli.backfill")
+
+_service: ImportService | None = None
+
+
+def _parse_file(path: str) -> tuple[str, ParsedCsv | None, str | None, str | None, ImportMetrics]:
+    """Läuft im Pool-Prozess: (path, parsed, content_hash, error, metrics)."""
+    global _service
+    if _service is None:
+        _service = ImportService()
+    metrics = ImportMetrics()
+    try:
+        parsed, _ = _service.detect_and_parse(path, metrics)
+        with metrics.stage("hash"):
+            content_hash = file_content_hash(path)
+        return path, parsed, content_hash, None, metrics
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}", metrics
+
+
+def find_files(directory: str, pattern: str = "*.csv", recursive: bool = False) -> list[str]:
+    root = Path(directory)
+    found = root.rglob(pattern) if recursive else root.glob(pattern)
+    return sorted(str(p) for p in found if p.is_file())
+
+
+def backfill(files: list[str], workers: int, mode: str = "replace") -> dict:
+    svc = ImportService()
+    stats = {"files": len(files), "ok": 0, "duplicate": 0, "error": 0, "rows": 0}
+    started = time.perf_counter()
+
+    # spawn wie beim Worker; höchstens 2 Dateien je Prozess im Voraus geparst halten
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool, SessionLocal() as db:
+        pending: deque[Future] = deque()
+        todo = iter(files)
+
+        def fill() -> None:
+            while len(pending) < workers * 2:
+                path = next(todo, None)
+                if path is None:
+                    return
+                pending.append(pool.submit(_parse_file, path))
+
+        fill()
+        while pending:
+            path, parsed, content_hash, error, metrics = pending.popleft().result()
+            fill()
+            name = os.path.basename(path)
+
+            if error is not None:
+                stats["error"] += 1
+                log.error("%s: %s", name, error)
+                continue
+
+            existing = svc.find_identical_import(db, content_hash, parsed.source_type, parsed.period)
+            if existing is not None:
+                stats["duplicate"] += 1
+                log.info("%s: %s unverändert (Import #%s)", name, period_str(parsed.period), existing.id)
+                continue
+
+            try:
+                job = svc.persist_parsed_csv(
+                    db=db, parsed=parsed, filename=name, content_hash=content_hash, mode=mode, metrics=metrics
+                )
+            except Exception as e:
+                # abgebrochene Transaktion verwerfen, sonst scheitern alle folgenden Dateien mit
+                # PendingRollbackError bzw. "current transaction is aborted"
+                db.rollback()
+                stats["error"] += 1
+                log.error("%s: %s", name, e)
+                continue
+
+            stats["ok"] += 1
+            stats["rows"] += len(parsed)
+            log.info("%s: %s, %d Zeilen (Import #%s)", name, period_str(parsed.period), len(parsed), job.id)
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["files_per_s"] = round(len(files) / elapsed, 2) if elapsed else 0.0
+    stats["rows_per_s"] = round(stats["rows"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="DATEV-Exporte eines Verzeichnisses importieren")
+    ap.add_argument("directory")
+    ap.add_argument("--pattern", default="*.csv", help="Dateimuster (Default: *.csv)")
+    ap.add_argument("--recursive", action="store_true", help="Unterverzeichnisse mit durchsuchen")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser-Prozesse")
+    ap.add_argument("--mode", choices=["replace", "diff"], default="replace")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    files = find_files(args.directory, args.pattern, args.recursive)
+    if not files:
+        raise SystemExit(f"keine Dateien für {args.pattern} in {args.directory}")
+
+    stats = backfill(files, max(args.workers, 1), args.mode)
+    print(
+        f"{stats['files']} Dateien ({stats['ok']} importiert, {stats['duplicate']} unverändert, "
+        f"{stats['error']} Fehler), {stats['rows']} Zeilen in {stats['seconds']:.2f}s"
+    )
+    print(f"{stats['files_per_s']:.2f} Dateien/s, {stats['rows_per_s']:.0f} Zeilen/s")
+    raise SystemExit(1 if stats["error"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.config import settings
+
+
+class DataGeneration:
+    """
+    Zähler, der bei jedem abgeschlossenen Import hochgezählt wird.
+    Zusätzlich wird eine Marker-Datei angefasst, damit auch Caches in anderen Prozessen
+    (API vs. Import-Worker) die Änderung über deren mtime mitbekommen.
+    """
+
+    def __init__(self, marker_path: str):
+        self._marker_path = marker_path
+        self._local = 0
+        self._lock = threading.Lock()
+
+    def bump(self) -> None:
+        with self._lock:
+            self._local += 1
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self._marker_path)), exist_ok=True)
+            with open(self._marker_path, "a"):
+                os.utime(self._marker_path, None)
+        except OSError:
+            pass
+
+    def current(self) -> tuple[int, int]:
+        try:
+            mtime = os.stat(self._marker_path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        return self._local, mtime
+
+
+class TTLCache:
+    """Thread-sicherer LRU-Cache mit TTL, der bei neuer Daten-Generation komplett verworfen wird."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float, generation: DataGeneration | None = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._generation = generation
+        self._seen_generation = generation.current() if generation else None
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_generation(self) -> None:
+        if self._generation is None:
+            return
+        gen = self._generation.current()
+        if gen != self._seen_generation:
+            self._data.clear()
+            self._seen_generation = gen
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            self._check_generation()
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _current_generation(self):
+        return self._generation.current() if self._generation is not None else None
+
+    def _set_if_generation(self, key: Hashable, value: Any, generation) -> None:
+        # Ergebnis verwerfen, wenn während der Berechnung ein Import fertig wurde: es kann
+        # noch den alten Stand enthalten und würde sonst bis zum Ablauf der TTL ausgeliefert
+        with self._lock:
+            if self._current_generation() != generation:
+                return
+            self._store(key, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        hit, value = self.get(key)
+        if hit:
+            return value
+        generation = self._current_generation()
+        value = compute()
+        self._set_if_generation(key, value, generation)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self.get(key)
+        if hit:
+            return value
+        generation = self._current_generation()
+        value = await compute()
+        self._set_if_generation(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+data_generation = DataGeneration(settings.DATA_GENERATION_FILE)
+
+dashboard_cache = TTLCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    generation=data_generation,
+)
+
+# Trefferzahlen der Mitarbeitersuche (COUNT ist bei großen Beständen der teure Teil)
+employee_count_cache = TTLCache(
+    maxsize=settings.EMPLOYEE_COUNT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EMPLOYEE_COUNT_CACHE_TTL_SECONDS,
+    generation=data_generation,
+)
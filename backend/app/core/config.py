@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,12 +8,74 @@ class Settings(BaseSettings):
 
     APP_ENV: str = "dev"
     DATABASE_URL: str = "sqlite:///./app.db"
+    # Async-Engine der lesenden Endpunkte; leer = aus DATABASE_URL abgeleitet (aiosqlite bzw. psycopg)
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection-Pool (API und jeder Worker-Prozess haben einen eigenen)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # -1 = nie
+
+    # Pragmas für jede SQLite-Verbindung (siehe core/db.py)
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    # so lange auf eine Schreibsperre warten (mehrere Worker + API), bevor "database is locked" kommt
+    SQLITE_BUSY_TIMEOUT_MS: int = 30_000
 
     SESSION_COOKIE_NAME: str = "session"
     SESSION_TTL_DAYS: int = 14
+    # kurzlebiger In-Memory-Cache für Session-Lookups in get_current_user. Der Cache lebt pro
+    # Prozess: Logout, Deaktivierung oder gelöschte Sessions aus einem anderen Prozess (weitere
+    # uvicorn-Worker, Bulk-UPDATE, direkt in der DB) greifen erst nach Ablauf dieser TTL.
+    # 0 schaltet den Cache ab.
+    SESSION_CACHE_TTL_SECONDS: int = 5
+    SESSION_CACHE_MAX_ENTRIES: int = 10_000
+    SESSION_SWEEP_INTERVAL_SECONDS: int = 3600
 
     BOOTSTRAP_ADMIN_USERNAME: str = "admin"
     BOOTSTRAP_ADMIN_PASSWORD: str = "admin123"
 
+    # Zeilen pro Chunk beim Streaming-Import (0 = Datei komplett laden)
+    IMPORT_CHUNK_SIZE: int = 50_000
+    # PostgreSQL: Zeilen per COPY in eine Staging-Tabelle und set-basiert übernehmen (services/pg_copy.py)
+    IMPORT_PG_COPY: bool = True
+
+    # Ablage für Uploads, bis ein Worker sie verarbeitet hat
+    IMPORT_SPOOL_DIR: str = "./uploads"
+    IMPORT_MAX_UPLOAD_BYTES: int = 200 * 1024 * 1024  # 0 = unbegrenzt
+    IMPORT_UPLOAD_BLOCK_SIZE: int = 1024 * 1024
+
+    # Sammel-Upload (mehrere CSVs / ZIP): parallele Parser-Threads, max. Dateien je Request
+    IMPORT_BATCH_PARSE_WORKERS: int = 4
+    IMPORT_BATCH_MAX_FILES: int = 200
+
+    # Exporte (CSV/Parquet): Zeilen je Fetch vom serverseitigen Cursor bzw. je Parquet-Row-Group
+    EXPORT_YIELD_PER: int = 5_000
+
+    # Prometheus-Endpunkt /metrics (prozesslokale Import-Zähler, services/import_metrics.py).
+    # Ohne Login; mit METRICS_TOKEN nur mit "Authorization: Bearer <token>" abrufbar
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+
+    WORKER_POLL_INTERVAL_SECONDS: float = 2.0
+    WORKER_MAX_ATTEMPTS: int = 5
+    # Jobs, die so lange in "processing" hängen (Worker abgestürzt), werden neu eingeplant;
+    # muss deutlich über der Laufzeit des größten Imports liegen
+    WORKER_STALE_AFTER_SECONDS: int = 1800
+    # /metrics je Worker-Prozess auf WORKER_METRICS_PORT + Index (0 = aus); Token wie METRICS_TOKEN
+    WORKER_METRICS_PORT: int = 0
+
+    # Dashboard-Antwort-Cache; wird nach jedem Import über DATA_GENERATION_FILE invalidiert
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 256
+
+    EMPLOYEE_COUNT_CACHE_TTL_SECONDS: int = 300
+    EMPLOYEE_COUNT_CACHE_MAX_ENTRIES: int = 1024
+    DATA_GENERATION_FILE: str = "./uploads/.data_generation"
+
 
 settings = Settings()
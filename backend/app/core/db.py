@@ -1,11 +1,75 @@
-from sqlalchemy import create_engine
+from sqlalchemy import PrimaryKeyConstraint, create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
 
-# SQLite braucht check_same_thread=False
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, future=True)
+def _set_sqlite_pragmas(dbapi_conn, connection_record) -> None:
+    # WAL: Dashboard-Leser laufen weiter, während ein Import schreibt; NORMAL reicht mit WAL
+    cursor = dbapi_conn.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    # negativ = Größe in KiB statt in Seiten
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def _engine_kwargs(url: str) -> dict:
+    sa_url = make_url(url)
+    is_sqlite = sa_url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and sa_url.database in (None, "", ":memory:")
+
+    kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "future": True}
+    if is_sqlite:
+        # SQLite braucht check_same_thread=False
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not in_memory:
+        # In-Memory-SQLite nutzt einen Single-Connection-Pool ohne diese Parameter
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    return kwargs
+
+
+def make_engine(url: str) -> Engine:
+    """Engine mit Pool-Einstellungen aus Settings; SQLite-Verbindungen bekommen die Pragmas."""
+    eng = create_engine(url, **_engine_kwargs(url))
+    if eng.dialect.name == "sqlite":
+        event.listen(eng, "connect", _set_sqlite_pragmas)
+    return eng
+
+
+# Treiber, die SQLAlchemy asynchron ansprechen kann
+# (psycopg 3 ist zugleich der synchrone PostgreSQL-Treiber, braucht also kein weiteres Paket)
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "psycopg"}
+
+
+def async_database_url(url: str) -> str:
+    """sqlite:///x.db -> sqlite+aiosqlite:///x.db, postgresql(+psycopg2)://... -> postgresql+psycopg://..."""
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    explicit_driver = sa_url.drivername.partition("+")[2]
+    if backend not in _ASYNC_DRIVERS or explicit_driver in ("aiosqlite", "asyncpg", "psycopg"):
+        return url
+    return sa_url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str) -> AsyncEngine:
+    eng = create_async_engine(url, **_engine_kwargs(url))
+    if eng.dialect.name == "sqlite":
+        event.listen(eng.sync_engine, "connect", _set_sqlite_pragmas)
+    return eng
+
+
+engine = make_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
@@ -14,13 +78,78 @@ SessionLocal = sessionmaker(
 )
 
 
+# Async-Pfad für lesende Endpunkte; erst beim ersten Zugriff angelegt, damit Worker und CLI
+# ohne aiosqlite auskommen
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_sessionmaker = async_sessionmaker(
+            bind=make_async_engine(url),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
+
+
 class Base(DeclarativeBase):
     pass
 
 
+def check_schema(eng: Engine) -> None:
+    """
+    Bricht ab, wenn vorhandene Tabellen Spalten des aktuellen Modells nicht haben. Es gibt keine
+    Migrationen: create_all legt nur fehlende Tabellen an, eine ältere Datenbank (vor Mandanten,
+    Integer-Perioden und Cent-Beträgen) muss neu angelegt und neu importiert werden (README).
+    """
+    insp = inspect(eng)
+    existing = set(insp.get_table_names())
+    outdated = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {c["name"] for c in insp.get_columns(table.name)}
+        missing = [c.name for c in table.columns if c.name not in columns]
+        if missing:
+            outdated.append(f"{table.name} ({', '.join(missing)})")
+    if outdated:
+        raise RuntimeError(
+            "Database schema is outdated, missing columns: " + "; ".join(outdated)
+            + ". Recreate the database and re-import the exports (see README)."
+        )
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _pk_with_partition_key(constraint, compiler, **kw):
+    # Partitionierte Tabellen (table.info["partition_key"]) brauchen den Partitionsschlüssel im PK.
+    # Nur für PostgreSQL: SQLite vergibt Autoincrement-IDs nur bei einspaltigem INTEGER PRIMARY KEY.
+    table = constraint.table
+    extra = [
+        table.c[name]
+        for name in table.info.get("partition_key", ())
+        if not constraint.columns.contains_column(table.c[name])
+    ]
+    if not extra:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+
+    ddl = ""
+    if constraint.name is not None:
+        ddl += f"CONSTRAINT {compiler.preparer.format_constraint(constraint)} "
+    columns = [*constraint.columns, *extra]
+    return ddl + "PRIMARY KEY (%s)" % ", ".join(compiler.preparer.quote(c.name) for c in columns)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
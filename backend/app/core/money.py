@@ -0,0 +1,34 @@
+"""
+Beträge werden als ganze Cent (int, BIGINT in der DB) geparst, gespeichert und summiert.
+Euro-Werte bzw. deutsche Schreibweise entstehen erst an der Ausgabe (API-Antwort, Export).
+"""
+import re
+
+# deutscher Betrag ohne Tausenderpunkte: Vorzeichen, Euro, Nachkommastellen ("-1234,56")
+AMOUNT_RE = re.compile(r"^([+-]?)(\d*)(?:,(\d*))?$")
+
+
+def parse_cents(value) -> int:
+    """'1.234,56' -> 123456, leer/ungültig -> 0; ab der dritten Nachkommastelle kaufmännisch gerundet."""
+    if value is None:
+        return 0
+    m = AMOUNT_RE.match(str(value).strip().replace(".", ""))
+    if m is None:
+        return 0
+    sign, whole, frac = m.groups()
+    cents = int(whole or 0) * 100 + (int(((frac or "") + "000")[:3]) + 5) // 10
+    return -cents if sign == "-" else cents
+
+
+def cents_to_euro(cents: int | None) -> float:
+    # für JSON-Antworten; int / 100 ist korrekt gerundet, Summen bleiben bis dahin exakt
+    return (cents or 0) / 100
+
+
+def format_cents_de(cents: int | None) -> str:
+    """123456 -> '1.234,56'"""
+    if cents is None:
+        return ""
+    sign = "-" if cents < 0 else ""
+    euros, rest = divmod(abs(cents), 100)
+    return f"{sign}{euros:,}".replace(",", ".") + f",{rest:02d}"
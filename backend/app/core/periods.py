@@ -0,0 +1,43 @@
+"""
+Perioden werden intern als Integer YYYYMM gespeichert (2026-01 -> 202601):
+kompakt, sortiert wie der Kalender und als Partitionsschlüssel nutzbar.
+Nach außen (API, Exporte, Logs) bleibt das Format "YYYY-MM"; umgewandelt wird nur an diesen Grenzen.
+"""
+import re
+from functools import lru_cache
+
+# für Query-Parameter (FastAPI Query(pattern=...))
+PERIOD_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+_PERIOD_RE = re.compile(PERIOD_PATTERN)
+
+
+def make_period(year: int, month: int) -> int:
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {month}")
+    return year * 100 + month
+
+
+def period_key(value: str) -> int:
+    """'2026-01' -> 202601"""
+    if not _PERIOD_RE.match(value):
+        raise ValueError(f"Invalid period (expected YYYY-MM): {value!r}")
+    return make_period(int(value[:4]), int(value[5:7]))
+
+
+def period_key_or_none(value: str | None) -> int | None:
+    return period_key(value) if value else None
+
+
+@lru_cache(maxsize=1024)
+def period_str(key: int | None) -> str | None:
+    """202601 -> '2026-01'"""
+    if key is None:
+        return None
+    return f"{key // 100:04d}-{key % 100:02d}"
+
+
+def next_period(key: int) -> int:
+    """202612 -> 202701"""
+    year, month = divmod(key, 100)
+    return make_period(year + 1, 1) if month == 12 else key + 1
@@ -1,18 +1,48 @@
+import hashlib
+import logging
 import secrets
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, Request
-from app.core.db import get_db
+from app.core.db import get_db, get_async_db, SessionLocal
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as DbSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, event
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models.session import Session
 from app.models.user import User
 
+log = logging.getLogger("app.security")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@dataclass(frozen=True)
+class CurrentUser:
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    session_expires_at: datetime
+
+
+# token-hash -> CurrentUser; spart pro Request SELECT auf sessions + users
+session_cache = TTLCache(
+    maxsize=settings.SESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+)
+
+
+def _token_key(token: str) -> str:
+    # Klartext-Token nicht als Cache-Key im Speicher halten
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -33,7 +63,7 @@ def create_session(db: DbSession, user: User) -> Session:
     return s
 
 
-def get_user_by_session_token(db: DbSession, token: str) -> User | None:
+def _lookup_session(db: DbSession, token: str) -> tuple[Session, User] | None:
     if not token:
         return None
 
@@ -42,39 +72,117 @@ def get_user_by_session_token(db: DbSession, token: str) -> User | None:
     if sess is None:
         return None
 
+    # abgelaufene Sessions räumt purge_expired_sessions periodisch auf
     if sess.expires_at < datetime.utcnow():
-        # abgelaufene Session aufräumen
-        db.delete(sess)
-        db.commit()
         return None
 
     user = db.get(User, sess.user_id)
     if user is None or not user.is_active:
         return None
 
-    return user
+    return sess, user
+
+
+def get_user_by_session_token(db: DbSession, token: str) -> User | None:
+    found = _lookup_session(db, token)
+    return found[1] if found else None
 
 
 def delete_session(db: DbSession, token: str) -> None:
     if not token:
         return
+    session_cache.invalidate(_token_key(token))
     stmt = select(Session).where(Session.token == token)
     sess = db.execute(stmt).scalar_one_or_none()
     if sess:
         db.delete(sess)
         db.commit()
 
+
+def invalidate_user_sessions(user_id: int) -> None:
+    session_cache.invalidate_where(lambda cu: cu.id == user_id)
+
+
+@event.listens_for(User.is_active, "set")
+def _on_user_active_changed(target: User, value, oldvalue, initiator):
+    # Deaktivierung über das ORM greift in diesem Prozess sofort; Bulk-UPDATEs und andere
+    # Prozesse sehen den Listener nicht, dort begrenzt SESSION_CACHE_TTL_SECONDS die Verzögerung
+    if not value and target.id is not None:
+        invalidate_user_sessions(target.id)
+
+
+def purge_expired_sessions(db: DbSession) -> int:
+    res = db.execute(delete(Session).where(Session.expires_at < datetime.utcnow()))
+    db.commit()
+    return res.rowcount or 0
+
+
+def start_session_sweeper(interval_seconds: int) -> threading.Thread:
+    def _run():
+        while True:
+            time.sleep(interval_seconds)
+            try:
+                with SessionLocal() as db:
+                    n = purge_expired_sessions(db)
+                if n:
+                    log.info("purged %s expired sessions", n)
+            except Exception:
+                log.exception("session sweep failed")
+
+    t = threading.Thread(target=_run, name="session-sweeper", daemon=True)
+    t.start()
+    return t
+
+
+def _cached_user(request: Request) -> tuple[str, str, CurrentUser | None]:
+    token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    key = _token_key(token)
+    hit, current = session_cache.get(key)
+    if hit and current.session_expires_at >= datetime.utcnow():
+        return token, key, current
+    return token, key, None
+
+
+def _remember_user(key: str, found: tuple[Session, User] | None) -> CurrentUser:
+    if found is None:
+        session_cache.invalidate(key)
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    sess, user = found
+    current = CurrentUser(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        is_active=user.is_active,
+        session_expires_at=sess.expires_at,
+    )
+    if settings.SESSION_CACHE_TTL_SECONDS > 0:
+        session_cache.set(key, current)
+    return current
+
+
 def get_current_user(
     request: Request,
     db: DbSession = Depends(get_db),
 ):
-    token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
-    user = get_user_by_session_token(db, token)
+    token, key, current = _cached_user(request)
+    if current is not None:
+        return current
+    return _remember_user(key, _lookup_session(db, token))
 
-    if user is None:
-        raise HTTPException(status_code=401, detail="Not authenticated")
 
-    return user
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Wie get_current_user, für async-Endpunkte; bei Cache-Treffer ohne DB-Zugriff."""
+    token, key, current = _cached_user(request)
+    if current is not None:
+        return current
+    return _remember_user(key, await db.run_sync(_lookup_session, token))
 
 def require_role(required_role: str):
     def _checker(user = Depends(get_current_user)):
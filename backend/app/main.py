@@ -1,20 +1,26 @@
 from fastapi import FastAPI
 from app.api.router import api_router
-from app.core.db import engine, Base, SessionLocal
+from app.api import metrics
+from app.core.db import engine, Base, SessionLocal, check_schema
 from app.core.config import settings
-from app.core.security import hash_password
+from app.core.security import hash_password, purge_expired_sessions, start_session_sweeper
 from sqlalchemy import select
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.models.user import User  # wichtig: damit Model registriert ist
 from app.models.session import Session  # auch registrieren
+from app.models.tenant import Tenant
 from app.models.import_job import ImportJob
 from app.models.employee import Employee
 from app.models.employee_cost import EmployeeCost
+from app.models.period_summary import PeriodSummary
 
 
 app = FastAPI(title="CSV Reporting App")
 app.include_router(api_router)
+if settings.METRICS_ENABLED:
+    # ohne Session-Login, für den Prometheus-Scraper (optional per METRICS_TOKEN geschützt)
+    app.include_router(metrics.router)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -28,8 +34,9 @@ app.add_middleware(
 
 @app.on_event("startup")
 def on_startup():
-    # Tabellen anlegen (MVP)
+    # Tabellen anlegen (MVP); bestehende Tabellen ändert create_all nicht, siehe check_schema
     Base.metadata.create_all(bind=engine)
+    check_schema(engine)
 
     # Admin-User bootstrappen, falls DB leer
     db = SessionLocal()
@@ -44,9 +51,14 @@ def on_startup():
             )
             db.add(admin)
             db.commit()
+
+        purge_expired_sessions(db)
     finally:
         db.close()
 
+    # abgelaufene Sessions im Hintergrund statt im Request-Pfad löschen
+    start_session_sweeper(settings.SESSION_SWEEP_INTERVAL_SECONDS)
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
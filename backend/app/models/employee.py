@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import ForeignKey, String, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -6,15 +6,45 @@ from app.core.db import Base
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Pers.-Nr. sind nur innerhalb eines Mandanten eindeutig
+        UniqueConstraint("tenant_id", "external_id", name="uq_employees_tenant_external_id"),
+        # Sortierung + Keyset-Pagination der Mitarbeiterliste (alle Mandanten bzw. ein Mandant)
+        Index("ix_employees_name_order", "last_name", "first_name", "id"),
+        Index("ix_employees_tenant_name_order", "tenant_id", "last_name", "first_name", "id"),
+        # Präfixsuche (LIKE 'x%', services/employee_search.py); auf PostgreSQL mit *_pattern_ops,
+        # damit der Index unabhängig von der Datenbank-Collation greift
+        Index("ix_employees_external_id", "external_id", postgresql_ops={"external_id": "varchar_pattern_ops"}),
+        Index("ix_employees_last_name_norm", "last_name_norm", postgresql_ops={"last_name_norm": "varchar_pattern_ops"}),
+        Index("ix_employees_first_name_norm", "first_name_norm", postgresql_ops={"first_name_norm": "varchar_pattern_ops"}),
+        Index(
+            "ix_employees_tenant_last_name_norm",
+            "tenant_id",
+            "last_name_norm",
+            postgresql_ops={"last_name_norm": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_employees_tenant_first_name_norm",
+            "tenant_id",
+            "first_name_norm",
+            postgresql_ops={"first_name_norm": "varchar_pattern_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"))
+
     # Pers.-Nr. aus CSV
-    external_id: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    external_id: Mapped[str] = mapped_column(String(50))
 
     first_name: Mapped[str] = mapped_column(String(100))
     last_name: Mapped[str] = mapped_column(String(100))
 
+    # normalisierte Namen für die indexierte Präfixsuche (services/employee_search.py)
+    first_name_norm: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    last_name_norm: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
     # Historie der Payroll-Zeilen
     costs = relationship(
         "EmployeeCost",
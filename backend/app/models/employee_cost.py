@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Numeric, Index
+from sqlalchemy import String, ForeignKey, BigInteger, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -8,10 +8,17 @@ class EmployeeCost(Base):
     __tablename__ = "employee_costs"
     __table_args__ = (
         Index("ix_employee_costs_employee_period", "employee_id", "period"),
+        # Abfragen eines Mandanten (Top-Mitarbeiter, Hotspots, Export) lesen nur dessen Zeilen
+        Index("ix_employee_costs_tenant_period", "tenant_id", "period"),
+        # PostgreSQL: eine Range-Partition je Monat (services/cost_partitions.py legt sie beim Import an);
+        # der PK wird dort zu (id, period), siehe core/db.py
+        {"postgresql_partition_by": "RANGE (period)", "info": {"partition_key": ("period",)}},
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
+    # redundant zu employee.tenant_id, damit mandantenbezogene Abfragen ohne Join filtern können
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"))
     import_id: Mapped[int] = mapped_column(
         ForeignKey("imports.id", ondelete="CASCADE"), index=True
     )
@@ -19,22 +26,23 @@ class EmployeeCost(Base):
         ForeignKey("employees.id", ondelete="CASCADE"), index=True
     )
 
-    period: Mapped[str] = mapped_column(String(7), index=True)  # YYYY-MM
+    period: Mapped[int] = mapped_column(Integer, index=True)  # YYYYMM (core/periods.py)
 
-    gross_amount: Mapped[float] = mapped_column(Numeric(12, 2))                 # Gesamtbrutto
-    ag_bav_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)     # AG-Anteil bAV
-    subsidy_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)    # Förderbetrag
-    net_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)        # Nettobezüge/Nettoabzüge
-    sv_ag_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)      # SV-AG-Anteil
-    umlage_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)     # Umlage
+    # Beträge in Cent (core/money.py)
+    gross_amount: Mapped[int] = mapped_column(BigInteger)                 # Gesamtbrutto
+    ag_bav_amount: Mapped[int] = mapped_column(BigInteger, default=0)     # AG-Anteil bAV
+    subsidy_amount: Mapped[int] = mapped_column(BigInteger, default=0)    # Förderbetrag
+    net_amount: Mapped[int] = mapped_column(BigInteger, default=0)        # Nettobezüge/Nettoabzüge
+    sv_ag_amount: Mapped[int] = mapped_column(BigInteger, default=0)      # SV-AG-Anteil
+    umlage_amount: Mapped[int] = mapped_column(BigInteger, default=0)     # Umlage
 
-    reimb_kk_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)   # Erstattung KK
-    flat_tax_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)   # Pauschale Steuern
-    reimb_ba_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)   # Erstattung BA
-    reimb_ifsg_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0) # Erstattungen IfSG
+    reimb_kk_amount: Mapped[int] = mapped_column(BigInteger, default=0)   # Erstattung KK
+    flat_tax_amount: Mapped[int] = mapped_column(BigInteger, default=0)   # Pauschale Steuern
+    reimb_ba_amount: Mapped[int] = mapped_column(BigInteger, default=0)   # Erstattung BA
+    reimb_ifsg_amount: Mapped[int] = mapped_column(BigInteger, default=0) # Erstattungen IfSG
 
-    total_cost_wo_reimb: Mapped[float] = mapped_column(Numeric(12, 2), default=0)  # GK ohne Erstattung
-    total_cost: Mapped[float] = mapped_column(Numeric(12, 2), default=0)           # Gesamtkosten
+    total_cost_wo_reimb: Mapped[int] = mapped_column(BigInteger, default=0)  # GK ohne Erstattung
+    total_cost: Mapped[int] = mapped_column(BigInteger, default=0)           # Gesamtkosten
 
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
 
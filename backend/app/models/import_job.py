@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, UniqueConstraint
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Index, JSON, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -9,20 +9,55 @@ from app.core.db import Base
 class ImportJob(Base):
     __tablename__ = "imports"
     __table_args__ = (
-        # pro CSV-Typ und Monat genau 1 Import (neuer Upload überschreibt)
-        UniqueConstraint("source_type", "period", name="uq_imports_source_period"),
+        # pro Mandant, CSV-Typ und Monat genau 1 Import (neuer Upload überschreibt);
+        # "merged"/"duplicate"-Jobs verweisen nur auf diesen Import und zählen nicht mit
+        Index(
+            "uq_imports_tenant_source_period",
+            "tenant_id",
+            "source_type",
+            "period",
+            unique=True,
+            sqlite_where=text("status NOT IN ('merged', 'duplicate')"),
+            postgresql_where=text("status NOT IN ('merged', 'duplicate')"),
+        ),
+        # Dublettenprüfung: identische Datei für denselben Mandanten/Typ/Monat nicht erneut importieren
+        Index("ix_imports_tenant_source_period_hash", "tenant_id", "source_type", "period", "content_hash"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    source_type: Mapped[str] = mapped_column(String(100), index=True)
-    period: Mapped[str] = mapped_column(String(7), index=True)  # YYYY-MM
+    # erst nach dem Parsen bekannt -> solange der Job "pending" ist NULL
+    tenant_id: Mapped[int | None] = mapped_column(
+        ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True
+    )
+    source_type: Mapped[str | None] = mapped_column(String(100), index=True, nullable=True)
+    period: Mapped[int | None] = mapped_column(Integer, index=True, nullable=True)  # YYYYMM
 
     original_filename: Mapped[str] = mapped_column(String(255))
-    status: Mapped[str] = mapped_column(String(20), default="pending")
+    # pending -> processing -> ok | error | duplicate | merged
+    status: Mapped[str] = mapped_column(String(20), default="pending", index=True)
     error_message: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
+    # abgelegte Upload-Datei, die der Worker verarbeitet
+    stored_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)  # sha256, normalisiert
+    # bei status "duplicate": der bestehende Import mit identischem Inhalt,
+    # bei status "merged": der Import der Periode, in den die Änderungen geschrieben wurden
+    linked_job_id: Mapped[int | None] = mapped_column(
+        ForeignKey("imports.id", ondelete="SET NULL"), nullable=True
+    )
+    # "replace" (Periode neu schreiben) oder "diff" (nur Änderungen schreiben)
+    mode: Mapped[str] = mapped_column(String(10), default="replace")
+    worker_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    row_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # Kennzahlen des letzten Laufs, z.B. {"diff": {"inserted": .., "updated": .., ...}}
+    metrics: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # optional: falls du mal mehrere Währungen/Imports willst
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
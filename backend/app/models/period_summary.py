@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, BigInteger, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class PeriodSummary(Base):
+    """
+    Vorberechnete Summen je Mandant, Periode und CSV-Typ für das Dashboard.
+    Wird in derselben Transaktion wie der Import aktualisiert (services/period_summary.py).
+    """
+    __tablename__ = "period_summary"
+
+    tenant_id: Mapped[int] = mapped_column(
+        ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+    )
+    period: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)  # YYYYMM
+    source_type: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    employee_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Summen in Cent
+    gross_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    ag_bav_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    subsidy_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    net_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    sv_ag_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    umlage_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    reimb_kk_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    flat_tax_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    reimb_ba_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+    reimb_ifsg_amount: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    total_cost_wo_reimb: Mapped[int] = mapped_column(BigInteger, default=0)
+    total_cost: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class Tenant(Base):
+    """
+    Mandant einer Steuerkanzlei: Berater- und Mandantennummer aus Zeile 1 des DATEV-Exports
+    ("12163;28260;<Firma>;Jan 26"). Mitarbeiter, Kosten, Imports und Summen hängen daran.
+    """
+    __tablename__ = "tenants"
+    __table_args__ = (
+        UniqueConstraint("advisor_number", "client_number", name="uq_tenants_advisor_client"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    advisor_number: Mapped[str] = mapped_column(String(20))  # Beraternummer
+    client_number: Mapped[str] = mapped_column(String(20))   # Mandantennummer
+    # Firmenname aus dem letzten Import
+    name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
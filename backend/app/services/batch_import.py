@@ -0,0 +1,170 @@
+import io
+import os
+import zipfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from app.core.periods import period_str
+from app.models.import_job import ImportJob
+from app.services.csv_import.base import ParsedCsv
+from app.services.import_metrics import ImportMetrics, import_stats
+from app.services.import_service import ImportService
+from app.services.upload_storage import HashingReader
+
+
+@dataclass(frozen=True)
+class BatchSource:
+    """Eine CSV im Sammel-Upload: eigene Datei auf Platte oder Mitglied eines ZIP-Archivs."""
+
+    filename: str
+    path: str
+    member: str | None = None
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        if self.member is None:
+            with open(self.path, "rb") as f:
+                yield f
+        else:
+            # eigenes ZipFile je Aufruf -> parallele Threads teilen sich keinen Dateizeiger
+            with zipfile.ZipFile(self.path) as zf, zf.open(self.member) as f:
+                yield f
+
+
+def zip_sources(zip_path: str, max_member_bytes: int = 0) -> tuple[list[BatchSource], list[dict]]:
+    """
+    CSV-Mitglieder eines Archivs, ohne zu entpacken.
+    Zu große Mitglieder (entpackte Größe laut Verzeichnis) landen direkt als Fehler in der Ergebnisliste.
+    """
+    sources: list[BatchSource] = []
+    rejected: list[dict] = []
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(".csv"):
+                continue
+            filename = os.path.basename(name)
+            if max_member_bytes and info.file_size > max_member_bytes:
+                rejected.append(
+                    {"filename": filename, "status": "error", "error": f"exceeds limit of {max_member_bytes} bytes"}
+                )
+                continue
+            sources.append(BatchSource(filename=filename, path=zip_path, member=name))
+    return sources, rejected
+
+
+def _parse_source(
+    svc: ImportService, source: BatchSource
+) -> tuple[str | None, ParsedCsv | None, str | None, ImportMetrics]:
+    """Läuft im Thread-Pool: (content_hash, parsed, error, metrics)."""
+    metrics = ImportMetrics()
+    content_hash = parsed = error = None
+    try:
+        with source.open() as f:
+            # Hash beim Parsen mitrechnen -> ZIP-Mitglieder werden nur einmal entpackt
+            reader = HashingReader(f)
+            try:
+                parsed, _ = svc.detect_and_parse(io.BufferedReader(reader), metrics)
+            except Exception as e:
+                error = str(e)
+            # auch für den Fehler-Job; liest nach, was der Parser nicht gebraucht hat
+            with metrics.stage("hash"):
+                content_hash = reader.content_hash()
+    except Exception as e:
+        # beschädigte Archiv-Mitglieder (BadZipFile, CRC-Fehler) betreffen nur diese Datei
+        error = error or str(e)
+    if error is not None:
+        return content_hash, None, error, metrics
+    return content_hash, parsed, None, metrics
+
+
+def import_batch(
+    db: Session,
+    sources: list[BatchSource],
+    mode: str = "replace",
+    workers: int = 4,
+) -> list[dict]:
+    """
+    Parst alle Dateien parallel und schreibt sie anschließend einzeln, in Upload-Reihenfolge,
+    jeweils als eigenen ImportJob. Ein Fehler betrifft nur die jeweilige Datei.
+    """
+    svc = ImportService()
+    results: list[dict] = []
+
+    workers = max(workers, 1)
+    # wie cli/backfill.py: höchstens 2 geparste Dateien je Thread im Voraus im Speicher halten
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: deque[tuple[BatchSource, Future]] = deque()
+        todo = iter(sources)
+
+        def fill() -> None:
+            while len(pending) < workers * 2:
+                source = next(todo, None)
+                if source is None:
+                    return
+                pending.append((source, pool.submit(_parse_source, svc, source)))
+
+        fill()
+        while pending:
+            source, future = pending.popleft()
+            content_hash, parsed, error, metrics = future.result()
+            fill()
+            result = {"filename": source.filename}
+
+            if error is not None:
+                job = ImportJob(
+                    original_filename=source.filename,
+                    content_hash=content_hash,
+                    mode=mode,
+                    status="error",
+                    error_message=error[:500],
+                    finished_at=datetime.utcnow(),
+                    metrics=metrics.as_dict(),
+                )
+                db.add(job)
+                db.commit()
+                import_stats.record(job.status, job.metrics)
+                results.append({**result, "id": job.id, "status": "error", "error": error})
+                continue
+
+            existing = svc.find_identical_import(db, content_hash, parsed.source_type, parsed.period)
+            if existing is not None:
+                results.append(
+                    {**result, "id": existing.id, "status": "duplicate", "period": period_str(existing.period)}
+                )
+                continue
+
+            try:
+                job = svc.persist_parsed_csv(
+                    db=db,
+                    parsed=parsed,
+                    filename=source.filename,
+                    content_hash=content_hash,
+                    mode=mode,
+                    metrics=metrics,
+                )
+            except Exception as e:
+                db.rollback()
+                # persist_parsed_csv hat seinen Job bereits als Fehler gespeichert
+                import_stats.record("error")
+                results.append({**result, "status": "error", "error": str(e)})
+                continue
+
+            results.append(
+                {
+                    **result,
+                    "id": job.id,
+                    "status": job.status,
+                    "period": period_str(job.period),
+                    "row_count": job.row_count,
+                }
+            )
+
+    return results
@@ -0,0 +1,92 @@
+"""
+Monatspartitionen von employee_costs (nur PostgreSQL, siehe models/employee_cost.py).
+
+Die Elterntabelle ist nach period (YYYYMM) range-partitioniert; je Monat gibt es eine Partition
+employee_costs_pYYYYMM, die der Import vor seiner eigenen Transaktion anlegt. Abfragen mit Periodenfilter
+lesen dadurch nur die betroffenen Partitionen, und ein Replace-Import leert eine Partition per
+TRUNCATE statt Zeile für Zeile zu löschen.
+SQLite hat keine Partitionen; dort sind beide Funktionen No-ops.
+"""
+from sqlalchemy import or_, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.periods import next_period
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+
+PARENT_TABLE = EmployeeCost.__tablename__
+
+# duplicate_table bzw. unique_violation auf pg_type: ein paralleler Import war mit CREATE schneller
+_ALREADY_EXISTS = ("42P07", "23505")
+
+
+def is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def partition_name(period: int) -> str:
+    return f"{PARENT_TABLE}_p{int(period)}"
+
+
+def ensure_cost_partition(db: Session, period: int) -> None:
+    """
+    Legt die Partition für period an, falls sie fehlt. Aufruf vor dem ersten Zugriff des Imports
+    auf employee_costs: CREATE ... PARTITION OF sperrt die Elterntabelle exklusiv, deshalb läuft es
+    auf einer eigenen Verbindung in Autocommit statt bis zum Ende der Import-Transaktion.
+    Legt ein paralleler Import dieselbe Partition gleichzeitig an, gilt das als Erfolg.
+    """
+    if not is_partitioned(db):
+        return
+    period = int(period)
+    name = partition_name(period)
+    with db.get_bind().engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Normalfall: Partition existiert schon -> ohne Sperre auf der Elterntabelle zurück
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            return
+        try:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM ({period}) TO ({next_period(period)})"
+                )
+            )
+        except DBAPIError as e:
+            sqlstate = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+            if sqlstate not in _ALREADY_EXISTS:
+                raise
+
+
+def _has_foreign_imports(db: Session, tenant_id: int, source_type: str, period: int) -> bool:
+    foreign = db.execute(
+        select(ImportJob.id)
+        .where(
+            ImportJob.period == period,
+            or_(ImportJob.tenant_id != tenant_id, ImportJob.source_type != source_type),
+        )
+        .limit(1)
+    ).first()
+    return foreign is not None
+
+
+def truncate_cost_partition(db: Session, tenant_id: int, source_type: str, period: int) -> bool:
+    """
+    Leert die Partition der Periode, wenn sie nur Zeilen dieses Mandanten und CSV-Typs enthält
+    (sonst würde TRUNCATE fremde Imports mitnehmen). Liefert False, wenn der Aufrufer
+    stattdessen zeilenweise löschen muss. Die Partition muss bereits existieren.
+    """
+    if not is_partitioned(db):
+        return False
+    # Normalfall mit mehreren Mandanten je Monat: ohne Sperre erkennen und zeilenweise löschen
+    if _has_foreign_imports(db, tenant_id, source_type, period):
+        return False
+
+    # Die Prüfung oben sieht nur committete Imports. EXCLUSIVE wartet auf laufende Schreiber der
+    # Partition und hält neue bis zum Commit auf; erst danach ist die Wiederholung verlässlich.
+    # Lesende Abfragen (ACCESS SHARE) bleiben bis zum TRUNCATE möglich.
+    db.execute(text(f"LOCK TABLE {partition_name(period)} IN EXCLUSIVE MODE"))
+    if _has_foreign_imports(db, tenant_id, source_type, period):
+        return False
+    # nur die Partition dieses Monats wird gesperrt; Abfragen auf andere Perioden laufen weiter
+    db.execute(text(f"TRUNCATE {partition_name(period)}"))
+    return True
@@ -1,8 +1,26 @@
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from typing import Protocol, Any
 import pandas as pd
 
 
+# Betragsfelder jeder geparsten Zeile (ParsedCsv.frame), in Spaltenreihenfolge von employee_costs
+AMOUNT_KEYS = (
+    "gross_amount",
+    "ag_bav_amount",
+    "subsidy_amount",
+    "net_amount",
+    "sv_ag_amount",
+    "umlage_amount",
+    "reimb_kk_amount",
+    "flat_tax_amount",
+    "reimb_ba_amount",
+    "reimb_ifsg_amount",
+    "total_cost_wo_reimb",
+    "total_cost",
+)
+
+
 @dataclass(frozen=True)
 class DetectedCsv:
     source_type: str
@@ -10,12 +28,71 @@ class DetectedCsv:
     details: dict[str, Any]
 
 
+@dataclass(frozen=True)
+class TenantRef:
+    """Berater- und Mandantennummer (+ Firmenname) aus Zeile 1 des DATEV-Exports."""
+    advisor_number: str
+    client_number: str
+    name: str | None = None
+
+
+@dataclass(frozen=True)
+class CsvHeader:
+    """Dateikopf (Zeile 1: Berater;Mandant;Firma;Periode); gilt für alle Zeilen der Datei."""
+    period: int | None  # YYYYMM
+    tenant: TenantRef | None
+
+
+# Spalten von ParsedCsv.frame; die Periode gilt für die ganze Datei und steht nur in ParsedCsv.period
+ROW_KEYS = ("external_employee_id", "first_name", "last_name", "currency", *AMOUNT_KEYS)
+
+
+class ParsedRows(Sequence):
+    """Zeilenansicht auf ParsedCsv.frame; Dicts werden erst beim Zugriff erzeugt."""
+
+    def __init__(self, parsed: "ParsedCsv"):
+        self._parsed = parsed
+
+    def __len__(self) -> int:
+        return len(self._parsed.frame)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        row = self._parsed.frame.iloc[i].to_dict()
+        row["period"] = self._parsed.period
+        return row
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        period = self._parsed.period
+        for row in self._parsed.frame.to_dict("records"):
+            row["period"] = period
+            yield row
+
+
 @dataclass
 class ParsedCsv:
+    """
+    Ergebnis eines Parsers in Spaltenform: eine Zeile je Mitarbeiter in `frame` (Spalten ROW_KEYS).
+    `rows` bleibt als Dict-Ansicht für Aufrufer erhalten, die zeilenweise arbeiten.
+    """
+
     source_type: str
-    period: str
+    period: int | None  # YYYYMM, setzt der ImportService aus Zeile 1
     meta: dict[str, Any]
-    rows: list[dict[str, Any]]
+    frame: pd.DataFrame
+    tenant: TenantRef | None = None  # ebenfalls aus Zeile 1
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def rows(self) -> ParsedRows:
+        return ParsedRows(self)
+
+    def column(self, key: str) -> list:
+        # Python-Werte statt NumPy-Skalaren, damit die DB-Treiber sie direkt binden können
+        return self.frame[key].tolist()
 
 
 class CsvParser(Protocol):
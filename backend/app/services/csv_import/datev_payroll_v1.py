@@ -1,20 +1,40 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from typing import Any
 
-from app.services.csv_import.base import DetectedCsv, ParsedCsv
+from app.core.money import AMOUNT_RE
+from app.services.csv_import.base import AMOUNT_KEYS, DetectedCsv, ParsedCsv
+
+
+def _parse_cents_series(values: pd.Series) -> pd.Series:
+    # spaltenweise Variante von parse_cents: "1.234,56" -> 123456 (int64), leer/ungültig -> 0
+    # leere Zellen kommen als NaN -> nur befüllte Zellen anfassen
+    s = values.dropna().astype(str).str.strip().str.replace(".", "", regex=False)
+    s = s[s.str.fullmatch(AMOUNT_RE).astype(bool)]
+    if s.empty:
+        return pd.Series(0, index=values.index, dtype="int64")
+
+    # Komma raus -> ganze Zahl in Einheiten der letzten Nachkommastelle, ohne Umweg über float
+    comma = s.str.find(",").to_numpy()
+    decimals = np.where(comma >= 0, s.str.len().to_numpy() - comma - 1, 0)
+    digits = s.str.replace(",", "", regex=False).replace({"": "0", "-": "0", "+": "0"})
+    units = pd.to_numeric(digits).to_numpy(dtype="int64")
+
+    cents = units * 10 ** np.clip(2 - decimals, 0, None)
+    extra = decimals > 2
+    if extra.any():
+        # mehr als zwei Nachkommastellen: kaufmännisch runden (Betrag, dann Vorzeichen)
+        q = 10 ** (decimals[extra] - 2)
+        rounded = (np.abs(units[extra]) * 2 + q) // (2 * q)
+        cents[extra] = np.where(units[extra] < 0, -rounded, rounded)
+    return pd.Series(cents, index=s.index).reindex(values.index, fill_value=0)
 
 
-def _parse_amount(value) -> float:
-    if value is None:
-        return 0.0
-    s = str(value).strip()
-    if s == "" or s.lower() == "nan":
-        return 0.0
-    s = s.replace(".", "").replace(",", ".")
-    try:
-        return float(s)
-    except ValueError:
-        return 0.0
+def _text_series(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype="object")
+    return df[col].astype("string").fillna("").str.strip().astype("object")
 
 
 def _norm(s: str) -> str:
@@ -25,6 +45,44 @@ def _norm(s: str) -> str:
     return " ".join(s.split())
 
 
+# Reihenfolge wichtig: "Gesamtkosten ohne" vor "Gesamtkosten"
+_FIELD_NEEDLES = [
+    ("gesamtbrutto", "gross_amount"),
+    ("ag anteil bav", "ag_bav_amount"),
+    ("foerderbetrag", "subsidy_amount"),
+    ("förderbetrag", "subsidy_amount"),
+    ("nettobezuege nettoabzuege", "net_amount"),
+    ("nettobezuege", "net_amount"),
+    ("sv ag anteil", "sv_ag_amount"),
+    ("sv ag", "sv_ag_amount"),
+    ("umlage", "umlage_amount"),
+    ("erstattung kk", "reimb_kk_amount"),
+    ("pauschale steuern", "flat_tax_amount"),
+    ("erstattung ba", "reimb_ba_amount"),
+    ("ifsg", "reimb_ifsg_amount"),
+    ("gesamtkosten ohne erstattung", "total_cost_wo_reimb"),
+    ("gesamtkosten ohne", "total_cost_wo_reimb"),
+    ("gesamtkosten", "total_cost"),
+]
+_NORM_NEEDLES = [(_norm(needle), key) for needle, key in _FIELD_NEEDLES]
+
+
+@lru_cache(maxsize=256)
+def resolve_columns(columns: tuple[str, ...]) -> tuple[tuple[str, str | None], ...]:
+    """
+    Ordnet die Header-Spalten eines Exports den Betragsfeldern zu.
+    Monatsexporte haben fast immer denselben Header -> Ergebnis je Spaltenfolge gecacht
+    (Tupel statt Dict, damit der Cache-Eintrag nicht verändert werden kann).
+    """
+    norm_cols = [(c, _norm(c)) for c in columns]
+
+    col_for_key: dict[str, str | None] = {}
+    for needle, key in _NORM_NEEDLES:
+        if key not in col_for_key:
+            col_for_key[key] = next((col for col, ncol in norm_cols if needle in ncol), None)
+    return tuple(col_for_key.items())
+
+
 class DatevPayrollV1Parser:
     source_type = "datev_payroll_v1"
 
@@ -37,77 +95,34 @@ class DatevPayrollV1Parser:
             details={"columns": list(df.columns)},
         )
 
+    def column_mapping(self, columns) -> dict[str, str | None]:
+        """Zielfeld -> CSV-Spalte für einen Header (gecacht über die Spaltenfolge)."""
+        return dict(resolve_columns(tuple(columns)))
+
     def parse(self, df: pd.DataFrame) -> ParsedCsv:
-        # Reihenfolge wichtig: "Gesamtkosten ohne" vor "Gesamtkosten"
-        field_needles = [
-            ("gesamtbrutto", "gross_amount"),
-            ("ag anteil bav", "ag_bav_amount"),
-            ("foerderbetrag", "subsidy_amount"),
-            ("förderbetrag", "subsidy_amount"),
-            ("nettobezuege nettoabzuege", "net_amount"),
-            ("nettobezuege", "net_amount"),
-            ("sv ag anteil", "sv_ag_amount"),
-            ("sv ag", "sv_ag_amount"),
-            ("umlage", "umlage_amount"),
-            ("erstattung kk", "reimb_kk_amount"),
-            ("pauschale steuern", "flat_tax_amount"),
-            ("erstattung ba", "reimb_ba_amount"),
-            ("ifsg", "reimb_ifsg_amount"),
-            ("gesamtkosten ohne erstattung", "total_cost_wo_reimb"),
-            ("gesamtkosten ohne", "total_cost_wo_reimb"),
-            ("gesamtkosten", "total_cost"),
-        ]
-
-        norm_cols = {c: _norm(c) for c in df.columns}
-
-        def find_col(needle: str) -> str | None:
-            n = _norm(needle)
-            for col, ncol in norm_cols.items():
-                if n in ncol:
-                    return col
-            return None
-
-        col_for_key: dict[str, str | None] = {}
-        for needle, key in field_needles:
-            if key not in col_for_key:
-                col_for_key[key] = find_col(needle)
-
-        rows: list[dict[str, Any]] = []
-
-        for _, r in df.iterrows():
-            pid = str(r.get("Pers.-Nr.", "")).strip()
-            if not pid.isdigit():
-                continue
-
-            def get_amount(key: str) -> float:
-                col = col_for_key.get(key)
-                return _parse_amount(r.get(col)) if col else 0.0
-
-            rows.append(
-                {
-                    "external_employee_id": pid,
-                    "first_name": str(r.get("Vorname", "")).strip(),
-                    "last_name": str(r.get("Nachname", "")).strip(),
-                    "period": "unknown",
-                    "currency": "EUR",
-                    "gross_amount": get_amount("gross_amount"),
-                    "ag_bav_amount": get_amount("ag_bav_amount"),
-                    "subsidy_amount": get_amount("subsidy_amount"),
-                    "net_amount": get_amount("net_amount"),
-                    "sv_ag_amount": get_amount("sv_ag_amount"),
-                    "umlage_amount": get_amount("umlage_amount"),
-                    "reimb_kk_amount": get_amount("reimb_kk_amount"),
-                    "flat_tax_amount": get_amount("flat_tax_amount"),
-                    "reimb_ba_amount": get_amount("reimb_ba_amount"),
-                    "reimb_ifsg_amount": get_amount("reimb_ifsg_amount"),
-                    "total_cost_wo_reimb": get_amount("total_cost_wo_reimb"),
-                    "total_cost": get_amount("total_cost"),
-                }
-            )
+        col_for_key = self.column_mapping(df.columns)
+
+        # Nur echte Mitarbeiterzeilen (Pers.-Nr. rein numerisch)
+        pid = _text_series(df, "Pers.-Nr.")
+        mask = pid.str.isdigit().astype(bool)
+        src = df[mask]
+
+        out = pd.DataFrame(
+            {
+                "external_employee_id": pid[mask],
+                "first_name": _text_series(src, "Vorname"),
+                "last_name": _text_series(src, "Nachname"),
+                "currency": "EUR",
+            },
+            index=src.index,
+        )
+        for key in AMOUNT_KEYS:
+            col = col_for_key.get(key)
+            out[key] = _parse_cents_series(src[col]) if col else 0
 
         return ParsedCsv(
             source_type=self.source_type,
-            period="unknown",
-            meta={"row_count": len(rows), "columns_used": col_for_key},
-            rows=rows,
+            period=None,
+            meta={"row_count": len(out), "columns_used": col_for_key},
+            frame=out.reset_index(drop=True),
         )
@@ -0,0 +1,35 @@
+from sqlalchemy import and_, or_
+
+from app.models.employee import Employee
+
+
+def normalize_search_text(s: str | None) -> str:
+    # gleiche Faltung für gespeicherte Namen und Suchbegriff: klein, Umlaute ausgeschrieben
+    s = (s or "").strip().lower()
+    s = s.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    return " ".join(s.split())
+
+
+def _escape_like(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix(col, prefix: str, dialect_name: str):
+    if dialect_name == "postgresql":
+        # LIKE 'x%' mit festem Präfix nutzt die *_pattern_ops-Indizes (models/employee.py) unabhängig
+        # von der Datenbank-Collation; eine Bereichsabfrage wäre nur unter COLLATE "C" korrekt
+        return col.like(_escape_like(prefix) + "%", escape="\\")
+    # SQLite vergleicht Text binär (UTF-8), die Bereichsabfrage nutzt den B-Tree-Index direkt;
+    # LIKE ist dort case-insensitiv und ginge am Index vorbei
+    return and_(col >= prefix, col < prefix + "\U0010ffff")
+
+
+def search_condition(q: str, dialect_name: str):
+    """Präfixsuche auf Nachname, Vorname oder Pers.-Nr."""
+    n = normalize_search_text(q)
+    return or_(
+        _prefix(Employee.last_name_norm, n, dialect_name),
+        _prefix(Employee.first_name_norm, n, dialect_name),
+        _prefix(Employee.external_id, q.strip(), dialect_name),
+    )
+
@@ -0,0 +1,169 @@
+import hmac
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class ImportMetrics:
+    """
+    Laufzeiten je Import-Stufe und Zähler (Zeilen, Mitarbeiter) für einen Import.
+    Landet als ImportJob.metrics in der DB (Schlüssel "timings_ms" und "counters").
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = defaultdict(float)  # Sekunden
+        self.counters: dict[str, int] = defaultdict(int)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - t0
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += int(n)
+
+    def timed_iter(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        # für Generatoren (Chunk-Import): Zeit bis zum jeweils nächsten Element zählt zur Stufe
+        it = iter(items)
+        while True:
+            with self.stage(name):
+                item = next(it, None)
+            if item is None:
+                return
+            yield item
+
+    def as_dict(self) -> dict:
+        return {
+            "timings_ms": {k: round(v * 1000, 3) for k, v in self.timings.items()},
+            "counters": dict(self.counters),
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+        }
+
+
+# Bucket-Grenzen (Sekunden) für die Prometheus-Histogramme
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.total += 1
+        self.sum += value
+        for i, le in enumerate(self.buckets):
+            if value <= le:
+                self.counts[i] += 1
+
+    def lines(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        out = [
+            f'{name}_bucket{{{labels}{sep}le="{le}"}} {count}'
+            for le, count in zip(self.buckets, self.counts)
+        ]
+        out.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.total}')
+        suffix = f"{{{labels}}}" if labels else ""
+        out.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        out.append(f"{name}_count{suffix} {self.total}")
+        return out
+
+
+class ImportStats:
+    """
+    Prozesslokale Prometheus-Zähler und -Histogramme, fortgeschrieben beim Abschluss eines Jobs.
+    Werte fallen nur beim Neustart des Prozesses zurück (für Prometheus ein normaler Counter-Reset);
+    jeder Prozess (API, jeder Worker) liefert seine eigenen Werte, summiert wird in Prometheus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: dict[str, int] = defaultdict(int)
+        self._total = _Histogram()
+        self._stages: dict[str, _Histogram] = defaultdict(_Histogram)
+        self._rows: dict[str, int] = defaultdict(int)
+
+    def record(self, status: str, metrics: dict | None = None) -> None:
+        """Ein abgeschlossener Job (ok, merged, duplicate, error) mit seinen ImportJob.metrics."""
+        with self._lock:
+            self._jobs[status] += 1
+            if not metrics or "timings_ms" not in metrics:
+                return
+            self._total.observe(metrics.get("total_ms", 0) / 1000)
+            for stage, ms in metrics["timings_ms"].items():
+                self._stages[stage].observe(ms / 1000)
+            for name, n in metrics.get("counters", {}).items():
+                self._rows[name] += n
+
+    def render(self) -> str:
+        """Prometheus-Textformat."""
+        with self._lock:
+            lines = [
+                "# HELP import_jobs_total Finished import jobs by status.",
+                "# TYPE import_jobs_total counter",
+                *(f'import_jobs_total{{status="{status}"}} {n}' for status, n in sorted(self._jobs.items())),
+                "# HELP import_duration_seconds End-to-end duration of an import.",
+                "# TYPE import_duration_seconds histogram",
+                *self._total.lines("import_duration_seconds"),
+                "# HELP import_stage_duration_seconds Duration of a single import stage.",
+                "# TYPE import_stage_duration_seconds histogram",
+            ]
+            for stage in sorted(self._stages):
+                lines += self._stages[stage].lines("import_stage_duration_seconds", f'stage="{stage}"')
+
+            lines += [
+                "# HELP import_rows_total Rows and employees processed by imports, by kind.",
+                "# TYPE import_rows_total counter",
+                *(f'import_rows_total{{kind="{name}"}} {n}' for name, n in sorted(self._rows.items())),
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def metrics_authorized(authorization: str | None, token: str) -> bool:
+    # ohne konfigurierten Token offen (nur hinter Firewall/Proxy betreiben), sonst "Bearer <token>"
+    if not token:
+        return True
+    return hmac.compare_digest(authorization or "", f"Bearer {token}")
+
+
+def serve_metrics(stats: ImportStats, port: int, token: str = "") -> ThreadingHTTPServer:
+    """/metrics eines Prozesses ohne eigene FastAPI-App (Worker) in einem Hintergrund-Thread."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            if not metrics_authorized(self.headers.get("Authorization"), token):
+                self.send_error(401)
+                return
+            body = stats.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+import_stats = ImportStats()
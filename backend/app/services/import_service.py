@@ -1,192 +1,773 @@
+import io
+import os
 import re
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, TextIO
+
 import pandas as pd
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import bindparam, func, select, delete, insert, update
 
+from app.core.cache import data_generation
+from app.core.periods import make_period
 from app.models.import_job import ImportJob
 from app.models.employee import Employee
 from app.models.employee_cost import EmployeeCost
 
 from app.services.csv_import.registry import CsvParserRegistry
 from app.services.csv_import.datev_payroll_v1 import DatevPayrollV1Parser
-from app.services.csv_import.base import ParsedCsv
+from app.services.csv_import.base import AMOUNT_KEYS, CsvHeader, ParsedCsv, TenantRef
+from app.services.upload_storage import file_content_hash
+from app.services.period_summary import refresh_period_summary
+from app.services.employee_search import normalize_search_text
+from app.services.import_metrics import ImportMetrics, import_stats
+from app.services.pg_copy import copy_cost_rows, supports_copy
+from app.services.cost_partitions import ensure_cost_partition, truncate_cost_partition
+from app.services.tenants import ensure_tenant
+
+
+_ISO_PERIOD_RE = re.compile(r"^\s*(\d{4})-(\d{2})\s*$")
+_DOTTED_PERIOD_RE = re.compile(r"^\s*(\d{1,2})\.(\d{4})\s*$")
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mär": 3, "mae": 3, "mar": 3,
+    "apr": 4, "mai": 5, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "okt": 10, "nov": 11, "dez": 12,
+}
+
+
+@lru_cache(maxsize=1024)
+def parse_period_token(token: str) -> int | None:
+    """Periode aus Zeile 1 ("Jan 26", "01.2026", "2026-01") -> Periodenschlüssel YYYYMM (core/periods.py)."""
+    if not token:
+        return None
 
+    s = token.strip()
 
-class ImportService:
-    def __init__(self):
-        registry = CsvParserRegistry()
-        registry.register(DatevPayrollV1Parser())
-        self.registry = registry
+    m = _ISO_PERIOD_RE.match(s)
+    if m:
+        month = int(m.group(2))
+        if 1 <= month <= 12:
+            return make_period(int(m.group(1)), month)
+        return None
 
-    # ---------- PERIOD HELPERS ----------
-    def _parse_period_token(self, token: str) -> str | None:
-        if not token:
-            return None
-
-        s = token.strip()
-
-        m = re.match(r"^\s*(\d{4})-(\d{2})\s*$", s)
-        if m:
-            return f"{m.group(1)}-{m.group(2)}"
-
-        m = re.match(r"^\s*(\d{1,2})\.(\d{4})\s*$", s)
-        if m:
-            month = int(m.group(1))
-            year = int(m.group(2))
-            if 1 <= month <= 12:
-                return f"{year:04d}-{month:02d}"
-
-        token = s.lower()
-        MONTHS = {
-            "jan": "01", "feb": "02", "mär": "03", "mae": "03", "mar": "03",
-            "apr": "04", "mai": "05", "jun": "06", "jul": "07", "aug": "08",
-            "sep": "09", "okt": "10", "nov": "11", "dez": "12",
-        }
+    m = _DOTTED_PERIOD_RE.match(s)
+    if m:
+        month = int(m.group(1))
+        year = int(m.group(2))
+        if 1 <= month <= 12:
+            return make_period(year, month)
 
-        parts = token.split()
-        if len(parts) != 2:
-            return None
+    parts = s.lower().split()
+    if len(parts) != 2:
+        return None
 
-        month_key = parts[0][:3]
-        year_part = parts[1]
+    month_key = parts[0][:3]
+    year_part = parts[1]
 
-        if month_key in MONTHS:
-            if year_part.isdigit() and len(year_part) == 2:
-                return f"20{year_part}-{MONTHS[month_key]}"
-            if year_part.isdigit() and len(year_part) == 4:
-                return f"{year_part}-{MONTHS[month_key]}"
+    if month_key in MONTHS:
+        if year_part.isdigit() and len(year_part) == 2:
+            return make_period(2000 + int(year_part), MONTHS[month_key])
+        if year_part.isdigit() and len(year_part) == 4:
+            return make_period(int(year_part), MONTHS[month_key])
 
-        return None
+    return None
 
-    def _extract_period_from_first_line(self, line: str) -> str | None:
-        parts = line.split(";")
-        if len(parts) >= 4:
-            return self._parse_period_token(parts[3])
-        return None
 
-    # ---------- CSV LOADING ----------
-    def load_csv(self, file_path: str) -> tuple[pd.DataFrame, str | None]:
-        with open(file_path, encoding="latin1", errors="replace") as f:
-            first_line = f.readline()
+class ImportService:
+    def __init__(self):
+        registry = CsvParserRegistry()
+        registry.register(DatevPayrollV1Parser())
+        self.registry = registry
 
-        period = self._extract_period_from_first_line(first_line)
+    # ---------- PERIOD HELPERS ----------
+    def _parse_period_token(self, token: str) -> int | None:
+        return parse_period_token(token)
+
+    def _extract_header(self, line: str) -> CsvHeader:
+        # Zeile 1: Berater;Mandant;Firma;Periode
+        parts = [p.strip() for p in line.split(";")]
+        if len(parts) < 4:
+            return CsvHeader(period=None, tenant=None)
+        tenant = None
+        if parts[0] and parts[1]:
+            tenant = TenantRef(advisor_number=parts[0], client_number=parts[1], name=parts[2] or None)
+        return CsvHeader(period=self._parse_period_token(parts[3]), tenant=tenant)
+
+    @staticmethod
+    def _check_header(header: CsvHeader) -> None:
+        if not header.period:
+            raise ValueError("Period not found in first line (expected e.g. 'Jan 26' / '01.2026')")
+        if header.tenant is None:
+            raise ValueError("Advisor/client number not found in first line (expected 'Berater;Mandant;...')")
 
-        df = pd.read_csv(
-            file_path,
+    # ---------- CSV LOADING ----------
+    def _open_csv(self, source: str | BinaryIO) -> TextIO:
+        # Pfad oder bereits geöffnete Binärdatei (z. B. ein ZIP-Mitglied)
+        if isinstance(source, (str, os.PathLike)):
+            return open(source, encoding="latin1", errors="replace")
+        return io.TextIOWrapper(source, encoding="latin1", errors="replace")
+
+    @staticmethod
+    def _trim_trailing_fields(width: int):
+        # Zeilen mit überzähligen, aber leeren Feldern am Ende ("...;;;") auf Header-Breite kürzen;
+        # None -> pandas meldet die Zeile wie bisher als ParserError
+        def _handler(fields: list[str]) -> list[str] | None:
+            extra = fields[width:]
+            if all(not (v or "").strip() for v in extra):
+                return fields[:width]
+            raise pd.errors.ParserError(f"Expected {width} fields, saw {len(fields)}")
+        return _handler
+
+    def _read_body_python(self, f: TextIO, chunksize: int | None = None):
+        # tolerante Variante: Python-Engine mit on_bad_lines (nur dort als Callable möglich)
+        body_start = f.tell()
+        width = len(f.readline().rstrip("\r\n").split(";"))
+        f.seek(body_start)
+        return pd.read_csv(
+            f,
             sep=";",
-            encoding="latin1",
-            header=1,
+            header=0,
             engine="python",
             dtype=str,
+            chunksize=chunksize,
+            on_bad_lines=self._trim_trailing_fields(width),
         )
 
+    def _read_body(self, f: TextIO, chunksize: int | None = None):
+        # Zeile 1 (Berater;Mandant;Firma;Periode) ist bereits gelesen -> Zeile 2 ist der Header.
+        # Die C-Engine kommt mit dem DATEV-Dialekt (";" ohne Quoting) klar, nur bei
+        # unregelmäßigen Dateien fällt der Komplett-Load auf die Python-Engine zurück
+        # (chunkweise siehe iter_csv_chunks).
+        if chunksize:
+            return pd.read_csv(f, sep=";", header=0, engine="c", dtype=str, chunksize=chunksize)
+
+        body_start = f.tell()
+        try:
+            return pd.read_csv(f, sep=";", header=0, engine="c", dtype=str)
+        except pd.errors.ParserError:
+            f.seek(body_start)
+            return self._read_body_python(f)
+
+    def _drop_sum_rows(self, df: pd.DataFrame) -> pd.DataFrame:
         # Summen / Müll entfernen
         if "Pers.-Nr." in df.columns:
             pid = df["Pers.-Nr."].astype(str).str.strip()
             df = df[~pid.str.lower().str.startswith("summen")]
-
-        return df, period
+        return df
+
+    def load_csv(self, file_path: str | BinaryIO) -> tuple[pd.DataFrame, CsvHeader]:
+        with self._open_csv(file_path) as f:
+            header = self._extract_header(f.readline())
+            df = self._read_body(f)
+
+        return self._drop_sum_rows(df), header
+
+    def iter_csv_chunks(self, file_path: str | BinaryIO, chunksize: int) -> Iterator[tuple[pd.DataFrame, CsvHeader]]:
+        """
+        Streaming-Variante von load_csv: liefert (chunk, header) mit höchstens chunksize Zeilen,
+        damit der Speicherbedarf unabhängig von der Dateigröße bleibt.
+        """
+        with self._open_csv(file_path) as f:
+            header = self._extract_header(f.readline())
+            body_start = f.tell()
+            done = 0
+            try:
+                with self._read_body(f, chunksize=chunksize) as reader:
+                    for chunk in reader:
+                        done += len(chunk)
+                        yield self._drop_sum_rows(chunk), header
+                return
+            except pd.errors.ParserError:
+                f.seek(body_start)
+
+            # wie load_csv auf die Python-Engine zurückfallen; bereits gelieferte Zeilen überspringen
+            with self._read_body_python(f, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    if done:
+                        skip = min(done, len(chunk))
+                        chunk = chunk.iloc[skip:]
+                        done -= skip
+                        if chunk.empty:
+                            continue
+                    yield self._drop_sum_rows(chunk), header
 
     # ---------- PARSING ----------
-    def detect_and_parse(self, file_path: str) -> tuple[ParsedCsv, dict]:
-        df, period = self.load_csv(file_path)
+    def detect_and_parse(
+        self, file_path: str | BinaryIO, metrics: ImportMetrics | None = None
+    ) -> tuple[ParsedCsv, dict]:
+        metrics = metrics or ImportMetrics()
 
-        if not period:
-            raise ValueError("Period not found in first line (expected e.g. 'Jan 26' / '01.2026')")
+        with metrics.stage("load_csv"):
+            df, header = self.load_csv(file_path)
 
-        detection = self.registry.detect_best(df)
-        parser = self.registry.get_by_source_type(detection.chosen.source_type)
+        self._check_header(header)
 
-        parsed = parser.parse(df)
-        parsed.period = period
+        with metrics.stage("detect"):
+            detection = self.registry.detect_best(df)
+            parser = self.registry.get_by_source_type(detection.chosen.source_type)
 
-        for r in parsed.rows:
-            r["period"] = parsed.period
+        with metrics.stage("parse"):
+            parsed = parser.parse(df)
+        parsed.period = header.period
+        parsed.tenant = header.tenant
+        self._count_parsed(metrics, df, parsed)
 
-        debug = {"chosen": detection.chosen, "period": parsed.period}
+        debug = {"chosen": detection.chosen, "period": parsed.period, "tenant": parsed.tenant}
         return parsed, debug
 
+    def detect_and_parse_chunks(
+        self, file_path: str | BinaryIO, chunksize: int, metrics: ImportMetrics | None = None
+    ) -> Iterator[ParsedCsv]:
+        """
+        Wie detect_and_parse, aber chunkweise. Erkennung einmal anhand des ersten Chunks,
+        danach wird jeder Chunk mit demselben Parser verarbeitet.
+        """
+        metrics = metrics or ImportMetrics()
+        parser = None
+        for df, header in metrics.timed_iter("load_csv", self.iter_csv_chunks(file_path, chunksize)):
+            self._check_header(header)
+
+            if parser is None:
+                with metrics.stage("detect"):
+                    detection = self.registry.detect_best(df)
+                    parser = self.registry.get_by_source_type(detection.chosen.source_type)
+
+            with metrics.stage("parse"):
+                parsed = parser.parse(df)
+            parsed.period = header.period
+            parsed.tenant = header.tenant
+            self._count_parsed(metrics, df, parsed)
+            yield parsed
+
+    @staticmethod
+    def _count_parsed(metrics: ImportMetrics, df: pd.DataFrame, parsed: ParsedCsv) -> None:
+        # übersprungen = Zeilen ohne numerische Pers.-Nr. (Zwischenüberschriften, Leerzeilen)
+        metrics.count("rows_read", len(df))
+        metrics.count("rows_parsed", len(parsed))
+        metrics.count("rows_skipped", len(df) - len(parsed))
+
     # ---------- DB HELPERS ----------
-    def _get_or_create_employee(self, db: Session, external_id: str, first_name: str, last_name: str) -> Employee:
-        emp = db.execute(select(Employee).where(Employee.external_id == external_id)).scalar_one_or_none()
-        if emp:
-            emp.first_name = first_name
-            emp.last_name = last_name
-            return emp
-
-        emp = Employee(external_id=external_id, first_name=first_name, last_name=last_name)
-        db.add(emp)
-        db.flush()
-        return emp
+    # SQLite erlaubt je nach Build nur 999 Bind-Parameter pro Statement
+    IN_CHUNK_SIZE = 500
+
+    def _resolve_employees(
+        self, db: Session, tenant_id: int, parsed: ParsedCsv, metrics: ImportMetrics
+    ) -> dict[str, int]:
+        """
+        Liefert external_id -> employee.id für alle Zeilen (Pers.-Nr. innerhalb des Mandanten).
+        Fehlende Mitarbeiter werden gesammelt angelegt, geänderte Namen gesammelt aktualisiert.
+        """
+        # letzte Zeile pro Pers.-Nr. gewinnt (wie beim früheren zeilenweisen Upsert)
+        names: dict[str, tuple[str, str]] = {
+            ext_id: (first, last)
+            for ext_id, first, last in zip(
+                parsed.column("external_employee_id"),
+                parsed.column("first_name"),
+                parsed.column("last_name"),
+            )
+        }
 
-    def _create_import_job(self, db: Session, source_type: str, period: str, filename: str) -> ImportJob:
+        ext_ids = list(names)
+        existing: dict[str, tuple[int, str, str]] = {}
+        for i in range(0, len(ext_ids), self.IN_CHUNK_SIZE):
+            chunk = ext_ids[i:i + self.IN_CHUNK_SIZE]
+            for emp_id, ext_id, first, last in db.execute(
+                select(Employee.id, Employee.external_id, Employee.first_name, Employee.last_name)
+                .where(Employee.tenant_id == tenant_id, Employee.external_id.in_(chunk))
+            ):
+                existing[ext_id] = (emp_id, first, last)
+
+        changed = [
+            {
+                "id": existing[ext_id][0],
+                "first_name": first,
+                "last_name": last,
+                "first_name_norm": normalize_search_text(first),
+                "last_name_norm": normalize_search_text(last),
+            }
+            for ext_id, (first, last) in names.items()
+            if ext_id in existing and existing[ext_id][1:] != (first, last)
+        ]
+        if changed:
+            db.execute(update(Employee), changed)
+        metrics.count("employees_updated", len(changed))
+
+        missing = [ext_id for ext_id in ext_ids if ext_id not in existing]
+        metrics.count("employees_created", len(missing))
+        if missing:
+            db.execute(
+                insert(Employee),
+                [
+                    {
+                        "tenant_id": tenant_id,
+                        "external_id": ext_id,
+                        "first_name": names[ext_id][0],
+                        "last_name": names[ext_id][1],
+                        "first_name_norm": normalize_search_text(names[ext_id][0]),
+                        "last_name_norm": normalize_search_text(names[ext_id][1]),
+                    }
+                    for ext_id in missing
+                ],
+            )
+            # IDs nachladen statt RETURNING -> funktioniert auf SQLite und PostgreSQL gleich
+            for i in range(0, len(missing), self.IN_CHUNK_SIZE):
+                chunk = missing[i:i + self.IN_CHUNK_SIZE]
+                for emp_id, ext_id in db.execute(
+                    select(Employee.id, Employee.external_id)
+                    .where(Employee.tenant_id == tenant_id, Employee.external_id.in_(chunk))
+                ):
+                    existing[ext_id] = (emp_id, *names[ext_id])
+
+        return {ext_id: v[0] for ext_id, v in existing.items()}
+
+    def _create_import_job(
+        self, db: Session, tenant_id: int, source_type: str, period: int, filename: str
+    ) -> ImportJob:
         job = ImportJob(
+            tenant_id=tenant_id,
             source_type=source_type,
             period=period,
             original_filename=filename,
             status="processing",
+            started_at=datetime.utcnow(),
         )
         db.add(job)
         db.flush()
         return job
 
-    def _delete_existing_period_data(self, db: Session, source_type: str, period: str) -> None:
-        old_ids = db.execute(
-            select(ImportJob.id).where(ImportJob.source_type == source_type, ImportJob.period == period)
-        ).scalars().all()
+    def create_pending_job(
+        self,
+        db: Session,
+        stored_path: str,
+        filename: str,
+        content_hash: str | None = None,
+        mode: str = "replace",
+    ) -> ImportJob:
+        """Legt einen Job für den Worker an; Mandant, Source-Type und Periode setzt erst die Verarbeitung."""
+        job = ImportJob(
+            original_filename=filename,
+            stored_path=stored_path,
+            content_hash=content_hash,
+            mode=mode,
+            status="pending",
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def find_identical_import(
+        self,
+        db: Session,
+        content_hash: str,
+        source_type: str | None = None,
+        period: int | None = None,
+        tenant_id: int | None = None,
+    ) -> ImportJob | None:
+        """
+        Letzter erfolgreicher Import bzw. Diff-Abgleich mit diesem Inhalt, dessen Stand noch gilt:
+        ein späterer Abgleich in denselben Import ("merged") hat die Daten inzwischen verändert.
+        """
+        later = aliased(ImportJob)
+        data_job_id = func.coalesce(ImportJob.linked_job_id, ImportJob.id)
+        superseded = (
+            select(later.id)
+            .where(later.status == "merged", later.linked_job_id == data_job_id, later.id > ImportJob.id)
+            .exists()
+        )
+        stmt = select(ImportJob).where(
+            ImportJob.content_hash == content_hash,
+            ImportJob.status.in_(("ok", "merged")),
+            ~superseded,
+        )
+        if tenant_id is not None:
+            stmt = stmt.where(ImportJob.tenant_id == tenant_id)
+        if source_type is not None:
+            stmt = stmt.where(ImportJob.source_type == source_type)
+        if period is not None:
+            stmt = stmt.where(ImportJob.period == period)
+        return db.execute(stmt.order_by(ImportJob.id.desc()).limit(1)).scalar_one_or_none()
+
+    def _mark_duplicate(self, db: Session, job: ImportJob, existing: ImportJob) -> None:
+        job.status = "duplicate"
+        job.linked_job_id = existing.id
+        # Mandant/Typ/Periode wie beim bestehenden Import, damit der Job in gefilterten Listen auftaucht
+        job.tenant_id = existing.tenant_id
+        job.source_type = existing.source_type
+        job.period = existing.period
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        import_stats.record(job.status, job.metrics)
+
+    def _delete_existing_period_data(
+        self, db: Session, tenant_id: int, source_type: str, period: int, keep_id: int | None = None
+    ) -> None:
+        stmt = select(ImportJob.id).where(
+            ImportJob.tenant_id == tenant_id,
+            ImportJob.source_type == source_type,
+            ImportJob.period == period,
+        )
+        if keep_id is not None:
+            stmt = stmt.where(ImportJob.id != keep_id)
+        old_ids = db.execute(stmt).scalars().all()
 
         if not old_ids:
             return
 
-        db.execute(delete(EmployeeCost).where(EmployeeCost.import_id.in_(old_ids)))
+        # PostgreSQL: ganze Monatspartition leeren statt jede Zeile einzeln zu löschen
+        if not truncate_cost_partition(db, tenant_id, source_type, period):
+            db.execute(
+                delete(EmployeeCost).where(EmployeeCost.period == period, EmployeeCost.import_id.in_(old_ids))
+            )
         db.execute(delete(ImportJob).where(ImportJob.id.in_(old_ids)))
 
-    # ---------- PERSISTENZ ----------
-    def persist_parsed_csv(self, db: Session, parsed: ParsedCsv, filename: str) -> ImportJob:
-        self._delete_existing_period_data(db, parsed.source_type, parsed.period)
+    def _cost_params(
+        self, import_id: int, tenant_id: int, parsed: ParsedCsv, employee_ids: dict[str, int]
+    ) -> list[dict]:
+        """Bind-Parameter für employee_costs, direkt aus den Spalten gebaut."""
+        keys = ("employee_id", "currency", *AMOUNT_KEYS)
+        columns = [
+            [employee_ids[ext_id] for ext_id in parsed.column("external_employee_id")],
+            parsed.column("currency"),
+            *(parsed.column(key) for key in AMOUNT_KEYS),
+        ]
+        const = {"tenant_id": tenant_id, "import_id": import_id, "period": parsed.period}
+        return [{**const, **dict(zip(keys, values))} for values in zip(*columns)]
+
+    def _insert_rows(self, db: Session, job: ImportJob, parsed: ParsedCsv, metrics: ImportMetrics) -> None:
+        if not len(parsed):
+            return
+
+        if supports_copy(db):
+            # PostgreSQL: Mitarbeiter und Kosten in einem COPY + zwei set-basierten Statements
+            with metrics.stage("copy"):
+                created, updated = copy_cost_rows(db, job.id, job.tenant_id, parsed.period, parsed)
+            metrics.count("employees_created", created)
+            metrics.count("employees_updated", updated)
+            metrics.count("rows_inserted", len(parsed))
+            return
+
+        with metrics.stage("resolve_employees"):
+            employee_ids = self._resolve_employees(db, job.tenant_id, parsed, metrics)
+
+        with metrics.stage("insert"):
+            # ein executemany statt einem ORM-Objekt pro Zeile
+            db.execute(
+                insert(EmployeeCost), self._cost_params(job.id, job.tenant_id, parsed, employee_ids)
+            )
+        metrics.count("rows_inserted", len(parsed))
+
+    # ---------- DIFF ----------
+    @staticmethod
+    def _cost_signature(currency: str, amounts) -> tuple:
+        # DB und Parser liefern ganze Cent -> direkt vergleichbar
+        return (currency, *(int(v or 0) for v in amounts))
+
+    def _load_period_costs(
+        self, db: Session, import_id: int, period: int
+    ) -> dict[int, list[tuple[int, tuple]]]:
+        """employee_id -> [(employee_cost.id, signature), ...] der bestehenden Zeilen eines Imports."""
+        amount_cols = [getattr(EmployeeCost, key) for key in AMOUNT_KEYS]
+        existing: dict[int, list[tuple[int, tuple]]] = defaultdict(list)
+        for cost_id, emp_id, currency, *amounts in db.execute(
+            select(EmployeeCost.id, EmployeeCost.employee_id, EmployeeCost.currency, *amount_cols)
+            .where(EmployeeCost.period == period, EmployeeCost.import_id == import_id)
+            .order_by(EmployeeCost.id)
+        ):
+            existing[emp_id].append((cost_id, self._cost_signature(currency, amounts)))
+        return existing
+
+    def _apply_diff(
+        self,
+        db: Session,
+        target: ImportJob,
+        parsed: ParsedCsv,
+        existing: dict[int, list[tuple[int, tuple]]],
+        stats: dict[str, int],
+        metrics: ImportMetrics,
+    ) -> None:
+        if not len(parsed):
+            return
+
+        with metrics.stage("resolve_employees"):
+            employee_ids = self._resolve_employees(db, target.tenant_id, parsed, metrics)
+
+        inserts: list[dict] = []
+        updates: list[dict] = []
+        for values in self._cost_params(target.id, target.tenant_id, parsed, employee_ids):
+            emp_id = values["employee_id"]
+
+            # mehrere Zeilen je Mitarbeiter werden in Reihenfolge einander zugeordnet
+            old = existing.get(emp_id)
+            if not old:
+                inserts.append(values)
+                continue
+
+            cost_id, signature = old.pop(0)
+            if signature == self._cost_signature(values["currency"], [values[k] for k in AMOUNT_KEYS]):
+                stats["unchanged"] += 1
+            else:
+                updates.append({"b_id": cost_id, "b_period": values.pop("period"), **values})
+
+        with metrics.stage("insert"):
+            if inserts:
+                db.execute(insert(EmployeeCost), inserts)
+            if updates:
+                # Core-executemany mit Periode im WHERE, damit PostgreSQL nur die Monatspartition anfasst
+                # (der ORM-Bulk-Update nach Primärschlüssel kennt nur die id)
+                db.execute(
+                    update(EmployeeCost.__table__).where(
+                        EmployeeCost.id == bindparam("b_id"), EmployeeCost.period == bindparam("b_period")
+                    ),
+                    updates,
+                )
 
-        job = self._create_import_job(db, parsed.source_type, parsed.period, filename)
+        stats["inserted"] += len(inserts)
+        stats["updated"] += len(updates)
+        metrics.count("rows_inserted", len(inserts))
+        metrics.count("rows_updated", len(updates))
+
+    def _persist_diff(
+        self,
+        db: Session,
+        target: ImportJob,
+        first: ParsedCsv,
+        chunks: Iterator[ParsedCsv],
+        filename: str,
+        job: ImportJob | None,
+        content_hash: str | None,
+        metrics: ImportMetrics,
+    ) -> ImportJob:
+        """
+        Gleicht die neue Datei gegen die gespeicherten Zeilen des bestehenden Imports ab
+        und schreibt nur INSERT/UPDATE/DELETE für tatsächlich geänderte Mitarbeiter.
+        Die Zeilen bleiben am bestehenden Job, dessen Herkunft (Dateiname, Hash, Kennzahlen)
+        unverändert bleibt. Der Abgleich selbst wird als eigener Job mit Status "merged"
+        festgehalten (Worker-Job bzw. neu angelegt), verknüpft über linked_job_id;
+        dieser Job wird zurückgegeben.
+        """
+        started = datetime.utcnow()
+        with metrics.stage("load_existing"):
+            existing = self._load_period_costs(db, target.id, target.period)
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
 
         try:
-            for row in parsed.rows:
-                emp = self._get_or_create_employee(
-                    db=db,
-                    external_id=row["external_employee_id"],
-                    first_name=row["first_name"],
-                    last_name=row["last_name"],
+            row_count = len(first)
+            self._apply_diff(db, target, first, existing, stats, metrics)
+            for parsed in chunks:
+                row_count += len(parsed)
+                self._apply_diff(db, target, parsed, existing, stats, metrics)
+
+            # was in der neuen Datei nicht mehr vorkommt, fliegt raus
+            stale_ids = [cost_id for old in existing.values() for cost_id, _ in old]
+            with metrics.stage("delete_old"):
+                for i in range(0, len(stale_ids), self.IN_CHUNK_SIZE):
+                    chunk = stale_ids[i:i + self.IN_CHUNK_SIZE]
+                    db.execute(
+                        delete(EmployeeCost)
+                        .where(EmployeeCost.period == target.period, EmployeeCost.id.in_(chunk))
+                        .execution_options(synchronize_session=False)
+                    )
+            stats["deleted"] = len(stale_ids)
+            metrics.count("rows_deleted", len(stale_ids))
+
+            # die Zeilen des Ziel-Jobs entsprechen jetzt der neuen Datei
+            target.row_count = row_count
+
+            with metrics.stage("summary"):
+                refresh_period_summary(db, target.tenant_id, target.source_type, target.period)
+
+            if job is None:
+                job = ImportJob(
+                    original_filename=filename,
+                    content_hash=content_hash,
+                    mode="diff",
+                    started_at=started,
                 )
+                db.add(job)
+            job.status = "merged"
+            job.linked_job_id = target.id
+            job.tenant_id = target.tenant_id
+            job.source_type = target.source_type
+            job.period = target.period
+            job.row_count = row_count
+            job.finished_at = datetime.utcnow()
+            job.metrics = {"diff": stats, **metrics.as_dict()}
+
+            db.commit()
+            data_generation.bump()
+            import_stats.record(job.status, job.metrics)
+            return job
 
-                db.add(EmployeeCost(
-                    import_id=job.id,
-                    employee_id=emp.id,
-                    period=row["period"],
-                    gross_amount=row["gross_amount"],
-                    ag_bav_amount=row["ag_bav_amount"],
-                    subsidy_amount=row["subsidy_amount"],
-                    net_amount=row["net_amount"],
-                    sv_ag_amount=row["sv_ag_amount"],
-                    umlage_amount=row["umlage_amount"],
-                    reimb_kk_amount=row["reimb_kk_amount"],
-                    flat_tax_amount=row["flat_tax_amount"],
-                    reimb_ba_amount=row["reimb_ba_amount"],
-                    reimb_ifsg_amount=row["reimb_ifsg_amount"],
-                    total_cost_wo_reimb=row["total_cost_wo_reimb"],
-                    total_cost=row["total_cost"],
-                    currency=row.get("currency", "EUR"),
-                ))
+        except Exception as e:
+            db.rollback()
+            if job is not None:
+                job.status = "error"
+                job.error_message = str(e)[:500]
+                job.finished_at = datetime.utcnow()
+                job.metrics = metrics.as_dict()
+                db.commit()
+            raise
+
+    # ---------- PERSISTENZ ----------
+    def persist_parsed_csv(
+        self,
+        db: Session,
+        parsed: ParsedCsv,
+        filename: str,
+        job: ImportJob | None = None,
+        content_hash: str | None = None,
+        mode: str = "replace",
+        metrics: ImportMetrics | None = None,
+    ) -> ImportJob:
+        return self.persist_parsed_chunks(
+            db=db,
+            chunks=[parsed],
+            filename=filename,
+            job=job,
+            content_hash=content_hash,
+            mode=mode,
+            metrics=metrics,
+        )
+
+    def persist_parsed_chunks(
+        self,
+        db: Session,
+        chunks: Iterable[ParsedCsv],
+        filename: str,
+        job: ImportJob | None = None,
+        content_hash: str | None = None,
+        mode: str = "replace",
+        metrics: ImportMetrics | None = None,
+    ) -> ImportJob:
+        """
+        Schreibt alle Chunks einer Datei in einer Transaktion unter einem ImportJob.
+        Mandant, Source-Type und Periode kommen aus dem ersten Chunk; der Mandant wird bei Bedarf angelegt.
+        Ist job gesetzt (Worker), wird dieser bereits angelegte Job befüllt statt ein neuer erzeugt.
+        Gibt es für Mandant/Typ/Periode schon einen erfolgreichen Import mit gleichem content_hash,
+        bleiben die Daten unangetastet und der bestehende Job wird zurückgegeben.
+        mode="replace" löscht die bisherigen Daten der Periode und schreibt alles neu,
+        mode="diff" schreibt nur die Änderungen gegenüber dem bestehenden Import (siehe _persist_diff).
+        Laufzeiten und Zähler der einzelnen Stufen landen in job.metrics (siehe ImportMetrics).
+        """
+        metrics = metrics or ImportMetrics()
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("CSV contains no data")
+        if first.tenant is None:
+            raise ValueError("CSV has no advisor/client number")
+
+        # eigene kurze Transaktion, bevor dieser Import employee_costs anfasst (siehe cost_partitions.py)
+        ensure_cost_partition(db, first.period)
+        tenant_id = ensure_tenant(db, first.tenant)
+
+        if content_hash:
+            existing = self.find_identical_import(
+                db, content_hash, first.source_type, first.period, tenant_id=tenant_id
+            )
+            if existing is not None:
+                if job is not None:
+                    job.metrics = metrics.as_dict()
+                    self._mark_duplicate(db, job, existing)
+                return existing
+
+        if mode == "diff":
+            stmt = select(ImportJob).where(
+                ImportJob.tenant_id == tenant_id,
+                ImportJob.source_type == first.source_type,
+                ImportJob.period == first.period,
+                ImportJob.status == "ok",
+            )
+            if job is not None:
+                stmt = stmt.where(ImportJob.id != job.id)
+            target = db.execute(stmt).scalar_one_or_none()
+            if target is not None:
+                return self._persist_diff(db, target, first, chunks, filename, job, content_hash, metrics)
+            # noch nichts für die Periode da -> ganz normal einfügen
+
+        with metrics.stage("delete_old"):
+            self._delete_existing_period_data(
+                db, tenant_id, first.source_type, first.period, keep_id=job.id if job is not None else None
+            )
+
+        if job is None:
+            job = self._create_import_job(db, tenant_id, first.source_type, first.period, filename)
+            job.content_hash = content_hash
+        else:
+            job.tenant_id = tenant_id
+            job.source_type = first.source_type
+            job.period = first.period
+            db.flush()
+
+        try:
+            row_count = len(first)
+            self._insert_rows(db, job, first, metrics)
+            for parsed in chunks:
+                row_count += len(parsed)
+                self._insert_rows(db, job, parsed, metrics)
+
+            with metrics.stage("summary"):
+                refresh_period_summary(db, job.tenant_id, job.source_type, job.period)
 
             job.status = "ok"
+            job.row_count = row_count
+            job.finished_at = datetime.utcnow()
+            job.metrics = metrics.as_dict()
             db.commit()
+            data_generation.bump()
+            import_stats.record(job.status, job.metrics)
             return job
 
         except Exception as e:
             db.rollback()
             job.status = "error"
-            job.error_message = str(e)
+            job.error_message = str(e)[:500]
+            job.finished_at = datetime.utcnow()
+            job.metrics = metrics.as_dict()
             db.commit()
             raise
 
     # ---------- ORCHESTRATOR ----------
-    def import_csv_file(self, db: Session, file_path: str, original_filename: str) -> ImportJob:
-        parsed, _ = self.detect_and_parse(file_path)
-        return self.persist_parsed_csv(db=db, parsed=parsed, filename=original_filename)
+    def import_csv_file(
+        self,
+        db: Session,
+        file_path: str,
+        original_filename: str,
+        chunksize: int | None = None,
+        job: ImportJob | None = None,
+        mode: str = "replace",
+    ) -> ImportJob:
+        metrics = ImportMetrics()
+
+        if job is not None and job.content_hash:
+            content_hash = job.content_hash
+        else:
+            with metrics.stage("hash"):
+                content_hash = file_content_hash(file_path)
+
+        if chunksize:
+            chunks = self.detect_and_parse_chunks(file_path, chunksize, metrics)
+            return self.persist_parsed_chunks(
+                db=db,
+                chunks=chunks,
+                filename=original_filename,
+                job=job,
+                content_hash=content_hash,
+                mode=mode,
+                metrics=metrics,
+            )
+
+        parsed, _ = self.detect_and_parse(file_path, metrics)
+        return self.persist_parsed_csv(
+            db=db,
+            parsed=parsed,
+            filename=original_filename,
+            job=job,
+            content_hash=content_hash,
+            mode=mode,
+            metrics=metrics,
+        )
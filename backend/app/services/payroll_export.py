@@ -0,0 +1,181 @@
+import csv
+import io
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+from sqlalchemy import Select, select
+
+from app.core.db import SessionLocal
+from app.core.money import format_cents_de
+from app.core.periods import period_str
+from app.models.employee import Employee
+from app.models.employee_cost import EmployeeCost
+from app.services.csv_import.base import AMOUNT_KEYS
+
+
+# Spaltenüberschriften wie im DATEV-Export (Reihenfolge = AMOUNT_KEYS)
+AMOUNT_LABELS = {
+    "gross_amount": "Gesamtbrutto",
+    "ag_bav_amount": "AG-Anteil bAV",
+    "subsidy_amount": "Förderbetrag",
+    "net_amount": "Nettobezüge/Nettoabzüge",
+    "sv_ag_amount": "SV-AG-Anteil",
+    "umlage_amount": "Umlage",
+    "reimb_kk_amount": "Erstattung KK",
+    "flat_tax_amount": "Pauschale Steuern",
+    "reimb_ba_amount": "Erstattung BA",
+    "reimb_ifsg_amount": "Erstattungen IfSG",
+    "total_cost_wo_reimb": "Gesamtkosten ohne Erstattung",
+    "total_cost": "Gesamtkosten",
+}
+
+TEXT_COLUMNS = (
+    ("period", "Periode"),
+    ("external_id", "Pers.-Nr."),
+    ("last_name", "Nachname"),
+    ("first_name", "Vorname"),
+    ("currency", "Währung"),
+)
+
+CSV_ENCODING = "latin-1"
+
+def export_statement(
+    period_from: int | None = None,
+    period_to: int | None = None,
+    employee_ids: Sequence[int] | None = None,
+    external_ids: Sequence[str] | None = None,
+    tenant_id: int | None = None,
+) -> Select:
+    """
+    Flache Exportzeilen (Periode, Mitarbeiter, Beträge) für einen Periodenbereich
+    (jeweils inklusive, Schlüssel YYYYMM), eine Mitarbeitermenge und/oder einen Mandanten.
+    """
+    stmt = (
+        select(
+            EmployeeCost.period,
+            Employee.external_id,
+            Employee.last_name,
+            Employee.first_name,
+            EmployeeCost.currency,
+            *(getattr(EmployeeCost, key) for key in AMOUNT_KEYS),
+        )
+        .join(Employee, Employee.id == EmployeeCost.employee_id)
+        .order_by(EmployeeCost.period, EmployeeCost.id)
+    )
+    if period_from:
+        stmt = stmt.where(EmployeeCost.period >= period_from)
+    if period_to:
+        stmt = stmt.where(EmployeeCost.period <= period_to)
+    if employee_ids:
+        stmt = stmt.where(EmployeeCost.employee_id.in_(employee_ids))
+    if external_ids:
+        stmt = stmt.where(Employee.external_id.in_(external_ids))
+    if tenant_id is not None:
+        stmt = stmt.where(EmployeeCost.tenant_id == tenant_id)
+    return stmt
+
+
+def iter_row_batches(stmt: Select, batch_size: int) -> Iterator[Sequence]:
+    """
+    Liest das Ergebnis blockweise über einen serverseitigen Cursor (yield_per -> stream_results).
+    Eigene Session, weil der Generator erst nach dem Request-Handler läuft; sie lebt genau so
+    lange wie die Antwort und wird auch bei Verbindungsabbruch (GeneratorExit) geschlossen.
+    """
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield rows
+
+
+def iter_csv(stmt: Select, batch_size: int) -> Iterator[bytes]:
+    """DATEV-artiges CSV: ';'-getrennt, deutsche Dezimalschreibweise, latin-1, CRLF."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=";", lineterminator="\r\n")
+    writer.writerow([label for _, label in TEXT_COLUMNS] + [AMOUNT_LABELS[k] for k in AMOUNT_KEYS])
+
+    n_text = len(TEXT_COLUMNS)
+    for rows in iter_row_batches(stmt, batch_size):
+        writer.writerows(
+            [period_str(row[0]), *row[1:n_text], *(format_cents_de(v) for v in row[n_text:])]
+            for row in rows
+        )
+        # je Block ausliefern -> Speicherbedarf hängt nur von batch_size ab
+        yield buf.getvalue().encode(CSV_ENCODING, errors="replace")
+        buf.seek(0)
+        buf.truncate()
+
+    if buf.tell():
+        yield buf.getvalue().encode(CSV_ENCODING, errors="replace")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ChunkSink(io.RawIOBase):
+    # Ausgabeziel für den ParquetWriter: sammelt geschriebene Bytes, bis sie abgeholt werden
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _decimal_from_cents(pa, cents: Sequence[int], money):
+    # Cent sind genau die unskalierten Werte von decimal(.., 2): 128-Bit-Zweierkomplement
+    # (low = Wert, high = Vorzeichenerweiterung) direkt als Puffer, ohne Decimal je Wert
+    low = np.fromiter((v or 0 for v in cents), dtype=np.int64, count=len(cents))
+    words = np.empty((len(low), 2), dtype=np.int64)
+    words[:, 0] = low
+    words[:, 1] = low >> 63
+    return pa.Array.from_buffers(money, len(low), [None, pa.py_buffer(words.tobytes())])
+
+
+def iter_parquet(stmt: Select, batch_size: int) -> Iterator[bytes]:
+    """
+    Parquet mit einer Row-Group je Cursor-Block; Beträge als decimal128(18, 2).
+    Benötigt pyarrow (optional, vorher parquet_available() prüfen).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    money = pa.decimal128(18, 2)
+    schema = pa.schema(
+        [(name, pa.string()) for name, _ in TEXT_COLUMNS] + [(key, money) for key in AMOUNT_KEYS]
+    )
+
+    n_text = len(TEXT_COLUMNS)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in iter_row_batches(stmt, batch_size):
+            columns = list(zip(*rows))
+            columns[0] = [period_str(p) for p in columns[0]]
+            arrays = [pa.array(col, type=pa.string()) for col in columns[:n_text]]
+            arrays += [_decimal_from_cents(pa, col, money) for col in columns[n_text:]]
+            batch = pa.record_batch(arrays, schema=schema)
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    # Footer
+    yield sink.drain()
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.models.period_summary import PeriodSummary
+from app.services.csv_import.base import AMOUNT_KEYS
+
+
+def _aggregate_select():
+    return (
+        select(
+            EmployeeCost.tenant_id,
+            EmployeeCost.period,
+            ImportJob.source_type,
+            func.count(func.distinct(EmployeeCost.employee_id)),
+            *[func.coalesce(func.sum(getattr(EmployeeCost, key)), 0) for key in AMOUNT_KEYS],
+            literal(datetime.utcnow()),
+        )
+        .join(ImportJob, ImportJob.id == EmployeeCost.import_id)
+        .group_by(EmployeeCost.tenant_id, EmployeeCost.period, ImportJob.source_type)
+    )
+
+
+_TARGET_COLUMNS = ["tenant_id", "period", "source_type", "employee_count", *AMOUNT_KEYS, "updated_at"]
+
+
+def refresh_period_summary(db: Session, tenant_id: int, source_type: str, period: int) -> None:
+    """
+    Berechnet die Summenzeile eines Mandanten für eine Periode neu
+    (ohne Commit, läuft in der Import-Transaktion).
+    """
+    db.execute(
+        delete(PeriodSummary).where(
+            PeriodSummary.tenant_id == tenant_id,
+            PeriodSummary.source_type == source_type,
+            PeriodSummary.period == period,
+        )
+    )
+    stmt = _aggregate_select().where(
+        EmployeeCost.tenant_id == tenant_id,
+        ImportJob.source_type == source_type,
+        EmployeeCost.period == period,
+    )
+    db.execute(insert(PeriodSummary).from_select(_TARGET_COLUMNS, stmt))
+
+
+def rebuild_period_summaries(db: Session) -> None:
+    """Komplett neu aufbauen, z.B. nach manuellen Korrekturen an employee_costs."""
+    db.execute(delete(PeriodSummary))
+    db.execute(insert(PeriodSummary).from_select(_TARGET_COLUMNS, _aggregate_select()))
+    db.commit()
+
@@ -0,0 +1,139 @@
+"""
+Schneller Schreibpfad für PostgreSQL: COPY FROM STDIN in eine temporäre Staging-Tabelle,
+danach set-basiert nach employees (Upsert) und employee_costs (INSERT ... SELECT).
+Alles läuft auf der Verbindung der Session und damit in deren Transaktion.
+
+Unterstützt psycopg (3) und psycopg2; andere Treiber/Datenbanken nutzen weiter executemany.
+"""
+import csv
+import io
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.csv_import.base import AMOUNT_KEYS, ParsedCsv
+from app.services.employee_search import normalize_search_text
+
+STAGE_TABLE = "employee_costs_stage"
+
+_STAGE_COLUMNS = (
+    "seq", "external_id", "first_name", "last_name", "first_name_norm", "last_name_norm", "currency",
+    *AMOUNT_KEYS,
+)
+
+_CREATE_STAGE = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} (
+    seq integer NOT NULL,
+    external_id varchar(50) NOT NULL,
+    first_name varchar(100) NOT NULL,
+    last_name varchar(100) NOT NULL,
+    first_name_norm varchar(100) NOT NULL,
+    last_name_norm varchar(100) NOT NULL,
+    currency varchar(3) NOT NULL,
+    {", ".join(f"{key} bigint NOT NULL" for key in AMOUNT_KEYS)}
+) ON COMMIT DROP
+"""
+
+_COPY = f"COPY {STAGE_TABLE} ({', '.join(_STAGE_COLUMNS)}) FROM STDIN"
+
+# letzte Zeile je Pers.-Nr. gewinnt; xmax = 0 -> Zeile wurde neu angelegt (nicht aktualisiert)
+_UPSERT_EMPLOYEES = f"""
+INSERT INTO employees (tenant_id, external_id, first_name, last_name, first_name_norm, last_name_norm)
+SELECT DISTINCT ON (external_id)
+    :tenant_id, external_id, first_name, last_name, first_name_norm, last_name_norm
+FROM {STAGE_TABLE}
+ORDER BY external_id, seq DESC
+ON CONFLICT (tenant_id, external_id) DO UPDATE SET
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    first_name_norm = EXCLUDED.first_name_norm,
+    last_name_norm = EXCLUDED.last_name_norm
+WHERE (employees.first_name, employees.last_name)
+    IS DISTINCT FROM (EXCLUDED.first_name, EXCLUDED.last_name)
+RETURNING (xmax = 0) AS created
+"""
+
+_INSERT_COSTS = f"""
+INSERT INTO employee_costs (
+    tenant_id, import_id, employee_id, period, currency, {", ".join(AMOUNT_KEYS)}
+)
+SELECT :tenant_id, :import_id, e.id, :period, s.currency, {", ".join(f"s.{key}" for key in AMOUNT_KEYS)}
+FROM {STAGE_TABLE} s
+JOIN employees e ON e.tenant_id = :tenant_id AND e.external_id = s.external_id
+ORDER BY s.seq
+"""
+
+
+def supports_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return (
+        settings.IMPORT_PG_COPY
+        and dialect.name == "postgresql"
+        and dialect.driver in ("psycopg", "psycopg2")
+    )
+
+
+def _stage_rows(parsed: ParsedCsv):
+    first = parsed.column("first_name")
+    last = parsed.column("last_name")
+    # Namen wiederholen sich über Chunks/Monate -> Normalisierung je Wert nur einmal
+    norm = {name: normalize_search_text(name) for name in {*first, *last}}
+    return zip(
+        range(len(parsed)),
+        parsed.column("external_employee_id"),
+        first,
+        last,
+        (norm[n] for n in first),
+        (norm[n] for n in last),
+        parsed.column("currency"),
+        *(parsed.column(key) for key in AMOUNT_KEYS),
+    )
+
+
+def _copy_psycopg(dbapi_conn, parsed: ParsedCsv) -> None:
+    with dbapi_conn.cursor() as cur, cur.copy(_COPY) as copy:
+        for row in _stage_rows(parsed):
+            copy.write_row(row)
+
+
+def _csv_buffer(parsed: ParsedCsv) -> io.StringIO:
+    # COPY (FORMAT csv) liest ein unquotiertes leeres Feld als NULL; Texte daher immer quoten,
+    # damit ein leerer Vor-/Nachname wie bei psycopg 3 und executemany als "" ankommt
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n", quoting=csv.QUOTE_NONNUMERIC).writerows(_stage_rows(parsed))
+    buf.seek(0)
+    return buf
+
+
+def _copy_psycopg2(dbapi_conn, parsed: ParsedCsv) -> None:
+    buf = _csv_buffer(parsed)
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(f"{_COPY} WITH (FORMAT csv)", buf)
+
+
+def copy_cost_rows(
+    db: Session, import_id: int, tenant_id: int, period: int, parsed: ParsedCsv
+) -> tuple[int, int]:
+    """
+    Schreibt die Zeilen eines ParsedCsv per COPY + Merge (Mitarbeiter je Mandant).
+    Liefert (angelegte, aktualisierte) Mitarbeiter.
+    """
+    conn = db.connection()
+    conn.execute(text(_CREATE_STAGE))
+    # bei Chunk-Imports existiert die Tabelle in derselben Transaktion schon
+    conn.execute(text(f"TRUNCATE {STAGE_TABLE}"))
+
+    dbapi_conn = conn.connection.driver_connection
+    if conn.dialect.driver == "psycopg":
+        _copy_psycopg(dbapi_conn, parsed)
+    else:
+        _copy_psycopg2(dbapi_conn, parsed)
+
+    created = conn.execute(text(_UPSERT_EMPLOYEES), {"tenant_id": tenant_id}).scalars().all()
+    conn.execute(
+        text(_INSERT_COSTS), {"tenant_id": tenant_id, "import_id": import_id, "period": period}
+    )
+
+    n_created = sum(1 for c in created if c)
+    return n_created, len(created) - n_created
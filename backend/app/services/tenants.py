@@ -0,0 +1,36 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.tenant import Tenant
+from app.services.csv_import.base import TenantRef
+
+
+def _find_tenant(db: Session, ref: TenantRef) -> Tenant | None:
+    return db.execute(
+        select(Tenant).where(
+            Tenant.advisor_number == ref.advisor_number,
+            Tenant.client_number == ref.client_number,
+        )
+    ).scalar_one_or_none()
+
+
+def ensure_tenant(db: Session, ref: TenantRef) -> int:
+    """
+    Liefert die ID des Mandanten zu Berater-/Mandantennummer und legt ihn bei Bedarf an
+    (ohne Commit, läuft in der Import-Transaktion). Der Firmenname folgt dem letzten Import.
+    """
+    tenant = _find_tenant(db, ref)
+    if tenant is None:
+        try:
+            # Savepoint: legt ein paralleler Import denselben Mandanten an, bleibt die Transaktion intakt
+            with db.begin_nested():
+                tenant = Tenant(
+                    advisor_number=ref.advisor_number, client_number=ref.client_number, name=ref.name
+                )
+                db.add(tenant)
+        except IntegrityError:
+            tenant = _find_tenant(db, ref)
+    elif ref.name and tenant.name != ref.name:
+        tenant.name = ref.name
+    return tenant.id
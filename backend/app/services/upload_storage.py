@@ -0,0 +1,122 @@
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+def _normalize_block(block: bytes) -> bytes:
+    # CRLF vs. LF (Windows-Export vs. weitergeleitete Datei) soll denselben Hash ergeben
+    return block.replace(b"\r", b"")
+
+
+def stream_content_hash(src: BinaryIO, block_size: int = 1024 * 1024) -> str:
+    """sha256 über den normalisierten Inhalt eines Datenstroms (wie in spool_upload)."""
+    h = hashlib.sha256()
+    while True:
+        block = src.read(block_size)
+        if not block:
+            break
+        h.update(_normalize_block(block))
+    return h.hexdigest()
+
+
+def file_content_hash(path: str, block_size: int = 1024 * 1024) -> str:
+    with open(path, "rb") as f:
+        return stream_content_hash(f, block_size)
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Lesender Wrapper, der den Hash wie stream_content_hash beim Lesen mitrechnet: die Datei wird
+    nur einmal gelesen (bzw. ein ZIP-Mitglied nur einmal entpackt). Nach einem seek zurück werden
+    bereits gehashte Bytes nicht doppelt gezählt; content_hash() liest den ungelesenen Rest nach.
+    """
+
+    def __init__(self, src: BinaryIO, block_size: int = 1024 * 1024):
+        self._src = src
+        self._block_size = block_size
+        self._hash = hashlib.sha256()
+        self._pos = 0
+        self._hashed = 0  # Bytes [0, _hashed) sind im Hash
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._src.seekable()
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._pos = self._src.seek(offset, whence)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        data = self._src.read(len(b))
+        n = len(data)
+        b[:n] = data
+        self._consume(data)
+        return n
+
+    def _consume(self, data: bytes) -> None:
+        start, end = self._pos, self._pos + len(data)
+        # nur lückenlos anschließende Bytes hashen; eine Lücke schließt content_hash()
+        if start <= self._hashed < end:
+            self._hash.update(_normalize_block(data[self._hashed - start :]))
+            self._hashed = end
+        self._pos = end
+
+    def content_hash(self) -> str:
+        if self._pos != self._hashed:
+            self._pos = self._src.seek(self._hashed)
+        while True:
+            block = self._src.read(self._block_size)
+            if not block:
+                break
+            self._consume(block)
+        return self._hash.hexdigest()
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: str
+    size: int
+    content_hash: str  # sha256 (hex) des normalisierten Inhalts
+
+
+def spool_upload(
+    src: BinaryIO, spool_dir: str, max_bytes: int, block_size: int, suffix: str = ".csv"
+) -> SpooledUpload:
+    """
+    Kopiert einen Upload blockweise in eine eindeutig benannte Datei unter spool_dir.
+    Hash und Größe werden beim Kopieren mitgerechnet, max_bytes (0 = unbegrenzt) wird
+    während des Kopierens geprüft. Speicherbedarf: ein Block.
+    """
+    os.makedirs(spool_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=spool_dir, prefix="upload_", suffix=suffix)
+
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = src.read(block_size)
+                if not block:
+                    break
+                size += len(block)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds limit of {max_bytes} bytes")
+                h.update(_normalize_block(block))
+                out.write(block)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path=os.path.abspath(path), size=size, content_hash=h.hexdigest())
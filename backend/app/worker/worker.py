@@ -0,0 +1,279 @@
+"""
+Import-Worker: holt wartende ImportJobs aus der Tabelle "imports" und verarbeitet sie.
+
+Start (aus backend/):
+    python -m app.worker.worker --workers 4
+
+Jeder Worker-Prozess hat eine eigene DB-Verbindung. Die Jobs werden so "geclaimt",
+dass jeder Job genau einmal verarbeitet wird:
+- PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED
+- SQLite (und andere): bedingtes UPDATE ... WHERE status = 'pending' (optimistisch)
+
+Stirbt ein Worker mitten im Import, bleibt sein Job in "processing". reclaim_stale_jobs setzt
+solche Jobs nach WORKER_STALE_AFTER_SECONDS wieder auf "pending" (bzw. "error", wenn
+WORKER_MAX_ATTEMPTS erreicht ist).
+
+Mit WORKER_METRICS_PORT liefert jeder Worker-Prozess seine Import-Metriken unter
+http://<host>:<WORKER_METRICS_PORT + Index>/metrics.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.import_job import ImportJob
+from app.services.import_metrics import import_stats, serve_metrics
+from app.services.import_service import ImportService
+
+log = logging.getLogger("app.worker")
+
+
+def _claim_skip_locked(db: Session, worker_id: str) -> ImportJob | None:
+    job = db.execute(
+        select(ImportJob)
+        .where(ImportJob.status == "pending")
+        .order_by(ImportJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+    if job is None:
+        db.rollback()
+        return None
+
+    job.status = "processing"
+    job.worker_id = worker_id
+    job.started_at = datetime.utcnow()
+    job.attempts += 1
+    db.commit()
+    return job
+
+
+def _claim_optimistic(db: Session, worker_id: str) -> ImportJob | None:
+    # SQLite kennt kein SKIP LOCKED; Schreibzugriffe sind dort ohnehin serialisiert.
+    # Wer das UPDATE mit status='pending' gewinnt, hat den Job.
+    while True:
+        job_id = db.execute(
+            select(ImportJob.id).where(ImportJob.status == "pending").order_by(ImportJob.id).limit(1)
+        ).scalar_one_or_none()
+
+        if job_id is None:
+            db.rollback()
+            return None
+
+        res = db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.status == "pending")
+            .values(
+                status="processing",
+                worker_id=worker_id,
+                started_at=datetime.utcnow(),
+                attempts=ImportJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        if res.rowcount == 1:
+            return db.get(ImportJob, job_id, populate_existing=True)
+
+
+def reclaim_stale_jobs(db: Session, stale_after_seconds: int | None = None) -> int:
+    """
+    Gibt Jobs frei, deren Worker seit stale_after_seconds nichts mehr abgeschlossen hat.
+    Liefert die Anzahl betroffener Jobs.
+    """
+    if stale_after_seconds is None:
+        stale_after_seconds = settings.WORKER_STALE_AFTER_SECONDS
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    stale = (ImportJob.status == "processing", ImportJob.started_at < cutoff)
+
+    # erst lesend prüfen: im Normalfall gibt es nichts zu tun, und unter SQLite soll dafür
+    # nicht die Schreibsperre genommen werden
+    if db.execute(select(ImportJob.id).where(*stale).limit(1)).first() is None:
+        db.rollback()
+        return 0
+
+    retried = db.execute(
+        update(ImportJob)
+        .where(*stale, ImportJob.attempts < settings.WORKER_MAX_ATTEMPTS)
+        .values(status="pending", worker_id=None, started_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    failed = db.execute(
+        update(ImportJob)
+        .where(*stale)
+        .values(
+            status="error",
+            error_message="worker did not finish the job (timed out)",
+            finished_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    for _ in range(failed or 0):
+        import_stats.record("error")
+
+    if retried or failed:
+        log.warning("reclaimed %s stale import jobs, gave up on %s", retried, failed)
+    return (retried or 0) + (failed or 0)
+
+
+def claim_next_job(db: Session, worker_id: str) -> ImportJob | None:
+    if db.get_bind().dialect.name == "postgresql":
+        return _claim_skip_locked(db, worker_id)
+    return _claim_optimistic(db, worker_id)
+
+
+def _requeue(db: Session, job_id: int) -> None:
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(status="pending", worker_id=None, started_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _mark_failed(db: Session, job_id: int, message: str) -> None:
+    # nur Jobs anfassen, die persist_parsed_chunks nicht schon selbst als Fehler markiert hat
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == "processing")
+        .values(status="error", error_message=message[:500], finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    # erst hier endgültig gescheitert (ein erneut eingeplanter Job zählt nicht); Laufzeiten wie
+    # vom Import gespeichert, falls er den Job schon selbst als Fehler markiert hat
+    metrics = db.execute(select(ImportJob.metrics).where(ImportJob.id == job_id)).scalar_one_or_none()
+    import_stats.record("error", metrics)
+
+
+def _is_retryable(e: Exception) -> bool:
+    # Konflikte mit parallelen Imports: Unique-Verletzung, SQLite-Sperre, PG-Deadlock/Serialisierung
+    if isinstance(e, IntegrityError):
+        return True
+    if not isinstance(e, OperationalError):
+        return False
+    sqlstate = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+    return sqlstate in ("40001", "40P01") or "database is locked" in str(e.orig)
+
+
+def process_job(db: Session, svc: ImportService, job: ImportJob) -> None:
+    job_id, stored_path, attempts = job.id, job.stored_path, job.attempts
+
+    try:
+        svc.import_csv_file(
+            db=db,
+            file_path=stored_path,
+            original_filename=job.original_filename,
+            chunksize=settings.IMPORT_CHUNK_SIZE,
+            job=job,
+            mode=job.mode,
+        )
+    except (IntegrityError, OperationalError) as e:
+        db.rollback()
+        # parallele Imports derselben Periode bzw. derselben neuen Mitarbeiter -> später erneut versuchen
+        if _is_retryable(e) and attempts < settings.WORKER_MAX_ATTEMPTS:
+            log.warning("import job %s conflicts with a concurrent import, requeued", job_id)
+            _requeue(db, job_id)
+        else:
+            log.exception("import job %s failed", job_id)
+            _mark_failed(db, job_id, str(e))
+        return
+    except Exception as e:
+        db.rollback()
+        log.exception("import job %s failed", job_id)
+        _mark_failed(db, job_id, str(e))
+        return
+
+    # Datei nur nach Erfolg entfernen, fehlerhafte Uploads bleiben zur Analyse liegen
+    try:
+        os.remove(stored_path)
+    except OSError:
+        pass
+
+
+def run_worker(worker_id: str, poll_interval: float, once: bool = False) -> None:
+    svc = ImportService()
+    log.info("worker %s started", worker_id)
+    # hängende Jobs nur gelegentlich suchen, nicht bei jedem Poll jedes untätigen Workers
+    reclaim_every = settings.WORKER_STALE_AFTER_SECONDS / 2
+    next_reclaim = 0.0
+
+    while True:
+        try:
+            with SessionLocal() as db:
+                if time.monotonic() >= next_reclaim:
+                    reclaim_stale_jobs(db)
+                    next_reclaim = time.monotonic() + reclaim_every
+                job = claim_next_job(db, worker_id)
+                if job is not None:
+                    log.info("worker %s processing job %s (%s)", worker_id, job.id, job.original_filename)
+                    process_job(db, svc, job)
+                    continue
+        except Exception:
+            # z.B. DB kurz nicht erreichbar -> Worker bleibt am Leben
+            log.exception("worker %s loop error", worker_id)
+
+        if once:
+            return
+        time.sleep(poll_interval)
+
+
+def _start_metrics_server(index: int) -> None:
+    if settings.WORKER_METRICS_PORT:
+        port = settings.WORKER_METRICS_PORT + index
+        serve_metrics(import_stats, port, settings.METRICS_TOKEN)
+        log.info("worker metrics on :%s/metrics", port)
+
+
+def _worker_main(index: int, poll_interval: float) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    _start_metrics_server(index)
+    run_worker(f"{socket.gethostname()}:{os.getpid()}:{index}", poll_interval)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Import-Worker für DATEV-CSV-Uploads")
+    ap.add_argument("--workers", type=int, default=1, help="Anzahl Worker-Prozesse")
+    ap.add_argument("--poll-interval", type=float, default=settings.WORKER_POLL_INTERVAL_SECONDS)
+    ap.add_argument("--once", action="store_true", help="alle wartenden Jobs abarbeiten und beenden")
+    args = ap.parse_args()
+
+    if args.once or args.workers <= 1:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+        if not args.once:
+            _start_metrics_server(0)
+        run_worker(f"{socket.gethostname()}:{os.getpid()}:0", args.poll_interval, once=args.once)
+        return
+
+    # spawn statt fork: jeder Prozess baut seine eigene Engine / seinen eigenen Pool auf
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_worker_main, args=(i, args.poll_interval), daemon=True)
+        for i in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
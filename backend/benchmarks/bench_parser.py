@@ -0,0 +1,87 @@
+"""
+Vergleicht DatevPayrollV1Parser.parse (spaltenweise) mit dem alten iterrows-Pfad.
+
+Aufruf (aus backend/):
+    python -m benchmarks.bench_parser --rows 50000 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.core.money import parse_cents
+from app.services.csv_import.datev_payroll_v1 import AMOUNT_KEYS, DatevPayrollV1Parser
+from app.services.import_service import ImportService
+from benchmarks.synth import write_payroll_csv
+
+
+def legacy_parse(df: pd.DataFrame, col_for_key: dict[str, str | None]) -> list[dict]:
+    # alter Pfad: eine Python-Iteration pro Zeile, parse_cents pro Zelle
+    rows = []
+    for _, r in df.iterrows():
+        pid = str(r.get("Pers.-Nr.", "")).strip()
+        if not pid.isdigit():
+            continue
+
+        def get_amount(key: str) -> int:
+            col = col_for_key.get(key)
+            return parse_cents(r.get(col)) if col else 0
+
+        row = {
+            "external_employee_id": pid,
+            "first_name": str(r.get("Vorname", "")).strip(),
+            "last_name": str(r.get("Nachname", "")).strip(),
+            "period": None,
+            "currency": "EUR",
+        }
+        for key in AMOUNT_KEYS:
+            row[key] = get_amount(key)
+        rows.append(row)
+    return rows
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    # synthetische Datei statt vervielfachter testdata/payroll.csv: mehr Varianz bei leeren Zellen
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_payroll_csv(os.path.join(tmp, "payroll.csv"), rows)
+        df, _ = ImportService().load_csv(str(path))
+    return df
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    df = build_frame(args.rows)
+    parser = DatevPayrollV1Parser()
+
+    t_new, parsed = timed(lambda: parser.parse(df), args.repeat)
+    col_for_key = parsed.meta["columns_used"]
+    t_old, legacy_rows = timed(lambda: legacy_parse(df, col_for_key), args.repeat)
+
+    if legacy_rows != list(parsed.rows):
+        raise SystemExit("Ergebnisse weichen ab: spaltenweiser Parser != iterrows-Pfad")
+
+    n = len(parsed)
+    print(f"rows parsed: {n}")
+    print(f"iterrows:   {t_old:8.3f}s  ({n / t_old:12.0f} rows/s)")
+    print(f"columnar:   {t_new:8.3f}s  ({n / t_new:12.0f} rows/s)")
+    print(f"speedup:    {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
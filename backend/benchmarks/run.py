@@ -0,0 +1,210 @@
+"""
+Benchmark-Suite für den Import und das Dashboard auf synthetischen DATEV-Dateien.
+
+Aufruf (aus backend/):
+    python -m benchmarks.run --sizes 1000,10000,100000 --output bench.json
+    BENCH_POSTGRES_URL=postgresql+psycopg://... python -m benchmarks.run --sizes 1000,100000
+
+Misst:
+- load_csv, parse (DatevPayrollV1Parser.parse), persist (persist_parsed_csv) je Dateigröße;
+  persist auf PostgreSQL getrennt für COPY-Staging und executemany (Label "path")
+- Dashboard-Abfragen über eine mehrjährige Historie (--months x --history-rows)
+
+persist und dashboard laufen gegen eine frische SQLite-Datei und, falls BENCH_POSTGRES_URL
+gesetzt ist, zusätzlich gegen PostgreSQL. ACHTUNG: dort werden alle Tabellen der App
+gelöscht und neu angelegt -> nur eine eigene Benchmark-Datenbank verwenden.
+
+Die Ergebnisse werden als JSON geschrieben (--output, sonst stdout), damit sich Läufe
+über die Zeit vergleichen lassen.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import Engine
+from sqlalchemy.orm import sessionmaker
+
+import app.main  # noqa: F401  registriert alle Modelle an Base.metadata
+from app.api import dashboard
+from app.core.config import settings
+from app.core.db import Base, make_engine
+from app.services.csv_import.datev_payroll_v1 import DatevPayrollV1Parser
+from app.services.import_service import ImportService
+from app.services.pg_copy import supports_copy
+from benchmarks.bench_parser import timed
+from benchmarks.synth import write_history, write_payroll_csv
+
+
+def _fresh_engine(url: str) -> Engine:
+    # gleiche Pool-/Pragma-Einstellungen wie die App
+    engine = make_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _sessionmaker(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Suite:
+    def __init__(self, workdir: str, repeat: int):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.svc = ImportService()
+        self.results: list[dict] = []
+
+    def record(self, name: str, seconds: float, rows: int | None = None, **labels) -> None:
+        entry = {"name": name, **labels, "seconds": round(seconds, 6)}
+        if rows:
+            entry["rows"] = rows
+            entry["rows_per_s"] = round(rows / seconds, 1) if seconds else None
+        self.results.append(entry)
+        extra = " ".join(f"{k}={v}" for k, v in labels.items())
+        # Fortschritt nach stderr, stdout bleibt für das JSON frei
+        print(f"{name:<28} {extra:<40} {seconds:10.4f}s", file=sys.stderr, flush=True)
+
+    def bench_file(self, size: int, backends: dict[str, str]) -> None:
+        path = write_payroll_csv(os.path.join(self.workdir, f"payroll_{size}.csv"), size)
+
+        t, (df, header) = timed(lambda: self.svc.load_csv(str(path)), self.repeat)
+        self.record("load_csv", t, size, size=size)
+
+        parser = DatevPayrollV1Parser()
+        t, parsed = timed(lambda: parser.parse(df), self.repeat)
+        parsed.period = header.period
+        parsed.tenant = header.tenant
+        self.record("parse", t, size, size=size)
+
+        for backend, url in backends.items():
+            for write_path in self._write_paths(url):
+                engine = _fresh_engine(url)
+                make_session = _sessionmaker(engine)
+                best = float("inf")
+                with self._write_path(write_path):
+                    for _ in range(self.repeat):
+                        # jede Wiederholung ersetzt dieselbe Periode -> inkl. Löschen der Vorgängerdaten
+                        with make_session() as db:
+                            t0 = time.perf_counter()
+                            self.svc.persist_parsed_csv(db, parsed, filename=path.name)
+                            best = min(best, time.perf_counter() - t0)
+                self.record("persist", best, size, size=size, backend=backend, path=write_path)
+                engine.dispose()
+
+    @staticmethod
+    def _write_paths(url: str) -> list[str]:
+        # auf PostgreSQL beide Schreibpfade messen (COPY-Staging vs. executemany)
+        engine = make_engine(url)
+        try:
+            with _sessionmaker(engine)() as db:
+                return ["executemany", "copy"] if supports_copy(db) else ["executemany"]
+        finally:
+            engine.dispose()
+
+    @staticmethod
+    @contextmanager
+    def _write_path(write_path: str):
+        previous = settings.IMPORT_PG_COPY
+        settings.IMPORT_PG_COPY = write_path == "copy"
+        try:
+            yield
+        finally:
+            settings.IMPORT_PG_COPY = previous
+
+    def bench_dashboard(self, rows: int, months: int, backends: dict[str, str]) -> None:
+        history = write_history(os.path.join(self.workdir, "history"), rows, months)
+        parsed_files = [self.svc.detect_and_parse(str(p))[0] for p in history]
+
+        for backend, url in backends.items():
+            engine = _fresh_engine(url)
+            with _sessionmaker(engine)() as db:
+                t0 = time.perf_counter()
+                for parsed in parsed_files:
+                    self.svc.persist_parsed_csv(db, parsed, filename="history.csv")
+                self.record(
+                    "history_load", time.perf_counter() - t0, rows * months,
+                    backend=backend, months=months,
+                )
+
+                latest = dashboard._latest_period(db)
+                queries = {
+                    "dashboard_periods": lambda: dashboard._periods(db),
+                    "dashboard_kpis": lambda: dashboard._kpis(db, latest),
+                    "dashboard_monthly_costs": lambda: dashboard._monthly_costs(db),
+                    "dashboard_top_employees": lambda: dashboard._top_employees(db, latest, 10),
+                    "dashboard_hotspots": lambda: dashboard._hotspots(db, 10, None, None),
+                }
+                for name, fn in queries.items():
+                    t, _ = timed(fn, self.repeat)
+                    self.record(name, t, backend=backend, months=months, rows_per_month=rows)
+            engine.dispose()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Import-/Dashboard-Benchmarks auf synthetischen DATEV-Dateien")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="Zeilen je Datei, kommagetrennt (bis 1000000)")
+    ap.add_argument("--months", type=int, default=36, help="Monate Historie für die Dashboard-Abfragen")
+    ap.add_argument("--history-rows", type=int, default=1000, help="Mitarbeiter je Monat in der Historie")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    ap.add_argument("--skip-dashboard", action="store_true")
+    ap.add_argument("--output", help="JSON-Datei für die Ergebnisse (Default: stdout)")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    backends = {"sqlite": f"sqlite:///{os.path.join(workdir, 'bench.db')}"}
+    if args.postgres_url:
+        backends["postgresql"] = args.postgres_url
+
+    suite = Suite(workdir, args.repeat)
+    started = datetime.now(timezone.utc)
+    try:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            suite.bench_file(size, backends)
+        if not args.skip_dashboard and args.months:
+            suite.bench_dashboard(args.history_rows, args.months, backends)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "started_at": started.isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "sqlalchemy": sqlalchemy.__version__,
+            "repeat": args.repeat,
+            "backends": sorted(backends),
+        },
+        "results": suite.results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Erzeugt realistische DATEV-Lohn-CSVs für Benchmarks (reproduzierbar über --seed).
+
+Format wie der echte Export:
+- latin-1, ";" als Trenner, CRLF
+- Zeile 1: Berater;Mandant;Firma;Periode, Zeile 2: Header
+- deutsche Beträge ("3.019,00"), viele leere Betragszellen
+- Zwischensummen ("Summen Kostenstelle ...") und eine Schluss-Summenzeile
+
+Aufruf (aus backend/):
+    python -m benchmarks.synth /tmp/payroll_100k.csv --rows 100000 --period "Jan 26"
+    python -m benchmarks.synth /tmp/history --rows 1000 --months 36
+"""
+import argparse
+import random
+from pathlib import Path
+
+HEADER = [
+    "Pers.-Nr.", "Nachname", "Vorname", "Gesamtbrutto", "AG-Anteil bAV", "Förderbetrag",
+    "Nettobezüge/Nettoabzüge", "SV-AG-Anteil", "Umlage", "Erstattung KK", "Pauschale Steuern",
+    "Erstattung BA", "Erstattungen IfSG", "Gesamtkosten ohne Erstattung", "Gesamtkosten",
+]
+
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz",
+    "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann",
+    "Schwarz", "Zimmermann", "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner",
+    "Krause", "Meier", "Lehmann", "Köhler", "Maier", "Groß", "Jäger", "Mürkens", "Scheller", "Seitz",
+]
+FIRST_NAMES = [
+    "Anna", "Birgit", "Claudia", "Dörte", "Elke", "Frank", "Günther", "Hans", "Ingrid", "Jörg",
+    "Karin", "Lara", "Melanie", "Margarete Maria", "Nina", "Ötzkan", "Peter", "Renate", "Sören",
+    "Thomas", "Ulrike", "Volker", "Wiebke", "Yvonne", "Zoë",
+]
+
+MONTH_TOKENS = ["Jan", "Feb", "Mär", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep", "Okt", "Nov", "Dez"]
+
+# Betragsspalten (Index im HEADER) -> Anteil befüllter Zellen
+OPTIONAL_AMOUNTS = {4: 0.15, 5: 0.05, 6: 0.1, 8: 0.3, 9: 0.05, 10: 0.05, 11: 0.02, 12: 0.01}
+
+
+def german_amount(value: float) -> str:
+    # 1234.5 -> "1.234,50"
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def period_token(year: int, month: int) -> str:
+    return f"{MONTH_TOKENS[month - 1]} {year % 100:02d}"
+
+
+def _employees(count: int, rng: random.Random) -> list[tuple[str, str, str, float]]:
+    # (Pers.-Nr., Nachname, Vorname, Grundgehalt) -- stabil über alle Monate einer Historie
+    return [
+        (f"{i + 1:05d}", rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), rng.uniform(1200, 9000))
+        for i in range(count)
+    ]
+
+
+def write_payroll_csv(
+    path: str | Path,
+    rows: int,
+    period: str = "Jan 26",
+    seed: int = 0,
+    cost_center_size: int = 250,
+    employees: list[tuple[str, str, str, float]] | None = None,
+) -> Path:
+    """
+    Schreibt eine Lohnliste mit `rows` Mitarbeiterzeilen.
+    Alle `cost_center_size` Zeilen folgt eine Zwischensumme, am Ende die Gesamtsumme.
+    """
+    rng = random.Random(f"{seed}:{period}")
+    employees = employees or _employees(rows, random.Random(seed))
+    path = Path(path)
+
+    totals = [0.0] * len(HEADER)
+    cc_totals = [0.0] * len(HEADER)
+
+    def sum_line(label: str, sums: list[float]) -> str:
+        cells = [label, "", ""] + [german_amount(v) if v else "" for v in sums[3:]]
+        return ";".join(cells) + "\r\n"
+
+    with open(path, "w", encoding="latin-1", newline="") as f:
+        f.write(f"12163;28260;Synthetische Testdaten GmbH;{period}" + ";" * (len(HEADER) - 4) + "\r\n")
+        f.write(";".join(HEADER) + "\r\n")
+
+        for i in range(rows):
+            pid, last, first, base = employees[i % len(employees)]
+            gross = round(base * rng.uniform(0.95, 1.1), 2)
+            cells = [pid, last, first] + [""] * (len(HEADER) - 3)
+            amounts = [0.0] * len(HEADER)
+            amounts[3] = gross
+            amounts[7] = round(gross * 0.21, 2)
+            for col, ratio in OPTIONAL_AMOUNTS.items():
+                if rng.random() < ratio:
+                    amounts[col] = round(gross * rng.uniform(0.005, 0.08), 2)
+            if rng.random() < 0.5:
+                amounts[13] = round(sum(amounts[3:13]), 2)
+                amounts[14] = amounts[13]
+
+            for col in range(3, len(HEADER)):
+                if amounts[col]:
+                    cells[col] = german_amount(amounts[col])
+                    totals[col] += amounts[col]
+                    cc_totals[col] += amounts[col]
+            f.write(";".join(cells) + "\r\n")
+
+            if cost_center_size and (i + 1) % cost_center_size == 0 and i + 1 < rows:
+                f.write(sum_line(f"Summen Kostenstelle {(i + 1) // cost_center_size}", cc_totals))
+                cc_totals = [0.0] * len(HEADER)
+
+        f.write(sum_line("Summen:", totals))
+
+    return path
+
+
+def write_history(directory: str | Path, rows: int, months: int, seed: int = 0, end_year: int = 2026) -> list[Path]:
+    """Monatsdateien für `months` Monate bis Dezember end_year, gleiche Belegschaft in jedem Monat."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    employees = _employees(rows, random.Random(seed))
+
+    paths = []
+    for k in range(months):
+        idx = end_year * 12 + 11 - (months - 1 - k)
+        year, month = divmod(idx, 12)
+        token = period_token(year, month + 1)
+        paths.append(
+            write_payroll_csv(
+                directory / f"{year}_{month + 1:02d}.csv", rows, period=token, seed=seed, employees=employees
+            )
+        )
+    return paths
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Synthetische DATEV-Lohn-CSVs erzeugen")
+    ap.add_argument("target", help="Datei (einzelner Monat) oder Verzeichnis (mit --months)")
+    ap.add_argument("--rows", type=int, default=1000, help="Mitarbeiterzeilen je Datei")
+    ap.add_argument("--period", default="Jan 26")
+    ap.add_argument("--months", type=int, default=0, help="Historie mit N Monatsdateien erzeugen")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    if args.months:
+        paths = write_history(args.target, args.rows, args.months, args.seed)
+        print(f"{len(paths)} Dateien in {args.target}")
+    else:
+        print(write_payroll_csv(args.target, args.rows, args.period, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# vor dem ersten Import von app.*: eigene SQLite-Datei und Spool-Verzeichnisse je Testlauf
+_TMP = tempfile.mkdtemp(prefix="datev_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["IMPORT_SPOOL_DIR"] = f"{_TMP}/spool"
+os.environ["DATA_GENERATION_FILE"] = f"{_TMP}/.data_generation"
+
+import app.main  # noqa: E402,F401  registriert alle Modelle
+from app.core.config import settings  # noqa: E402
+from app.core.db import Base, SessionLocal, engine  # noqa: E402
+
+TESTDATA = Path(__file__).resolve().parent.parent / "testdata"
+
+
+@pytest.fixture
+def db():
+    """Session auf einem frisch angelegten Schema."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    """API-Client, als Bootstrap-Admin angemeldet."""
+    with TestClient(app.main.app) as c:
+        resp = c.post(
+            "/api/auth/login",
+            json={"username": settings.BOOTSTRAP_ADMIN_USERNAME, "password": settings.BOOTSTRAP_ADMIN_PASSWORD},
+        )
+        assert resp.status_code == 200, resp.text
+        yield c
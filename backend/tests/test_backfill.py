@@ -0,0 +1,37 @@
+from sqlalchemy import select
+
+from app.cli import backfill as backfill_cli
+from app.models.import_job import ImportJob
+from app.models.user import User
+from app.services.import_service import ImportService
+from tests.conftest import TESTDATA
+
+
+def _copy_for_client(tmp_path, client: str) -> str:
+    text = (TESTDATA / "payroll.csv").read_text(encoding="latin-1")
+    path = tmp_path / f"payroll_{client}.csv"
+    path.write_text(text.replace("12163;28260;", f"12163;{client};", 1), encoding="latin-1")
+    return str(path)
+
+
+def test_failed_file_does_not_abort_the_following_ones(db, tmp_path, monkeypatch):
+    files = [_copy_for_client(tmp_path, "28260"), _copy_for_client(tmp_path, "28261")]
+    persist = ImportService.persist_parsed_csv
+    calls = []
+
+    def persist_failing_first(self, db, **kwargs):
+        calls.append(kwargs["filename"])
+        if len(calls) == 1:
+            # Flush-Fehler: die Session bleibt bis zum Rollback unbenutzbar
+            db.add(User(username=None, password_hash=None))
+            db.flush()
+        return persist(self, db, **kwargs)
+
+    monkeypatch.setattr(ImportService, "persist_parsed_csv", persist_failing_first)
+
+    stats = backfill_cli.backfill(files, workers=1)
+
+    assert stats["error"] == 1
+    assert stats["ok"] == 1
+    jobs = db.execute(select(ImportJob.original_filename, ImportJob.status)).all()
+    assert jobs == [("payroll_28261.csv", "ok")]
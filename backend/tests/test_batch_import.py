@@ -0,0 +1,59 @@
+import zipfile
+
+from app.services.batch_import import BatchSource, _parse_source, import_batch, zip_sources
+from app.services.import_service import ImportService
+from app.services.upload_storage import file_content_hash
+from tests.conftest import TESTDATA
+
+
+def _irregular_copy(tmp_path) -> str:
+    # überzähliges leeres Feld in einer Zeile -> C-Engine scheitert, Python-Engine liest nach seek zurück
+    lines = (TESTDATA / "payroll.csv").read_text(encoding="latin-1").splitlines(True)
+    lines[5] = lines[5].rstrip("\n") + ";\n"
+    path = tmp_path / "irregular.csv"
+    path.write_text("".join(lines), encoding="latin-1")
+    return str(path)
+
+
+def test_hash_computed_while_parsing_matches_file_hash(tmp_path):
+    svc = ImportService()
+    for path in (str(TESTDATA / "payroll.csv"), _irregular_copy(tmp_path)):
+        content_hash, parsed, error, _ = _parse_source(svc, BatchSource(filename="x.csv", path=path))
+        assert error is None
+        assert len(parsed) > 0
+        assert content_hash == file_content_hash(path)
+
+
+def test_hash_of_unparseable_file_is_still_recorded(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_bytes(b"kein;DATEV;Export\r\n")
+    content_hash, parsed, error, _ = _parse_source(ImportService(), BatchSource(filename="bad.csv", path=str(path)))
+    assert parsed is None and error
+    assert content_hash == file_content_hash(str(path))
+
+
+def _zip_with_corrupt_member(tmp_path) -> str:
+    zip_path = tmp_path / "batch.zip"
+    data = (TESTDATA / "payroll.csv").read_bytes()
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("kaputt.csv", data)
+        zf.writestr("ok.csv", data)
+    with zipfile.ZipFile(zip_path) as zf:
+        info = zf.getinfo("kaputt.csv")
+    raw = bytearray(zip_path.read_bytes())
+    # lokaler Header: 30 Bytes + Name + Extra, danach die komprimierten Daten
+    start = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+    for i in range(start + 50, start + info.compress_size - 50):
+        raw[i] ^= 0x5A
+    zip_path.write_bytes(bytes(raw))
+    return str(zip_path)
+
+
+def test_corrupt_zip_member_fails_only_that_file(db, tmp_path):
+    sources, rejected = zip_sources(_zip_with_corrupt_member(tmp_path))
+    assert rejected == []
+
+    results = import_batch(db, sources, workers=2)
+
+    assert [(r["filename"], r["status"]) for r in results] == [("kaputt.csv", "error"), ("ok.csv", "ok")]
+    assert results[1]["row_count"] > 0
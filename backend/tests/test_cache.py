@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core.cache import DataGeneration, TTLCache
+
+
+def _cache(tmp_path) -> tuple[TTLCache, DataGeneration]:
+    generation = DataGeneration(str(tmp_path / ".gen"))
+    return TTLCache(maxsize=10, ttl_seconds=300, generation=generation), generation
+
+
+def test_result_is_cached_until_next_generation(tmp_path):
+    cache, generation = _cache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("k", compute) == 1
+    assert cache.get_or_compute("k", compute) == 1
+    generation.bump()
+    assert cache.get_or_compute("k", compute) == 2
+
+
+def test_result_computed_across_an_import_is_not_stored(tmp_path):
+    cache, generation = _cache(tmp_path)
+
+    def compute_while_import_commits():
+        generation.bump()
+        return "stale"
+
+    assert cache.get_or_compute("k", compute_while_import_commits) == "stale"
+    assert cache.get("k") == (False, None)
+    assert cache.get_or_compute("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == (True, "fresh")
+
+
+def test_async_variant_skips_stale_results(tmp_path):
+    cache, generation = _cache(tmp_path)
+
+    async def compute_while_import_commits():
+        generation.bump()
+        return "stale"
+
+    assert asyncio.run(cache.get_or_compute_async("k", compute_while_import_commits)) == "stale"
+    assert cache.get("k") == (False, None)
+
+
+def test_cache_without_generation_stores_results(tmp_path):
+    cache = TTLCache(maxsize=1, ttl_seconds=300)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, 2)
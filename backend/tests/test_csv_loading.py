@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from app.services.import_service import ImportService
+from tests.conftest import TESTDATA
+
+
+def _write_variant(tmp_path, name: str, edit) -> str:
+    lines = (TESTDATA / "payroll.csv").read_bytes().decode("latin-1").split("\n")
+    edit(lines)
+    path = tmp_path / name
+    path.write_bytes("\n".join(lines).encode("latin-1"))
+    return str(path)
+
+
+def _concat(chunks) -> pd.DataFrame:
+    return pd.concat([chunk for chunk, _ in chunks]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("chunksize", [7, 50_000])
+def test_ragged_trailing_separators_load_like_clean_file(tmp_path, chunksize):
+    svc = ImportService()
+    clean, _ = svc.load_csv(str(TESTDATA / "payroll.csv"))
+
+    def add_separators(lines):
+        lines[40] += ";;;"
+
+    path = _write_variant(tmp_path, "ragged.csv", add_separators)
+
+    full, header = svc.load_csv(path)
+    assert header.period == 202601
+    assert full.reset_index(drop=True).equals(clean.reset_index(drop=True))
+    assert _concat(svc.iter_csv_chunks(path, chunksize)).equals(clean.reset_index(drop=True))
+
+
+def test_extra_non_empty_fields_still_fail(tmp_path):
+    svc = ImportService()
+
+    def add_value(lines):
+        lines[41] += ";;x"
+
+    path = _write_variant(tmp_path, "broken.csv", add_value)
+
+    with pytest.raises(pd.errors.ParserError):
+        svc.load_csv(path)
+    with pytest.raises(pd.errors.ParserError):
+        list(svc.iter_csv_chunks(path, 7))
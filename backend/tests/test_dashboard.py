@@ -0,0 +1,109 @@
+import random
+
+from sqlalchemy import desc, func, select
+
+from app.api.dashboard import _hotspots
+from app.core.money import cents_to_euro
+from app.core.periods import period_str
+from app.models.employee import Employee
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.models.tenant import Tenant
+
+PERIODS = [202511, 202512, 202601, 202602]
+
+
+def _seed(db) -> list[int]:
+    rng = random.Random(7)
+    tenants = [Tenant(advisor_number="1001", client_number=str(20000 + i)) for i in range(2)]
+    db.add_all(tenants)
+    db.flush()
+    amounts = iter(rng.sample(range(1_000, 10_000_000), 400))
+    for tenant in tenants:
+        # gleiche Pers.-Nr. bei beiden Mandanten: verschiedene Mitarbeiter
+        employees = [
+            Employee(tenant_id=tenant.id, external_id=f"{i:05d}", first_name=f"V{i}", last_name=f"N{i}")
+            for i in range(12)
+        ]
+        db.add_all(employees)
+        for period in PERIODS:
+            job = ImportJob(
+                tenant_id=tenant.id, source_type="datev_payroll_v1", period=period,
+                original_filename="x.csv", status="ok",
+            )
+            db.add(job)
+            db.flush()
+            for e in rng.sample(employees, 9):
+                # teils mehrere Zeilen je Mitarbeiter und Periode -> Summe zählt
+                for _ in range(rng.choice((1, 1, 2))):
+                    db.add(EmployeeCost(
+                        tenant_id=tenant.id, import_id=job.id, employee_id=e.id, period=period,
+                        gross_amount=0, total_cost=next(amounts),
+                    ))
+    db.commit()
+    return [t.id for t in tenants]
+
+
+def _hotspots_per_period(db, limit, period_from=None, period_to=None, tenant_id=None) -> list[dict]:
+    """Vorherige Implementierung: Perioden auflisten, dann je Periode ein gruppiertes Top-N."""
+    periods_stmt = select(EmployeeCost.period).distinct().order_by(EmployeeCost.period.desc())
+    if tenant_id is not None:
+        periods_stmt = periods_stmt.where(EmployeeCost.tenant_id == tenant_id)
+    out = []
+    for p in db.execute(periods_stmt).scalars():
+        if (period_from and p < period_from) or (period_to and p > period_to):
+            continue
+        stmt = (
+            select(
+                Employee.external_id,
+                Employee.first_name,
+                Employee.last_name,
+                func.coalesce(func.sum(EmployeeCost.total_cost), 0).label("total_cost"),
+            )
+            .join(Employee, Employee.id == EmployeeCost.employee_id)
+            .where(EmployeeCost.period == p)
+            .group_by(Employee.id, Employee.external_id, Employee.first_name, Employee.last_name)
+            .order_by(desc("total_cost"))
+            .limit(limit)
+        )
+        if tenant_id is not None:
+            stmt = stmt.where(EmployeeCost.tenant_id == tenant_id)
+        out.append({
+            "period": period_str(p),
+            "items": [
+                {
+                    "external_id": r.external_id,
+                    "first_name": r.first_name,
+                    "last_name": r.last_name,
+                    "total_cost": cents_to_euro(r.total_cost),
+                }
+                for r in db.execute(stmt)
+            ],
+        })
+    return out
+
+
+def test_hotspots_match_per_period_queries(db):
+    tenant_ids = _seed(db)
+    cases = [
+        dict(limit=5),
+        dict(limit=3, period_from=202512, period_to=202601),
+        dict(limit=4, period_from=202601),
+        dict(limit=2, period_to=202511),
+        dict(limit=5, tenant_id=tenant_ids[0]),
+        dict(limit=20, tenant_id=tenant_ids[1], period_from=202512),
+    ]
+    for case in cases:
+        kwargs = {"period_from": None, "period_to": None, "tenant_id": None, **case}
+        expected = _hotspots_per_period(db, **kwargs)
+        assert expected, case
+        assert _hotspots(db, **kwargs) == expected, case
+
+
+def test_hotspots_shape(db):
+    tenant_ids = _seed(db)
+    result = _hotspots(db, 3, 202512, 202601, tenant_ids[0])
+    assert [p["period"] for p in result] == ["2026-01", "2025-12"]
+    for p in result:
+        costs = [i["total_cost"] for i in p["items"]]
+        assert len(costs) == 3 and costs == sorted(costs, reverse=True)
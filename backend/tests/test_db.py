@@ -0,0 +1,19 @@
+import pytest
+
+from app.core.db import async_database_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql://u:pw@db/app", "postgresql+psycopg://u:pw@db/app"),
+        ("postgresql+psycopg2://u:pw@db/app", "postgresql+psycopg://u:pw@db/app"),
+        # bereits asynchron nutzbare Treiber bleiben, wie sie konfiguriert sind
+        ("postgresql+psycopg://u:pw@db/app", "postgresql+psycopg://u:pw@db/app"),
+        ("postgresql+asyncpg://u:pw@db/app", "postgresql+asyncpg://u:pw@db/app"),
+        ("sqlite+aiosqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
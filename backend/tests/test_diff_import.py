@@ -0,0 +1,95 @@
+from sqlalchemy import select
+
+from app.models.employee import Employee
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.services.import_service import ImportService
+from tests.conftest import TESTDATA
+
+
+def _modified_copy(tmp_path) -> str:
+    # Zeile 3: Betrag geändert, Zeile 4: entfällt, dazu ein neuer Mitarbeiter vor der Summenzeile
+    lines = (TESTDATA / "payroll.csv").read_text(encoding="latin-1").splitlines(True)
+    body = [lines[2].replace("3.019,00", "3.119,00")] + lines[4:-1]
+    new = "09999;Neu;Nina;1.000,00;;;;;;;;;;;\n"
+    path = tmp_path / "p2.csv"
+    path.write_text("".join(lines[:2] + body + [new, lines[-1]]), encoding="latin-1")
+    return str(path)
+
+
+def _costs(db) -> dict[str, tuple[int, int]]:
+    rows = db.execute(
+        select(Employee.external_id, EmployeeCost.gross_amount, EmployeeCost.import_id)
+        .join(Employee, Employee.id == EmployeeCost.employee_id)
+    ).all()
+    return {ext_id: (gross, import_id) for ext_id, gross, import_id in rows}
+
+
+def test_diff_writes_only_changes_and_keeps_provenance(db, tmp_path):
+    svc = ImportService()
+    original = svc.import_csv_file(db, str(TESTDATA / "payroll.csv"), "payroll.csv")
+    original_hash, original_metrics = original.content_hash, original.metrics
+    before = _costs(db)
+
+    merged = svc.import_csv_file(db, _modified_copy(tmp_path), "p2.csv", mode="diff", chunksize=10)
+
+    assert merged.metrics["diff"] == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 73}
+    assert merged.status == "merged"
+    assert merged.linked_job_id == original.id
+    assert (merged.tenant_id, merged.source_type, merged.period) == (
+        original.tenant_id, original.source_type, original.period
+    )
+    assert merged.original_filename == "p2.csv"
+
+    db.refresh(original)
+    assert original.status == "ok"
+    assert original.original_filename == "payroll.csv"
+    assert original.content_hash == original_hash
+    assert original.metrics == original_metrics
+    assert original.row_count == 75
+
+    after = _costs(db)
+    assert after["02014"] == (311900, original.id)
+    assert "09999" in after and "09999" not in before
+    assert len(before.keys() - after.keys()) == 1
+    # unveränderte Zeilen bleiben am ursprünglichen Import
+    assert {i for _, i in after.values()} == {original.id}
+
+
+def test_diff_result_matches_replace(db, tmp_path):
+    svc = ImportService()
+    path = _modified_copy(tmp_path)
+    svc.import_csv_file(db, str(TESTDATA / "payroll.csv"), "payroll.csv")
+    merged = svc.import_csv_file(db, path, "p2.csv", mode="diff")
+    diffed = {k: v[0] for k, v in _costs(db).items()}
+
+    # gleiche Datei -> als bereits abgeglichen erkannt
+    assert svc.import_csv_file(db, path, "p2.csv", mode="diff").id == merged.id
+
+    # anderer Hash (Leerzeile am Ende), gleiche Zeilen -> alles unverändert
+    with open(path, "a", encoding="latin-1") as f:
+        f.write("\n")
+    noop = svc.import_csv_file(db, path, "p2-again.csv", mode="diff")
+    assert noop.metrics["diff"] == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 75}
+
+    # wieder ohne Leerzeile: Hash des ersten Abgleichs, der aber überholt ist -> wird importiert
+    svc.import_csv_file(db, _modified_copy(tmp_path), "p2.csv", mode="replace")
+    assert {k: v[0] for k, v in _costs(db).items()} == diffed
+    # replace ersetzt den Import samt seiner merged-Einträge
+    assert db.execute(select(ImportJob.status)).scalars().all() == ["ok"]
+
+
+def test_original_file_is_not_a_duplicate_after_a_merge(db, tmp_path):
+    svc = ImportService()
+    original = svc.import_csv_file(db, str(TESTDATA / "payroll.csv"), "payroll.csv")
+    path = _modified_copy(tmp_path)
+    merged = svc.import_csv_file(db, path, "p2.csv", mode="diff")
+
+    # der gespeicherte Stand entspricht p2.csv, nicht mehr payroll.csv
+    assert svc.find_identical_import(db, merged.content_hash).id == merged.id
+    assert svc.find_identical_import(db, original.content_hash) is None
+
+    back = svc.import_csv_file(db, str(TESTDATA / "payroll.csv"), "payroll.csv", mode="diff")
+    assert back.status == "merged"
+    assert back.metrics["diff"]["updated"] == 1
+    assert svc.import_csv_file(db, path, "p2.csv", mode="diff").metrics["diff"]["updated"] == 1
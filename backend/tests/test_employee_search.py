@@ -0,0 +1,42 @@
+from sqlalchemy import select
+
+from app.models.employee import Employee
+from app.models.tenant import Tenant
+from app.services.employee_search import normalize_search_text, search_condition
+
+
+def _add(db, tenant_id, external_id, first, last):
+    db.add(
+        Employee(
+            tenant_id=tenant_id,
+            external_id=external_id,
+            first_name=first,
+            last_name=last,
+            first_name_norm=normalize_search_text(first),
+            last_name_norm=normalize_search_text(last),
+        )
+    )
+
+
+def _search(db, q):
+    dialect = db.get_bind().dialect.name
+    stmt = select(Employee.external_id).where(search_condition(q, dialect)).order_by(Employee.external_id)
+    return db.execute(stmt).scalars().all()
+
+
+def test_prefix_search_on_names_and_personnel_number(db):
+    tenant = Tenant(advisor_number="1001", client_number="20001")
+    db.add(tenant)
+    db.flush()
+    _add(db, tenant.id, "100", "Anna", "Müller")
+    _add(db, tenant.id, "101", "Bob", "Mueller")
+    _add(db, tenant.id, "1_2", "Carl", "Meier")
+    _add(db, tenant.id, "200", "Özlem", "Muster")
+    db.commit()
+
+    assert _search(db, "MÜLL") == ["100", "101"]
+    assert _search(db, "mu") == ["100", "101", "200"]
+    assert _search(db, "oez") == ["200"]
+    assert _search(db, "1_") == ["1_2"]
+    assert _search(db, "10") == ["100", "101"]
+    assert _search(db, "x") == []
@@ -0,0 +1,86 @@
+import base64
+
+import pytest
+
+from app.models.employee import Employee
+from app.models.tenant import Tenant
+from app.services.employee_search import normalize_search_text
+
+
+def _seed(db) -> int:
+    tenant = Tenant(advisor_number="1001", client_number="20001")
+    db.add(tenant)
+    db.flush()
+    # wenige Namen -> viele gleiche (Nachname) und (Nachname, Vorname)-Schlüssel, nur die id trennt
+    lasts = ["Meier", "Müller", "Schmidt"]
+    firsts = ["Anna", "Bernd"]
+    for i in range(37):
+        first, last = firsts[(i // 3) % 2], lasts[i % 3]
+        db.add(
+            Employee(
+                tenant_id=tenant.id,
+                external_id=f"{i:05d}",
+                first_name=first,
+                last_name=last,
+                first_name_norm=normalize_search_text(first),
+                last_name_norm=normalize_search_text(last),
+            )
+        )
+    db.commit()
+    return tenant.id
+
+
+def _page_through(client, params: dict) -> list[int]:
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = {**params, "page_size": 5, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/api/employees", params=query)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        ids += [e["id"] for e in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+        assert pages < 50
+
+
+@pytest.mark.parametrize("params", [{}, {"q": "m"}, {"tenant": True}])
+def test_keyset_pages_match_single_query(client, db, params):
+    tenant_id = _seed(db)
+    if params.pop("tenant", False):
+        params["tenant_id"] = tenant_id
+
+    full = client.get("/api/employees", params={**params, "page_size": 100}).json()
+    expected = [e["id"] for e in full["items"]]
+    assert full["next_cursor"] is None and len(expected) == full["total"] > 5
+
+    paged = _page_through(client, params)
+    assert len(paged) == len(set(paged))
+    assert paged == expected
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+MALFORMED_CURSORS = [
+    "not-base64!",
+    "äöü",
+    "abc",
+    _b64(b"not json"),
+    _b64(b"\xff\xfe\x00"),
+    _b64(b"42"),
+    _b64(b'["Meier","Anna"]'),
+    _b64(b'["Meier","Anna","x"]'),
+    _b64(b'["Meier","Anna",null]'),
+    _b64(b'{"a":1}'),
+]
+
+
+def test_malformed_cursor_is_a_client_error(client, db):
+    _seed(db)
+    for cursor in MALFORMED_CURSORS:
+        resp = client.get("/api/employees", params={"cursor": cursor})
+        assert resp.status_code == 400, cursor
+        assert resp.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,165 @@
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.models.tenant import Tenant
+from app.services.csv_import.base import AMOUNT_KEYS
+from app.services.payroll_export import AMOUNT_LABELS, export_statement, iter_csv
+
+PERIODS = [202512, 202601, 202602]
+# Vorzeichen, Cent-Anteile, Tausenderpunkte und Beträge unter einem Euro
+AMOUNTS = [-1_234_567, 5, -5, 100, 123_456_789, -99, 100_000_001, 0, 750]
+
+
+def _seed(db) -> list[int]:
+    tenants = [Tenant(advisor_number="1001", client_number=str(20000 + i)) for i in range(2)]
+    db.add_all(tenants)
+    db.flush()
+    n = 0
+    for tenant in tenants:
+        employees = [
+            Employee(tenant_id=tenant.id, external_id="00001", first_name="Jürgen", last_name="Müller"),
+            Employee(tenant_id=tenant.id, external_id="00002", first_name="Anna", last_name="Weiß"),
+        ]
+        db.add_all(employees)
+        for period in PERIODS:
+            job = ImportJob(
+                tenant_id=tenant.id, source_type="datev_payroll_v1", period=period,
+                original_filename="x.csv", status="ok",
+            )
+            db.add(job)
+            db.flush()
+            for e in employees:
+                # je Zeile andere Beträge, damit Spalten und Zeilen nicht vertauscht sein können
+                amounts = {key: AMOUNTS[(n + i) % len(AMOUNTS)] * (i + 1) for i, key in enumerate(AMOUNT_KEYS)}
+                n += 1
+                db.add(EmployeeCost(
+                    tenant_id=tenant.id, import_id=job.id, employee_id=e.id, period=period, **amounts,
+                ))
+    db.commit()
+    return [t.id for t in tenants]
+
+
+def _expected(db, period_from=None, period_to=None, tenant_id=None) -> list[tuple]:
+    # unabhängig vom Export-Statement: alle Zeilen laden und in Python filtern
+    rows = []
+    for cost in db.query(EmployeeCost).order_by(EmployeeCost.period, EmployeeCost.id):
+        if (period_from and cost.period < period_from) or (period_to and cost.period > period_to):
+            continue
+        if tenant_id is not None and cost.tenant_id != tenant_id:
+            continue
+        e = db.get(Employee, cost.employee_id)
+        rows.append((cost.period, e.external_id, e.last_name, e.first_name,
+                     *(getattr(cost, key) for key in AMOUNT_KEYS)))
+    return rows
+
+
+def _de(cents: int) -> str:
+    # Referenz über Decimal statt über format_cents_de
+    text = f"{Decimal(cents) / 100:,.2f}"
+    return text.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _csv_rows(content: bytes) -> list[list[str]]:
+    text = content.decode("latin-1")
+    assert "\r\n" in text
+    return list(csv.reader(io.StringIO(text, newline=""), delimiter=";"))
+
+
+FILTERS = [
+    {},
+    {"period_from": "2026-01"},
+    {"period_to": "2026-01"},
+    {"period_from": "2026-01", "period_to": "2026-01"},
+    {"tenant": 0},
+    {"tenant": 1, "period_from": "2026-02"},
+]
+
+
+def _params(filters: dict, tenant_ids: list[int]) -> tuple[dict, dict]:
+    params = dict(filters)
+    if "tenant" in params:
+        params["tenant_id"] = tenant_ids[params.pop("tenant")]
+    keys = {
+        "period_from": int(params["period_from"].replace("-", "")) if "period_from" in params else None,
+        "period_to": int(params["period_to"].replace("-", "")) if "period_to" in params else None,
+        "tenant_id": params.get("tenant_id"),
+    }
+    return params, keys
+
+
+def test_csv_export_is_latin1_semicolon_with_german_decimals(client, db, monkeypatch):
+    tenant_ids = _seed(db)
+    # kleiner als die Zeilenzahl -> mehrere Cursor-Blöcke
+    monkeypatch.setattr(settings, "EXPORT_YIELD_PER", 5)
+
+    for filters in FILTERS:
+        params, keys = _params(filters, tenant_ids)
+        resp = client.get("/api/exports/payroll", params=params)
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-type"].startswith("text/csv; charset=latin-1")
+        assert "Müller".encode("latin-1") in resp.content
+
+        header, *rows = _csv_rows(resp.content)
+        assert header == ["Periode", "Pers.-Nr.", "Nachname", "Vorname", "Währung"] + [
+            AMOUNT_LABELS[k] for k in AMOUNT_KEYS
+        ]
+        expected = _expected(db, **keys)
+        assert expected
+        assert rows == [
+            [f"{p // 100}-{p % 100:02d}", ext, last, first, "EUR", *(_de(c) for c in amounts)]
+            for p, ext, last, first, *amounts in expected
+        ], filters
+
+
+def test_csv_amount_formatting(client, db):
+    _seed(db)
+    _, *rows = _csv_rows(client.get("/api/exports/payroll").content)
+    cells = {cell for row in rows for cell in row[5:]}
+    # Stichproben aus AMOUNTS: negativ, Cent-Beträge, Tausenderpunkte
+    assert {"-12.345,67", "0,05", "-0,05", "1,00", "1.234.567,89", "-0,99", "0,00"} <= cells
+
+
+def test_csv_streams_one_chunk_per_cursor_batch(db):
+    _seed(db)
+    stmt = export_statement()
+    total = len(_expected(db))
+    chunks = list(iter_csv(stmt, 4))
+    # Kopfzeile steckt im ersten Block, danach ein Block je 4 Zeilen
+    assert len(chunks) == -(-total // 4) > 1
+    single = b"".join(iter_csv(stmt, 10_000))
+    assert b"".join(chunks) == single
+
+
+def test_parquet_export_decimal_columns(client, db, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    tenant_ids = _seed(db)
+    monkeypatch.setattr(settings, "EXPORT_YIELD_PER", 5)
+
+    for filters in FILTERS:
+        params, keys = _params(filters, tenant_ids)
+        resp = client.get("/api/exports/payroll", params={**params, "format": "parquet"})
+        assert resp.status_code == 200, resp.text
+
+        parquet = pq.ParquetFile(io.BytesIO(resp.content))
+        expected = _expected(db, **keys)
+        # eine Row-Group je Cursor-Block
+        assert parquet.metadata.num_row_groups == -(-len(expected) // 5)
+        table = parquet.read()
+        for key in AMOUNT_KEYS:
+            assert table.schema.field(key).type == pa.decimal128(18, 2)
+
+        got = table.to_pylist()
+        assert [r["period"] for r in got] == [f"{p // 100}-{p % 100:02d}" for p, *_ in expected]
+        assert [(r["external_id"], r["last_name"], r["first_name"]) for r in got] == [
+            tuple(row[1:4]) for row in expected
+        ]
+        for r, row in zip(got, expected):
+            assert [r[key] for key in AMOUNT_KEYS] == [Decimal(c) / 100 for c in row[4:]], filters
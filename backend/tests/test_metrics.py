@@ -0,0 +1,73 @@
+import re
+import urllib.error
+import urllib.request
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import metrics as metrics_api
+from app.core.config import settings
+from app.services.import_metrics import ImportStats, import_stats, serve_metrics
+from app.services.import_service import ImportService
+from tests.conftest import TESTDATA
+
+
+def _value(text: str, series: str) -> float:
+    m = re.search(rf"^{re.escape(series)} (\S+)$", text, re.M)
+    return float(m.group(1)) if m else 0.0
+
+
+def test_counters_only_grow_across_reimports(db, tmp_path):
+    svc = ImportService()
+    before = import_stats.render()
+
+    svc.import_csv_file(db, str(TESTDATA / "payroll.csv"), "payroll.csv")
+    first = import_stats.render()
+    # gleiche Periode, anderer Inhalt -> Replace löscht den alten Job samt Metriken aus der DB
+    path = tmp_path / "payroll.csv"
+    path.write_bytes((TESTDATA / "payroll.csv").read_bytes() + b"\n")
+    svc.import_csv_file(db, str(path), "payroll.csv")
+    second = import_stats.render()
+
+    ok = 'import_jobs_total{status="ok"}'
+    rows = 'import_rows_total{kind="rows_parsed"}'
+    assert _value(first, ok) == _value(before, ok) + 1
+    assert _value(second, ok) == _value(first, ok) + 1
+    assert _value(second, rows) == 2 * _value(first, rows) - _value(before, rows) > 0
+    assert _value(second, "import_duration_seconds_count") == _value(before, "import_duration_seconds_count") + 2
+
+
+def test_metrics_endpoint_requires_token_when_configured(monkeypatch):
+    app = FastAPI()
+    app.include_router(metrics_api.router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+    resp = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert resp.status_code == 200
+    assert "# TYPE import_jobs_total counter" in resp.text
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 200
+
+
+def test_worker_metrics_server():
+    stats = ImportStats()
+    stats.record("ok", {"timings_ms": {"parse": 12.0}, "counters": {"rows_parsed": 3}, "total_ms": 20.0})
+    server = serve_metrics(stats, 0, token="t")
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    try:
+        try:
+            urllib.request.urlopen(url)
+            raise AssertionError("expected 401")
+        except urllib.error.HTTPError as e:
+            assert e.code == 401
+        req = urllib.request.Request(url, headers={"Authorization": "Bearer t"})
+        text = urllib.request.urlopen(req).read().decode()
+    finally:
+        server.shutdown()
+    assert 'import_jobs_total{status="ok"} 1' in text
+    assert 'import_stage_duration_seconds_count{stage="parse"} 1' in text
+    assert 'import_rows_total{kind="rows_parsed"} 3' in text
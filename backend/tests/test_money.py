@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from app.core.money import cents_to_euro, format_cents_de, parse_cents
+from app.services.csv_import.datev_payroll_v1 import _parse_cents_series
+
+CASES = [
+    ("1.234,56", 123456),
+    ("3.019,00", 301900),
+    ("0,5", 50),
+    (",5", 50),
+    ("12", 1200),
+    ("12,", 1200),
+    ("-1.234,56", -123456),
+    ("-0,50", -50),
+    ("-,5", -50),
+    ("+7,10", 710),
+    # ab der dritten Nachkommastelle kaufmännisch gerundet, symmetrisch zur Null
+    ("0,005", 1),
+    ("0,004", 0),
+    ("0,0049", 0),
+    ("1,995", 200),
+    ("1,994999", 199),
+    ("-0,005", -1),
+    ("-0,004", 0),
+    ("-1,995", -200),
+    # leer bzw. ungültig -> 0
+    ("", 0),
+    ("   ", 0),
+    ("-", 0),
+    ("abc", 0),
+    ("1,2,3", 0),
+    ("1 234,00", 0),
+]
+
+
+@pytest.mark.parametrize("text, cents", CASES)
+def test_parse_cents(text, cents):
+    assert parse_cents(text) == cents
+
+
+def test_parse_cents_none_and_padding():
+    assert parse_cents(None) == 0
+    assert parse_cents("  42,10  ") == 4210
+
+
+def test_series_variant_matches_scalar_parser():
+    values = pd.Series([text for text, _ in CASES] + [None, float("nan")], dtype="object")
+    result = _parse_cents_series(values)
+    assert result.dtype == "int64"
+    assert result.tolist() == [cents for _, cents in CASES] + [0, 0]
+
+
+def test_series_variant_keeps_index():
+    values = pd.Series(["1,00", None, "2,50"], index=[10, 11, 12], dtype="object")
+    assert _parse_cents_series(values).to_dict() == {10: 100, 11: 0, 12: 250}
+
+
+def test_output_conversions():
+    assert format_cents_de(123456) == "1.234,56"
+    assert format_cents_de(-5) == "-0,05"
+    assert format_cents_de(None) == ""
+    assert cents_to_euro(301900) == 3019.0
+    assert cents_to_euro(None) == 0.0
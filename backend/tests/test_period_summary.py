@@ -0,0 +1,92 @@
+from sqlalchemy import func, select
+
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.models.period_summary import PeriodSummary
+from app.services.csv_import.base import AMOUNT_KEYS
+from app.services.import_service import ImportService
+from app.services.period_summary import rebuild_period_summaries
+from tests.conftest import TESTDATA
+
+
+def _write(tmp_path, name: str, lines: list[str]) -> str:
+    path = tmp_path / name
+    path.write_text("".join(lines), encoding="latin-1")
+    return str(path)
+
+
+def _lines(client: str = "28260") -> list[str]:
+    text = (TESTDATA / "payroll.csv").read_text(encoding="latin-1")
+    return text.replace("12163;28260;", f"12163;{client};", 1).splitlines(True)
+
+
+def _from_costs(db) -> dict:
+    # unabhängig von services/period_summary.py direkt aus employee_costs aggregiert
+    rows = db.execute(
+        select(
+            EmployeeCost.tenant_id,
+            EmployeeCost.period,
+            ImportJob.source_type,
+            func.count(func.distinct(EmployeeCost.employee_id)),
+            *[func.sum(getattr(EmployeeCost, key)) for key in AMOUNT_KEYS],
+        )
+        .join(ImportJob, ImportJob.id == EmployeeCost.import_id)
+        .group_by(EmployeeCost.tenant_id, EmployeeCost.period, ImportJob.source_type)
+    ).all()
+    return {tuple(r[:3]): tuple(r[3:]) for r in rows}
+
+
+def _from_summary(db) -> dict:
+    rows = db.execute(
+        select(
+            PeriodSummary.tenant_id,
+            PeriodSummary.period,
+            PeriodSummary.source_type,
+            PeriodSummary.employee_count,
+            *[getattr(PeriodSummary, key) for key in AMOUNT_KEYS],
+        )
+    ).all()
+    return {tuple(r[:3]): tuple(r[3:]) for r in rows}
+
+
+def _assert_in_sync(db):
+    expected = _from_costs(db)
+    assert expected
+    assert _from_summary(db) == expected
+
+
+def test_summary_matches_costs_after_replace_diff_and_merge(db, tmp_path):
+    svc = ImportService()
+    original = _lines()
+    header, body, total = original[:2], original[2:-1], original[-1:]
+
+    svc.import_csv_file(db, _write(tmp_path, "a.csv", original), "a.csv")
+    svc.import_csv_file(db, _write(tmp_path, "other.csv", _lines("28261")), "other.csv")
+    _assert_in_sync(db)
+
+    # Replace mit geänderten Beträgen und einer Zeile weniger
+    replaced = [body[0].replace("3.019,00", "2.019,00")] + body[2:]
+    svc.import_csv_file(db, _write(tmp_path, "a2.csv", header + replaced + total), "a2.csv")
+    _assert_in_sync(db)
+
+    # Diff: neue Zeile, geänderter Betrag, gelöschte Zeile
+    diffed = [replaced[0].replace("2.019,00", "2.519,00")] + replaced[2:] + ["09999;Neu;Nina;1.000,00;;;;;;;;;;;\n"]
+    merged = svc.import_csv_file(db, _write(tmp_path, "a3.csv", header + diffed + total), "a3.csv", mode="diff")
+    assert merged.status == "merged"
+    assert merged.metrics["diff"]["inserted"] == 1
+    assert merged.metrics["diff"]["updated"] == 1
+    assert merged.metrics["diff"]["deleted"] == 1
+    _assert_in_sync(db)
+
+    # zweiter Abgleich in denselben Import, chunkweise
+    again = diffed[:-1] + ["09998;Neu;Nora;-12,34;;;;;;;;;;;\n"]
+    merged2 = svc.import_csv_file(
+        db, _write(tmp_path, "a4.csv", header + again + total), "a4.csv", mode="diff", chunksize=10
+    )
+    assert merged2.status == "merged"
+    _assert_in_sync(db)
+
+    # Neuaufbau liefert dieselben Summen wie die inkrementelle Pflege
+    incremental = _from_summary(db)
+    rebuild_period_summaries(db)
+    assert _from_summary(db) == incremental
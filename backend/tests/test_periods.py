@@ -0,0 +1,40 @@
+import pytest
+
+from app.core.periods import make_period, next_period, period_key, period_key_or_none, period_str
+
+
+@pytest.mark.parametrize(
+    "text, key",
+    [("2026-01", 202601), ("2025-12", 202512), ("1999-10", 199910)],
+)
+def test_period_key_and_period_str_round_trip(text, key):
+    assert period_key(text) == key
+    assert period_str(key) == text
+
+
+@pytest.mark.parametrize("text", ["2026-13", "2026-00", "2026-1", "26-01", "2026/01", "2026-01 ", ""])
+def test_period_key_rejects_invalid_periods(text):
+    with pytest.raises(ValueError):
+        period_key(text)
+
+
+def test_none_passes_through():
+    assert period_key_or_none(None) is None
+    assert period_key_or_none("") is None
+    assert period_str(None) is None
+
+
+def test_integer_keys_sort_like_the_calendar():
+    keys = [period_key(p) for p in ("2025-12", "2026-01", "2025-02", "2026-10")]
+    assert [period_str(k) for k in sorted(keys)] == ["2025-02", "2025-12", "2026-01", "2026-10"]
+
+
+def test_next_period_rolls_over_the_year():
+    assert next_period(202601) == 202602
+    assert next_period(202612) == 202701
+
+
+def test_make_period_validates_month():
+    assert make_period(2026, 3) == 202603
+    with pytest.raises(ValueError):
+        make_period(2026, 13)
@@ -0,0 +1,43 @@
+import csv
+
+from app.services.csv_import.base import AMOUNT_KEYS
+from app.services.import_service import ImportService
+from app.services.pg_copy import _STAGE_COLUMNS, _csv_buffer, _stage_rows
+from tests.conftest import TESTDATA
+
+
+def _parsed_with_empty_names(tmp_path):
+    lines = (TESTDATA / "payroll.csv").read_text(encoding="latin-1").splitlines(True)
+    body = [
+        "09990;Ohnevorname;;1.000,00;;;;;;;;;;;\n",
+        "09991;;Ohnenachname;-12,34;;;;;;;;;;;\n",
+    ]
+    path = tmp_path / "empty_names.csv"
+    path.write_text("".join(lines[:2] + body + lines[-1:]), encoding="latin-1")
+    parsed, _ = ImportService().detect_and_parse(str(path))
+    return parsed
+
+
+def test_stage_rows_keep_empty_names_as_empty_strings(tmp_path):
+    rows = [dict(zip(_STAGE_COLUMNS, row)) for row in _stage_rows(_parsed_with_empty_names(tmp_path))]
+
+    assert [(r["seq"], r["external_id"], r["first_name"], r["last_name"]) for r in rows] == [
+        (0, "09990", "", "Ohnevorname"),
+        (1, "09991", "Ohnenachname", ""),
+    ]
+    assert rows[0]["first_name_norm"] == "" and rows[1]["last_name_norm"] == ""
+    assert rows[0]["gross_amount"] == 100000 and rows[1]["gross_amount"] == -1234
+
+
+def test_csv_for_copy_quotes_empty_text(tmp_path):
+    text = _csv_buffer(_parsed_with_empty_names(tmp_path)).getvalue()
+    lines = text.splitlines()
+
+    # unquotiert wäre ",," -> COPY (FORMAT csv) macht daraus NULL
+    assert lines[0].startswith('0,"09990","","Ohnevorname","","ohnevorname","EUR",')
+    assert ",," not in text
+    # Beträge bleiben unquotierte ganze Cent
+    reparsed = list(csv.reader(lines))
+    amounts = dict(zip(_STAGE_COLUMNS, reparsed[1]))
+    assert amounts["gross_amount"] == "-1234"
+    assert all(amounts[key].lstrip("-").isdigit() for key in AMOUNT_KEYS)
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.db import Base, check_schema
+
+
+def test_current_schema_passes(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path}/new.db")
+    Base.metadata.create_all(bind=eng)
+    check_schema(eng)
+
+
+def test_database_from_before_tenants_is_rejected(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path}/old.db")
+    with eng.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE employees (id INTEGER PRIMARY KEY, external_id VARCHAR(50), first_name VARCHAR(100), last_name VARCHAR(100))")
+        )
+    Base.metadata.create_all(bind=eng)
+
+    with pytest.raises(RuntimeError, match=r"employees \(tenant_id, first_name_norm, last_name_norm\)"):
+        check_schema(eng)
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.security import create_session, get_current_user, hash_password, session_cache
+from app.models.user import User
+
+
+@pytest.fixture
+def user_session(db):
+    session_cache.clear()
+    user = User(username="u1", password_hash=hash_password("pw"), role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    sess = create_session(db, user)
+    request = SimpleNamespace(cookies={settings.SESSION_COOKIE_NAME: sess.token})
+    yield user, request
+    session_cache.clear()
+
+
+def test_orm_deactivation_revokes_cached_session(db, user_session):
+    user, request = user_session
+    assert get_current_user(request, db).id == user.id
+
+    user.is_active = False
+    db.commit()
+    with pytest.raises(HTTPException):
+        get_current_user(request, db)
+
+
+def test_bulk_deactivation_takes_effect_after_cache_ttl(db, user_session):
+    user, request = user_session
+    assert get_current_user(request, db).id == user.id
+
+    db.execute(update(User).where(User.id == user.id).values(is_active=False))
+    db.commit()
+    # am Listener vorbei: bis zum Ablauf der TTL noch aus dem Cache bedient
+    assert get_current_user(request, db).id == user.id
+
+    session_cache.clear()  # TTL abgelaufen
+    with pytest.raises(HTTPException):
+        get_current_user(request, db)
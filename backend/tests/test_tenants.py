@@ -0,0 +1,58 @@
+from sqlalchemy import func, select
+
+from app.models.employee import Employee
+from app.models.employee_cost import EmployeeCost
+from app.models.import_job import ImportJob
+from app.models.period_summary import PeriodSummary
+from app.models.tenant import Tenant
+from app.services.import_service import ImportService
+from tests.conftest import TESTDATA
+
+
+def _export_for(tmp_path, client: str, name: str, gross_change: tuple[str, str] | None = None) -> str:
+    text = (TESTDATA / "payroll.csv").read_text(encoding="latin-1")
+    text = text.replace("12163;28260;", f"12163;{client};", 1)
+    if gross_change:
+        text = text.replace(*gross_change, 1)
+    path = tmp_path / name
+    path.write_text(text, encoding="latin-1")
+    return str(path)
+
+
+def _per_tenant(db, model, aggregate):
+    rows = db.execute(
+        select(Tenant.client_number, aggregate)
+        .join(Tenant, Tenant.id == model.tenant_id)
+        .group_by(Tenant.client_number)
+    ).all()
+    return dict(rows)
+
+
+def test_replace_only_touches_the_importing_tenant(db, tmp_path):
+    svc = ImportService()
+    a = svc.import_csv_file(db, _export_for(tmp_path, "28260", "a.csv"), "a.csv")
+    b = svc.import_csv_file(db, _export_for(tmp_path, "28261", "b.csv"), "b.csv")
+    assert a.tenant_id != b.tenant_id and a.period == b.period
+
+    rows = db.execute(select(func.count()).select_from(EmployeeCost)).scalar_one()
+    gross_before = _per_tenant(db, EmployeeCost, func.sum(EmployeeCost.gross_amount))
+
+    # Mandant A liefert die Periode mit einem geänderten Betrag neu
+    a2 = svc.import_csv_file(
+        db, _export_for(tmp_path, "28260", "a2.csv", ("3.019,00", "3.119,00")), "a2.csv", chunksize=10
+    )
+
+    assert a2.tenant_id == a.tenant_id
+    assert db.execute(select(func.count()).select_from(EmployeeCost)).scalar_one() == rows
+    jobs = dict(db.execute(select(ImportJob.id, ImportJob.tenant_id).where(ImportJob.status == "ok")).all())
+    assert jobs == {b.id: b.tenant_id, a2.id: a.tenant_id}
+
+    gross_after = _per_tenant(db, EmployeeCost, func.sum(EmployeeCost.gross_amount))
+    assert gross_after["28261"] == gross_before["28261"]
+    assert gross_after["28260"] == gross_before["28260"] + 10000
+
+    summary = _per_tenant(db, PeriodSummary, func.sum(PeriodSummary.gross_amount))
+    assert summary == gross_after
+    # Pers.-Nr. sind je Mandant eigene Mitarbeiter
+    employees = _per_tenant(db, Employee, func.count(Employee.id))
+    assert employees["28260"] == employees["28261"] > 0
@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+from app.services.upload_storage import (
+    HashingReader,
+    UploadTooLargeError,
+    file_content_hash,
+    spool_upload,
+    stream_content_hash,
+)
+from tests.conftest import TESTDATA
+
+LF = (TESTDATA / "payroll.csv").read_bytes().replace(b"\r\n", b"\n")
+CRLF = LF.replace(b"\n", b"\r\n")
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 64, 1024 * 1024])
+def test_crlf_and_lf_hash_alike_across_block_boundaries(block_size):
+    # bei ungeraden Blockgrößen fallen \r und \n regelmäßig in verschiedene Blöcke
+    expected = stream_content_hash(io.BytesIO(LF))
+    assert stream_content_hash(io.BytesIO(CRLF), block_size) == expected
+    assert stream_content_hash(io.BytesIO(LF), block_size) == expected
+
+
+def test_content_change_changes_hash():
+    assert stream_content_hash(io.BytesIO(LF)) != stream_content_hash(io.BytesIO(LF + b"\n"))
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 4096])
+def test_spool_upload_hash_matches_file_hash(tmp_path, block_size):
+    spooled = spool_upload(io.BytesIO(CRLF), str(tmp_path), max_bytes=0, block_size=block_size)
+    with open(spooled.path, "rb") as f:
+        assert f.read() == CRLF  # Datei bleibt unverändert, nur der Hash ist normalisiert
+    assert spooled.size == len(CRLF)
+    assert spooled.content_hash == file_content_hash(spooled.path) == stream_content_hash(io.BytesIO(LF))
+
+
+def test_spool_upload_enforces_limit(tmp_path):
+    with pytest.raises(UploadTooLargeError):
+        spool_upload(io.BytesIO(CRLF), str(tmp_path), max_bytes=100, block_size=64)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_hashing_reader_with_small_reads_and_seek_back():
+    reader = HashingReader(io.BytesIO(CRLF), block_size=3)
+    buffered = io.BufferedReader(reader, buffer_size=7)
+    buffered.read(50)
+    buffered.seek(10)
+    buffered.read(20)
+    assert reader.content_hash() == stream_content_hash(io.BytesIO(LF))
@@ -0,0 +1,150 @@
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models.import_job import ImportJob
+from app.services.import_metrics import import_stats
+from app.services.import_service import ImportService
+from app.worker import worker as worker_module
+from tests.conftest import TESTDATA
+from app.worker.worker import claim_next_job, process_job, reclaim_stale_jobs
+
+
+def _job(db, **values) -> ImportJob:
+    job = ImportJob(original_filename="x.csv", stored_path="/nonexistent.csv", **values)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_reclaims_stale_processing_jobs(db):
+    old = datetime.utcnow() - timedelta(hours=2)
+    retry = _job(db, status="processing", worker_id="dead", started_at=old, attempts=1)
+    give_up = _job(db, status="processing", worker_id="dead", started_at=old, attempts=settings.WORKER_MAX_ATTEMPTS)
+    running = _job(db, status="processing", worker_id="alive", started_at=datetime.utcnow(), attempts=1)
+
+    assert reclaim_stale_jobs(db, stale_after_seconds=3600) == 2
+
+    db.expire_all()
+    assert (retry.status, retry.worker_id, retry.started_at) == ("pending", None, None)
+    assert give_up.status == "error"
+    assert running.status == "processing"
+
+    claimed = claim_next_job(db, "w1")
+    assert claimed.id == retry.id
+    assert claimed.attempts == 2
+
+
+def test_database_locked_requeues_instead_of_failing(db, monkeypatch):
+    _job(db, status="pending")
+    job = claim_next_job(db, "w1")
+
+    def locked(**kwargs):
+        raise OperationalError("INSERT ...", {}, sqlite3.OperationalError("database is locked"))
+
+    svc = ImportService()
+    monkeypatch.setattr(svc, "import_csv_file", locked)
+    process_job(db, svc, job)
+
+    db.expire_all()
+    assert job.status == "pending"
+    assert job.worker_id is None
+
+
+def test_other_operational_errors_fail_the_job(db, monkeypatch):
+    _job(db, status="pending")
+    job = claim_next_job(db, "w1")
+
+    def broken(**kwargs):
+        raise OperationalError("SELECT ...", {}, sqlite3.OperationalError("no such column: foo"))
+
+    svc = ImportService()
+    monkeypatch.setattr(svc, "import_csv_file", broken)
+    process_job(db, svc, job)
+
+    db.expire_all()
+    assert job.status == "error"
+
+
+def test_sqlite_connections_wait_for_locks():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar_one() == settings.SQLITE_BUSY_TIMEOUT_MS
+
+
+def test_reclaim_without_stale_jobs_does_not_write(db):
+    _job(db, status="processing", worker_id="alive", started_at=datetime.utcnow(), attempts=1)
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert reclaim_stale_jobs(db, stale_after_seconds=3600) == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert statements and all(s.lstrip().upper().startswith("SELECT") for s in statements)
+
+
+def test_idle_worker_reclaims_on_its_own_interval(db, monkeypatch):
+    reclaims = []
+    sleeps = []
+
+    class _Stop(Exception):
+        pass
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 5:
+            raise _Stop
+
+    monkeypatch.setattr(worker_module, "reclaim_stale_jobs", lambda db: reclaims.append(1))
+    monkeypatch.setattr(worker_module.time, "sleep", sleep)
+
+    with pytest.raises(_Stop):
+        worker_module.run_worker("w1", poll_interval=0.01)
+
+    assert len(sleeps) == 5
+    assert len(reclaims) == 1
+
+
+def _errors() -> float:
+    m = re.search(r'^import_jobs_total\{status="error"\} (\S+)$', import_stats.render(), re.M)
+    return float(m.group(1)) if m else 0.0
+
+
+def test_requeued_job_is_not_counted_as_error(db, monkeypatch, tmp_path):
+    path = tmp_path / "payroll.csv"
+    path.write_bytes((TESTDATA / "payroll.csv").read_bytes())
+    job = ImportJob(original_filename="payroll.csv", stored_path=str(path), status="pending")
+    db.add(job)
+    db.commit()
+    job = claim_next_job(db, "w1")
+    svc = ImportService()
+
+    def locked(*args, **kwargs):
+        raise OperationalError("INSERT ...", {}, sqlite3.OperationalError("database is locked"))
+
+    def broken(*args, **kwargs):
+        raise ValueError("kaputt")
+
+    before = _errors()
+    # echter Importpfad: persist_parsed_chunks speichert den Job als Fehler, der Worker plant neu ein
+    monkeypatch.setattr(svc, "_insert_rows", locked)
+    process_job(db, svc, job)
+    db.expire_all()
+    assert job.status == "pending"
+    assert _errors() == before
+
+    job = claim_next_job(db, "w1")
+    monkeypatch.setattr(svc, "_insert_rows", broken)
+    process_job(db, svc, job)
+    db.expire_all()
+    assert job.status == "error"
+    assert _errors() == before + 1
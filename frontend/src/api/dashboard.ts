@@ -51,30 +51,42 @@ export type HotspotPeriod = {
   items: HotspotItem[];
 };
 
-export async function fetchPeriods(): Promise<string[]> {
-  return api<string[]>("/api/dashboard/periods");
+// optionaler Mandantenfilter (tenant_id) für alle Dashboard-Abfragen
+function tenantQuery(params: URLSearchParams, tenantId?: number): string {
+  if (tenantId != null) params.set("tenant_id", String(tenantId));
+  return params.toString() ? `?${params.toString()}` : "";
 }
 
-export async function fetchKpis(period?: string): Promise<Kpis> {
-  const q = period ? `?period=${encodeURIComponent(period)}` : "";
+export async function fetchPeriods(tenantId?: number): Promise<string[]> {
+  const q = tenantQuery(new URLSearchParams(), tenantId);
+  return api<string[]>(`/api/dashboard/periods${q}`);
+}
+
+export async function fetchKpis(period?: string, tenantId?: number): Promise<Kpis> {
+  const params = new URLSearchParams();
+  if (period) params.set("period", period);
+  const q = tenantQuery(params, tenantId);
   return api<Kpis>(`/api/dashboard/kpis${q}`);
 }
 
-export async function fetchMonthlyCosts(): Promise<MonthlyRow[]> {
-  return api<MonthlyRow[]>("/api/dashboard/monthly-costs");
+export async function fetchMonthlyCosts(tenantId?: number): Promise<MonthlyRow[]> {
+  const q = tenantQuery(new URLSearchParams(), tenantId);
+  return api<MonthlyRow[]>(`/api/dashboard/monthly-costs${q}`);
 }
 
 export async function fetchTopEmployees(
   period?: string,
   limit = 5,
+  tenantId?: number,
 ): Promise<TopEmployeesResponse> {
   const params = new URLSearchParams();
   if (period) params.set("period", period);
   params.set("limit", String(limit));
-  const q = params.toString() ? `?${params.toString()}` : "";
+  const q = tenantQuery(params, tenantId);
   return api<TopEmployeesResponse>(`/api/dashboard/top-employees${q}`);
 }
 
-export async function fetchHotspots(limit = 5): Promise<HotspotPeriod[]> {
-  return api<HotspotPeriod[]>(`/api/dashboard/hotspots?limit=${limit}`);
+export async function fetchHotspots(limit = 5, tenantId?: number): Promise<HotspotPeriod[]> {
+  const q = tenantQuery(new URLSearchParams({ limit: String(limit) }), tenantId);
+  return api<HotspotPeriod[]>(`/api/dashboard/hotspots${q}`);
 }
@@ -2,6 +2,7 @@ import { api } from "./client";
 
 export type EmployeeRow = {
   id: number;
+  tenant_id: number;
   external_id: string;
   first_name: string;
   last_name: string;
@@ -37,21 +38,30 @@ export type EmployeesPageResponse = {
   page: number;
   page_size: number;
   total: number;
+  next_cursor: string | null;
 };
 
 export async function fetchEmployeesPage(params: {
   q?: string;
   page?: number;
   page_size?: number;
+  cursor?: string;
+  tenant_id?: number;
 }): Promise<EmployeesPageResponse> {
   const sp = new URLSearchParams();
   if (params.q) sp.set("q", params.q);
   if (params.page) sp.set("page", String(params.page));
   if (params.page_size) sp.set("page_size", String(params.page_size));
+  if (params.cursor) sp.set("cursor", params.cursor);
+  if (params.tenant_id != null) sp.set("tenant_id", String(params.tenant_id));
   const qs = sp.toString() ? `?${sp.toString()}` : "";
   return api<EmployeesPageResponse>(`/api/employees${qs}`);
 }
 
-export async function fetchEmployeePayroll(employeeId: number): Promise<EmployeePayrollResponse> {
-  return api<EmployeePayrollResponse>(`/api/employees/${employeeId}/payroll`);
+export async function fetchEmployeePayroll(
+  employeeId: number,
+  tenantId?: number,
+): Promise<EmployeePayrollResponse> {
+  const q = tenantId != null ? `?tenant_id=${tenantId}` : "";
+  return api<EmployeePayrollResponse>(`/api/employees/${employeeId}/payroll${q}`);
 }
@@ -0,0 +1,23 @@
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL ?? "";
+
+export type PayrollExportFormat = "csv" | "parquet";
+
+// Download-Link (gestreamt, Session-Cookie wird vom Browser mitgeschickt)
+export function payrollExportUrl(params: {
+  format?: PayrollExportFormat;
+  period_from?: string;
+  period_to?: string;
+  employee_ids?: number[];
+  external_ids?: string[];
+  tenant_id?: number;
+}): string {
+  const sp = new URLSearchParams();
+  if (params.format) sp.set("format", params.format);
+  if (params.period_from) sp.set("period_from", params.period_from);
+  if (params.period_to) sp.set("period_to", params.period_to);
+  for (const id of params.employee_ids ?? []) sp.append("employee_id", String(id));
+  for (const id of params.external_ids ?? []) sp.append("external_id", id);
+  if (params.tenant_id != null) sp.set("tenant_id", String(params.tenant_id));
+  const qs = sp.toString() ? `?${sp.toString()}` : "";
+  return `${API_BASE_URL}/api/exports/payroll${qs}`;
+}
@@ -3,6 +3,7 @@ import { api } from "./client";
 export type ImportJob = {
   id: number;
   filename: string;
+  tenant_id: number | null;
   period: string | null;
   status: string;
 };
@@ -14,6 +15,16 @@ export type UploadResult = {
   filename: string;
 };
 
+export type ImportStatus = UploadResult & {
+  tenant_id: number | null;
+  source_type: string | null;
+  row_count: number | null;
+  error_message: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+};
+
 export async function listImports() {
   return api<ImportJob[]>("/api/imports", { method: "GET" });
 }
@@ -28,3 +39,27 @@ export async function uploadImport(file: File) {
     body: fd,
   });
 }
+
+export async function fetchImportStatus(id: number) {
+  return api<ImportStatus>(`/api/imports/${id}`, { method: "GET" });
+}
+
+export type BatchFileResult = {
+  filename: string;
+  id?: number;
+  status: "ok" | "duplicate" | "merged" | "error";
+  period?: string | null;
+  row_count?: number | null;
+  error?: string;
+};
+
+// mehrere CSVs und/oder ZIP-Archive; wird direkt verarbeitet, Ergebnis pro Datei
+export async function uploadImportBatch(files: File[]) {
+  const fd = new FormData();
+  for (const f of files) fd.append("files", f);
+
+  return api<{ files: BatchFileResult[] }>("/api/imports/batch", {
+    method: "POST",
+    body: fd,
+  });
+}
@@ -0,0 +1,12 @@
+import { api } from "./client";
+
+export type Tenant = {
+  id: number;
+  advisor_number: string;
+  client_number: string;
+  name: string | null;
+};
+
+export async function fetchTenants(): Promise<Tenant[]> {
+  return api<Tenant[]>("/api/tenants");
+}